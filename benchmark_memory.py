@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试步骤内存占用基准
+对比旧数据模型（普通类 + 每个字段独立字符串）与当前数据模型（__slots__ + 字符串复用）
+每个测试步骤占用的字节数
+
+用法:
+    python benchmark_memory.py                # 使用合成的步骤数据
+    python benchmark_memory.py Report.xml     # 使用真实报告中的步骤数据
+"""
+
+import sys
+import random
+import tracemalloc
+
+from test_report_generator import TestStep, parse_test_report
+
+class LegacyTestStep:
+    """旧版测试步骤类（每个实例带__dict__）"""
+
+    def __init__(self):
+        self.timestamp = ""
+        self.level = ""
+        self.type = ""
+        self.ident = ""
+        self.result = ""
+        self.content = ""
+        self.tabular_info = None
+
+def copy_text(value):
+    """复制字符串，模拟旧解析器为每个属性值创建独立对象"""
+    return value.encode('utf-8').decode('utf-8')
+
+def synthetic_step_values(count):
+    """生成与CANoe报告分布相近的步骤字段"""
+    rng = random.Random(0)
+    values = []
+    timestamp = 0.0
+    for i in range(count):
+        timestamp += rng.random() / 100
+        values.append((
+            f"{timestamp:.6f}",
+            rng.choice(['0', '1', '2', '3']),
+            rng.choice(['auto', 'user']),
+            rng.choice(['', '1', '2', 'Resume', 'Check']),
+            rng.choice(['pass', 'pass', 'pass', 'na', 'fail', 'warn']),
+            f"Signal check {i}: value = 0x{rng.randint(0, 255):02X}",
+        ))
+    return values
+
+def report_step_values(xml_file_path):
+    """从真实报告中提取步骤字段"""
+    report_data = parse_test_report(xml_file_path, streaming=True)
+    if not report_data:
+        sys.exit(1)
+    return [
+        (step.timestamp, step.level, step.type, step.ident, step.result, step.content)
+        for item in report_data.test_items if item.item_type == "testcase"
+        for step in item.test_steps
+    ]
+
+def build_legacy(values):
+    steps = []
+    for timestamp, level, step_type, ident, result, content in values:
+        step = LegacyTestStep()
+        step.timestamp = copy_text(timestamp)
+        step.level = copy_text(level)
+        step.type = copy_text(step_type)
+        step.ident = copy_text(ident)
+        step.result = copy_text(result)
+        step.content = copy_text(content)
+        steps.append(step)
+    return steps
+
+def build_current(values):
+    pool = {}
+    intern = lambda value: pool.setdefault(value, value)
+    steps = []
+    for timestamp, level, step_type, ident, result, content in values:
+        step = TestStep()
+        step.timestamp = copy_text(timestamp)
+        step.level = intern(copy_text(level))
+        step.type = intern(copy_text(step_type))
+        step.ident = intern(copy_text(ident))
+        step.result = intern(copy_text(result))
+        step.content = copy_text(content)
+        steps.append(step)
+    return steps
+
+def measure(builder, values):
+    """返回构建全部步骤后新增的内存字节数"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    steps = builder(values)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del steps
+    return after - before
+
+def main():
+    if len(sys.argv) > 1:
+        print(f"读取报告步骤: {sys.argv[1]}")
+        values = report_step_values(sys.argv[1])
+    else:
+        values = synthetic_step_values(500000)
+
+    if not values:
+        print("报告中没有测试步骤")
+        return
+
+    count = len(values)
+    legacy_bytes = measure(build_legacy, values)
+    current_bytes = measure(build_current, values)
+
+    print("=" * 60)
+    print(f"步骤数量: {count}")
+    print(f"旧数据模型: {legacy_bytes / count:8.1f} 字节/步骤  (共 {legacy_bytes / 1024 / 1024:.1f} MB)")
+    print(f"当前数据模型: {current_bytes / count:6.1f} 字节/步骤  (共 {current_bytes / 1024 / 1024:.1f} MB)")
+    print(f"节省: {(1 - current_bytes / legacy_bytes) * 100:.1f}%")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -5,10 +5,122 @@
 """
 
 import xml.etree.ElementTree as ET
+import xml.parsers.expat
 from datetime import datetime
 from pathlib import Path
 import os
+import re
 import json
+import mmap
+import argparse
+import sys
+import gzip
+import bz2
+import lzma
+import time
+import pickle
+import struct
+import hashlib
+import glob
+import html
+import sqlite3
+import threading
+import mimetypes
+import webbrowser
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import io
+import contextlib
+from array import array
+from collections import deque, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
+
+try:
+    from lxml import etree as lxml_etree  # 可选依赖，安装后自动使用以提升解析速度
+except ImportError:
+    lxml_etree = None
+
+try:
+    import zstandard  # 可选依赖，用于读取.zst压缩的报告
+except ImportError:
+    zstandard = None
+
+# 可选的XML解析后端
+PARSER_BACKENDS = ('auto', 'lxml', 'etree', 'expat', 'fast')
+
+_BACKEND_NAMES = {
+    'lxml': 'lxml',
+    'etree': 'xml.etree.ElementTree',
+    'expat': 'xml.parsers.expat',
+    'fast': 'CANoe快速扫描器 (ElementTree回退)',
+}
+
+# 并行解析时每个进程平均分到的批次数
+PARALLEL_BATCHES_PER_JOB = 4
+
+# 支持直接读取的压缩报告（按文件后缀识别，边解压边解析，不生成临时文件）
+COMPRESSED_SUFFIXES = ('.gz', '.bz2', '.xz', '.zst')
+
+# 测试项索引文件（Report.xml.idx）: 记录每个测试项的字节范围和摘要，用于单独重新解析某个测试项
+INDEX_SUFFIX = '.idx'
+INDEX_FORMAT_VERSION = 1
+INDEX_FIELDS = ('offset', 'length', 'type', 'title', 'verdict', 'start_time', 'end_time', 'steps_count')
+
+# 解析缓存: 缓存文件格式版本（数据模型变化时递增，旧缓存自动失效）、总大小上限和内容哈希的抽样方式
+CACHE_FORMAT_VERSION = 2
+CACHE_MAX_SIZE = 2 * 1024 * 1024 * 1024
+CACHE_SAMPLE_SIZE = 1024 * 1024
+CACHE_SAMPLE_COUNT = 16
+
+# 历史记录数据库的表结构版本，以及通过率趋势默认显示的最近运行次数
+HISTORY_SCHEMA_VERSION = 1
+HISTORY_TREND_RUNS = 30
+
+# 字符串复用池的容量上限，超过后新出现的值不再复用（避免几乎各不相同的ident撑大字典）
+STRING_POOL_LIMIT = 65536
+
+# 表格复用池的上限: 内容相同的TabularInfo（及表头列表）共用一个对象
+TABLE_POOL_LIMIT = 65536
+
+# 每个共享表格数据文件（tables_N.js）包含的表格数量
+TABLES_PER_FILE = 1000
+
+# 测试步骤的输出格式: 每个测试用例一个steps_N.js，或全部写入JS文件夹中的一个SQLite文件
+STEPS_FORMATS = ('js', 'sqlite')
+STEPS_DB_NAME = 'steps.sqlite'
+
+# 报告页面每页显示的步骤数（步骤数据库分页查询的默认值）
+HTML_STEPS_PER_PAGE = 200
+
+# 本地报告服务: 默认端口、js格式报告在内存中缓存的测试用例数、启用gzip的最小响应大小
+SERVE_DEFAULT_PORT = 8765
+SERVE_STEPS_CACHE_SIZE = 8
+SERVE_GZIP_MIN_SIZE = 1024
+
+# 监视目录: 扫描间隔（秒）、判断根元素是否闭合时读取的文件头/文件尾字节数
+WATCH_INTERVAL = 5.0
+WATCH_PROBE_SIZE = 4096
+
+# 页面步骤筛选按钮对应的步骤结果（与initializeStepsControls一致）
+STEP_FILTER_RESULTS = {'pass': ('pass',), 'fail': ('fail', 'ng'), 'warn': ('warn',)}
+
+# 进度回调的最小间隔（秒），避免在逐测试项的循环中频繁回调
+PROGRESS_INTERVAL = 0.2
+
+# 只保留失败测试用例步骤时保留的测试结果
+FAILED_VERDICTS = ('fail', 'warn')
+
+# 报告对比: 耗时比基准增加的比例和秒数都达到阈值时记为耗时退化；结果变为失败的测试用例最多列出的失败步骤数
+DIFF_DURATION_RATIO = 0.2
+DIFF_DURATION_MIN_SECONDS = 1.0
+DIFF_FAILED_STEPS_LIMIT = 5
+
+# 各后端可能抛出的XML格式错误
+XML_PARSE_ERRORS = (ET.ParseError, xml.parsers.expat.ExpatError)
+if lxml_etree is not None:
+    XML_PARSE_ERRORS += (lxml_etree.XMLSyntaxError,)
 
 class TestReportData:
     """测试报告数据类"""
@@ -25,32 +137,73 @@ class TestReportData:
         self.engineer_info = {}
         self.testsetup_info = {}
         self.hardware_info = {}
+        self.sources = []  # 合并报告的来源报告（ReportSource），单个报告时为空
+
+class ReportSource:
+    """合并报告中的来源报告"""
+    
+    def __init__(self):
+        self.name = ""         # 报告文件名（不含后缀）
+        self.title = ""
+        self.start_time = ""
+        self.end_time = ""
+        self.verdicts = ""
+        self.first_index = 0   # 第一个测试项在合并后test_items中的序号
+        self.item_count = 0
+        self.failed_count = 0  # 结果为fail的测试用例数量
 
 class TestCase:
     """测试用例类"""
+    __slots__ = ('start_time', 'timestamp', 'title', 'end_time', 'end_timestamp',
+                 'description', 'verdict', 'test_steps', '_steps_count', 'group_path')
+    item_type = "testcase"
     
     def __init__(self):
-        self.item_type = "testcase"
         self.start_time = ""
         self.timestamp = ""
         self.title = ""
+        self.group_path = ""  # 所在各级testgroup的标题，用/连接
         self.end_time = ""
         self.end_timestamp = ""
         self.description = ""
         self.verdict = ""
         self.test_steps = []
+        self._steps_count = None  # 步骤释放后保留的步骤数量
+    
+    @property
+    def steps_count(self):
+        """步骤数量（步骤数据被释放后依然有效）"""
+        if self._steps_count is not None:
+            return self._steps_count
+        return len(self.test_steps)
+    
+    def release_steps(self):
+        """释放步骤数据，只保留步骤数量"""
+        if isinstance(self.test_steps, LazyStepList):
+            # 延迟加载的步骤随时可以重新加载，只释放已加载的数据
+            self.test_steps.release()
+            return
+        self._steps_count = len(self.test_steps)
+        self.test_steps = []
+    
+    def step_result_counts(self):
+        """统计各步骤结果（pass/fail/na等）的数量"""
+        return count_step_results(self.test_steps)
 
 class SkippedTest:
     """跳过的测试类"""
+    __slots__ = ('start_time', 'timestamp', 'title', 'group_path')
+    item_type = "skipped"
     
     def __init__(self):
-        self.item_type = "skipped"
         self.start_time = ""
         self.timestamp = ""
         self.title = ""
+        self.group_path = ""
 
 class TestStep:
-    """测试步骤类"""
+    """测试步骤类（使用__slots__，数百万步骤时显著减少内存占用）"""
+    __slots__ = ('timestamp', 'level', 'type', 'ident', 'result', 'content', 'tabular_info')
     
     def __init__(self):
         self.timestamp = ""
@@ -62,7 +215,8 @@ class TestStep:
         self.tabular_info = None
 
 class TabularInfo:
-    """表格信息类"""
+    """表格信息类（解析器会让内容相同的表格共用同一个对象，解析完成后不应再修改）"""
+    __slots__ = ('expand', 'description', 'headings', 'rows')
     
     def __init__(self):
         self.expand = ""
@@ -70,134 +224,967 @@ class TabularInfo:
         self.headings = []
         self.rows = []
 
+class ColumnarStepStore:
+    """按列存储的测试步骤容器，可代替TestCase.test_steps中的TestStep列表
+    
+    level/type/ident/result按字典编码存入array('H')，时间戳与内容以UTF-8连续存放在
+    同一个bytearray中并用偏移量数组定位（时间戳保留原始文本，避免转换为浮点数后改变
+    显示格式）；表格信息较少，按步骤序号单独保存。迭代时返回属性与TestStep一致的StepView。
+    """
+    __slots__ = ('_codes', '_values', '_lookups', '_buffer', '_offsets', '_tabular')
+    
+    # 字典编码的列，顺序对应_codes/_values/_lookups的下标
+    CODED_FIELDS = ('level', 'type', 'ident', 'result')
+    _RESULT = 3
+    
+    def __init__(self, steps=()):
+        self._codes = [array('H') for _ in self.CODED_FIELDS]
+        self._values = [[] for _ in self.CODED_FIELDS]    # 编码 -> 取值
+        self._lookups = [{} for _ in self.CODED_FIELDS]   # 取值 -> 编码
+        self._buffer = bytearray()
+        self._offsets = array('Q', [0])  # 第i个步骤: 时间戳为[2i, 2i+1)，内容为[2i+1, 2i+2)
+        self._tabular = {}
+        for step in steps:
+            self.append(step)
+    
+    def _encode(self, column, value):
+        lookup = self._lookups[column]
+        code = lookup.get(value)
+        if code is None:
+            values = self._values[column]
+            code = len(values)
+            if code == 0x10000:
+                # 取值超过array('H')的范围（ident几乎各不相同时），升级为32位编码
+                self._codes[column] = array('I', self._codes[column])
+            lookup[value] = code
+            values.append(value)
+        return code
+    
+    def append(self, step):
+        """追加一个步骤（TestStep或任何具有相同属性的对象）"""
+        index = len(self._codes[0])
+        self._codes[0].append(self._encode(0, step.level))
+        self._codes[1].append(self._encode(1, step.type))
+        self._codes[2].append(self._encode(2, step.ident))
+        self._codes[3].append(self._encode(3, step.result))
+        
+        buffer = self._buffer
+        buffer += step.timestamp.encode('utf-8')
+        self._offsets.append(len(buffer))
+        buffer += step.content.encode('utf-8')
+        self._offsets.append(len(buffer))
+        
+        if step.tabular_info is not None:
+            self._tabular[index] = step.tabular_info
+    
+    def __len__(self):
+        return len(self._codes[0])
+    
+    def __iter__(self):
+        for index in range(len(self._codes[0])):
+            yield StepView(self, index)
+    
+    def __getitem__(self, index):
+        count = len(self._codes[0])
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("step index out of range")
+        return StepView(self, index)
+    
+    def _text(self, position):
+        offsets = self._offsets
+        return self._buffer[offsets[position]:offsets[position + 1]].decode('utf-8')
+    
+    def _coded(self, column, index):
+        return self._values[column][self._codes[column][index]]
+    
+    def result_counts(self):
+        """按编码统计各结果的数量（array.count在C层完成，无需逐个构造步骤）"""
+        codes = self._codes[self._RESULT]
+        return {value: codes.count(code) for code, value in enumerate(self._values[self._RESULT])}
+
+class StepView:
+    """ColumnarStepStore中单个步骤的只读视图"""
+    __slots__ = ('_store', '_index')
+    
+    def __init__(self, store, index):
+        self._store = store
+        self._index = index
+    
+    @property
+    def timestamp(self):
+        return self._store._text(2 * self._index)
+    
+    @property
+    def content(self):
+        return self._store._text(2 * self._index + 1)
+    
+    @property
+    def level(self):
+        return self._store._coded(0, self._index)
+    
+    @property
+    def type(self):
+        return self._store._coded(1, self._index)
+    
+    @property
+    def ident(self):
+        return self._store._coded(2, self._index)
+    
+    @property
+    def result(self):
+        return self._store._coded(3, self._index)
+    
+    @property
+    def tabular_info(self):
+        return self._store._tabular.get(self._index)
+
+class _LazyStepSource:
+    """延迟加载步骤共用的数据源: 报告路径、编码，以及首次加载时创建的解析器"""
+    
+    def __init__(self, xml_file_path, encoding, columnar_steps=False, drop_tabular=False):
+        self.xml_file_path = xml_file_path
+        self.encoding = encoding
+        self.columnar_steps = columnar_steps
+        self.drop_tabular = drop_tabular
+        stat = os.stat(xml_file_path)
+        self.file_signature = (stat.st_size, stat.st_mtime_ns)
+        self._parser = None
+        self._scanner = None
+    
+    def __reduce__(self):
+        # 序列化时只保留路径和选项，解析器在使用时重新创建
+        return (self.__class__, (self.xml_file_path, self.encoding, self.columnar_steps, self.drop_tabular))
+    
+    def load(self, start, end):
+        """解析报告中[start, end)范围内的测试用例，返回其步骤"""
+        stat = os.stat(self.xml_file_path)
+        if (stat.st_size, stat.st_mtime_ns) != self.file_signature:
+            raise ValueError(f"报告文件在解析后已被修改，无法加载测试步骤: {self.xml_file_path}")
+        
+        if self._parser is None:
+            parse_filter = ParseFilter(drop_tabular=True) if self.drop_tabular else None
+            self._parser = TestReportParser(self.xml_file_path, backend='fast', parse_filter=parse_filter)
+            self._scanner = _FastTestCaseScanner(self._parser._intern)
+        with open(self.xml_file_path, 'rb') as f:
+            f.seek(start)
+            chunk = f.read(end - start)
+        
+        test_case, _ = self._parser._parse_item_span(self._scanner, 'testcase', chunk, self.encoding)
+        if self.columnar_steps:
+            return ColumnarStepStore(test_case.test_steps)
+        return test_case.test_steps
+
+class LazyStepList:
+    """按需从报告文件加载的测试步骤
+    
+    只记录测试用例在文件中的字节范围，第一次迭代或下标访问时才解析步骤；
+    release()后回到未加载状态（步骤数量保留），再次访问时重新解析。
+    只取长度（如steps_count、生成索引）时解析后立即丢弃步骤，只记录数量。
+    """
+    __slots__ = ('_source', '_start', '_end', '_steps', '_count')
+    
+    def __init__(self, source, start, end):
+        self._source = source
+        self._start = start
+        self._end = end
+        self._steps = None
+        self._count = None
+    
+    @property
+    def loaded(self):
+        return self._steps is not None
+    
+    def load(self):
+        """加载并返回步骤（list或ColumnarStepStore）"""
+        if self._steps is None:
+            self._steps = self._source.load(self._start, self._end)
+            self._count = len(self._steps)
+        return self._steps
+    
+    def release(self):
+        """释放已加载的步骤"""
+        self._steps = None
+    
+    def __len__(self):
+        if self._count is None:
+            self._count = len(self._source.load(self._start, self._end))
+        return self._count
+    
+    def __bool__(self):
+        return len(self) > 0
+    
+    def __iter__(self):
+        return iter(self.load())
+    
+    def __getitem__(self, index):
+        return self.load()[index]
+
+def count_step_results(test_steps):
+    """统计步骤结果数量，列式存储时直接按编码计数"""
+    if isinstance(test_steps, LazyStepList):
+        test_steps = test_steps.load()
+    if isinstance(test_steps, ColumnarStepStore):
+        return test_steps.result_counts()
+    counts = {}
+    for step in test_steps:
+        counts[step.result] = counts.get(step.result, 0) + 1
+    return counts
+
+class ParseFilter:
+    """解析时的筛选条件，在各解析后端中尽早跳过不需要的测试项和步骤
+    
+    Args:
+        steps_verdicts: 只有这些结果的测试用例保留步骤（如FAILED_VERDICTS），None表示全部保留
+        title_pattern: 测试项标题需要匹配的正则（re.search），不匹配的测试项直接丢弃
+        group_path: 测试组路径前缀，如"Group A/Sub B"（各级testgroup的标题），只保留该路径下的测试项
+        drop_tabular: 不解析测试步骤中的tabularinfo
+    
+    测试用例的verdict位于步骤之后: fast/quick等按字节范围解析的后端先解析头部和结尾的verdict，
+    不保留步骤的测试用例不再解析步骤；expat、iterparse、lxml和跟踪模式顺序读取，读到verdict时
+    步骤已经构建，steps_verdicts只能在apply()中丢弃步骤（标题、测试组路径和drop_tabular在这些
+    后端中同样提前生效）。
+    """
+    
+    def __init__(self, steps_verdicts=None, title_pattern=None, group_path=None, drop_tabular=False):
+        self.steps_verdicts = frozenset(steps_verdicts) if steps_verdicts is not None else None
+        self.title_regex = re.compile(title_pattern) if title_pattern else None
+        self.group_prefix = tuple(part for part in group_path.split('/') if part) if group_path else ()
+        self.drop_tabular = drop_tabular
+    
+    @property
+    def checks_summary(self):
+        """是否需要先根据标题或结果判断测试用例（再决定是否解析步骤）"""
+        return self.steps_verdicts is not None or self.title_regex is not None
+    
+    def keeps_title(self, title):
+        return self.title_regex is None or self.title_regex.search(title or '') is not None
+    
+    def keeps_steps(self, verdict):
+        return self.steps_verdicts is None or verdict in self.steps_verdicts
+    
+    def keeps_group(self, group_titles):
+        """所在测试组（从外到内的标题）是否在路径前缀下"""
+        return tuple(group_titles[:len(self.group_prefix)]) == self.group_prefix
+    
+    def may_contain(self, group_titles):
+        """测试组中是否可能有需要保留的测试项（路径与前缀不冲突）"""
+        return all(title == prefix for title, prefix in zip(group_titles, self.group_prefix))
+    
+    def apply(self, test_item):
+        """对解析出的测试项做最终检查: 返回False表示丢弃；不保留步骤的测试用例清空步骤"""
+        if not self.keeps_title(test_item.title):
+            return False
+        if test_item.item_type == "testcase" and not self.keeps_steps(test_item.verdict):
+            test_item.test_steps = []
+        return True
+
+def _get_group_title(testgroup_elem):
+    """testgroup的标题，没有时为空字符串"""
+    title_elem = testgroup_elem.find('title')
+    return (title_elem.text or '') if title_elem is not None else ''
+
+def _get_group_titles(group_elems):
+    """各级testgroup元素（从外到内）的标题"""
+    return tuple(_get_group_title(group_elem) for group_elem in group_elems)
+
+class ProgressTracker:
+    """解析和生成进度
+    
+    解析器和生成器在处理过程中更新计数，update()按PROGRESS_INTERVAL限频调用回调 callback(tracker)。
+    phase为'parse'时按已读取的字节数计算进度（压缩文件按压缩后的字节数），
+    为'write'时按已写出的测试项计算。
+    """
+    
+    def __init__(self, callback, interval=PROGRESS_INTERVAL):
+        self.callback = callback
+        self.interval = interval
+        self.files_written = 0  # 已写出的文件数（步骤文件、主数据文件和HTML），各阶段累计
+        self.start_phase('parse')
+    
+    def start_phase(self, phase, bytes_total=0, items_total=0):
+        """开始新的阶段，重置除files_written外的计数"""
+        self.phase = phase
+        self.bytes_done = 0
+        self.bytes_total = bytes_total
+        self.items = 0
+        self.items_total = items_total
+        self.steps = 0
+        self.done = False
+        self.start_time = time.monotonic()
+        self._last_update = self.start_time
+    
+    def add_item(self, test_item):
+        """记录解析完成的测试项（延迟加载的步骤不计入步骤数，避免触发解析）"""
+        self.items += 1
+        if test_item.item_type == "testcase" and not isinstance(test_item.test_steps, LazyStepList):
+            self.steps += test_item.steps_count
+        self.update()
+    
+    def update(self, force=False):
+        """距上次回调超过间隔时间（或force为True）时调用回调"""
+        now = time.monotonic()
+        if force or now - self._last_update >= self.interval:
+            self._last_update = now
+            self.callback(self)
+    
+    def finish(self):
+        """当前阶段完成"""
+        if self.phase == 'parse':
+            self.bytes_done = self.bytes_total
+        self.done = True
+        self.update(force=True)
+    
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.start_time
+    
+    @property
+    def fraction(self):
+        """当前阶段的完成比例（0~1）"""
+        if self.done:
+            return 1.0
+        if self.phase == 'parse':
+            return min(self.bytes_done / self.bytes_total, 1.0) if self.bytes_total else 0.0
+        return min(self.items / self.items_total, 1.0) if self.items_total else 0.0
+    
+    @property
+    def bytes_per_second(self):
+        elapsed = self.elapsed
+        return self.bytes_done / elapsed if elapsed > 0 else 0.0
+    
+    @property
+    def eta(self):
+        """预计剩余秒数，无法估计时为None"""
+        fraction = self.fraction
+        if self.done or fraction <= 0:
+            return None
+        return self.elapsed * (1 - fraction) / fraction
+
+def format_progress(progress):
+    """单行进度描述，如: 解析  45.2% 120.3/266.0 MB 35.1 MB/s, 1200 个测试项, 35000 个步骤, 剩余约 4 秒"""
+    if progress.phase == 'parse':
+        text = (f"解析 {progress.fraction * 100:5.1f}% "
+                f"{progress.bytes_done / 1048576:.1f}/{progress.bytes_total / 1048576:.1f} MB "
+                f"{progress.bytes_per_second / 1048576:.1f} MB/s, "
+                f"{progress.items} 个测试项, {progress.steps} 个步骤")
+    else:
+        text = f"生成 {progress.items}/{progress.items_total} 个测试项, 已写出 {progress.files_written} 个文件"
+    eta = progress.eta
+    if eta is not None:
+        text += f", 剩余约 {eta:.0f} 秒"
+    return text
+
+def _make_progress_tracker(on_progress):
+    """on_progress可以是回调函数或ProgressTracker（解析和生成共用同一个进度）"""
+    if on_progress is None or isinstance(on_progress, ProgressTracker):
+        return on_progress
+    return ProgressTracker(on_progress)
+
 class TestReportParser:
     """测试报告解析器"""
     
-    def __init__(self, xml_file_path):
+    def __init__(self, xml_file_path, streaming=False, on_test_item=None, backend='auto', columnar_steps=False, jobs=1,
+                 write_index=False, quick=False, lazy_steps=False, on_progress=None, parse_filter=None):
         self.xml_file_path = xml_file_path
+        self.backend = self._resolve_backend(backend)
+        # 并行解析的进程数，None表示使用全部CPU核心，1表示不并行
+        self.jobs = (os.cpu_count() or 1) if jobs is None else max(1, jobs)
+        # 流式解析: 逐个测试用例解析并释放元素树，内存占用与文件大小无关（expat、fast后端和并行解析总是流式的）
+        self.streaming = streaming or self.backend in ('expat', 'fast') or self.jobs > 1
+        self.on_test_item = on_test_item  # 每解析完一个测试项时回调 on_test_item(index, test_item)
+        self.columnar_steps = columnar_steps  # 测试用例解析完成后将步骤转为ColumnarStepStore
+        if is_compressed_report(xml_file_path) and (self.backend == 'fast' or self.jobs > 1):
+            # 快速扫描和并行解析需要按字节范围随机访问，压缩文件只能顺序解压
+            print("压缩报告不支持快速扫描和并行解析，改用expat流式解析")
+            self.backend = 'expat'
+            self.jobs = 1
+        self.write_index = write_index  # 解析完成后生成测试项索引文件
+        # 快速摘要模式: 只解析元信息和测试用例的标题、结果、时间，跳过teststep/tabularinfo
+        self.quick = quick
+        # 延迟加载步骤: 首次解析与快速摘要相同，测试步骤在访问时才从文件中解析
+        self.lazy_steps = lazy_steps and not quick
+        if self.lazy_steps and is_compressed_report(xml_file_path):
+            print("压缩报告不支持延迟加载步骤，改为直接解析")
+            self.lazy_steps = False
+        if self.quick or self.lazy_steps:
+            self.streaming = True
+        # 进度回调 on_progress(tracker)，按PROGRESS_INTERVAL限频；也可以传入ProgressTracker
+        self.progress = _make_progress_tracker(on_progress)
+        # 筛选条件（ParseFilter），被丢弃的测试项不会记录，也不会触发on_test_item
+        self.parse_filter = parse_filter
+        self._drop_tabular = parse_filter is not None and parse_filter.drop_tabular
         self.report_data = TestReportData()
+        self._item_spans = None  # fast后端和并行解析时记录的测试项字节范围，生成索引时复用
+        self._string_pool = {}  # level/type/ident/result/verdict等低基数字段的字符串复用池
+        self._table_pool = {}     # 表格内容的哈希 -> [TabularInfo]
+        self._headings_pool = {}  # 表头 -> 共用的表头列表
+        self._reset_report_info()
+
+    @staticmethod
+    def _resolve_backend(backend):
+        """确定实际使用的解析后端，lxml不可用时回退到ElementTree"""
+        if backend not in PARSER_BACKENDS:
+            raise ValueError(f"不支持的解析后端: {backend}，可选值: {', '.join(PARSER_BACKENDS)}")
+        if backend in ('etree', 'expat', 'fast'):
+            return backend
+        if lxml_etree is None:
+            if backend == 'lxml':
+                print("未安装lxml，回退到xml.etree.ElementTree")
+            return 'etree'
+        return 'lxml'
     
     def parse(self):
         """解析XML文件"""
         try:
             print("开始解析XML文件...")
-            tree = ET.parse(self.xml_file_path)
-            root = tree.getroot()
-            
-            # 解析根元素属性
-            self.report_data.start_time = root.get('starttime', '')
-            self.report_data.end_time = root.get('endtime', '')
-            self.report_data.timestamp = root.get('timestamp', '')
-            self.report_data.verdicts = root.get('verdicts', '')
-            
-            # 如果根元素没有结束时间，从completion或verdict元素获取
-            if not self.report_data.end_time:
-                # 先尝试从completion/compend获取
-                completion_elem = root.find('completion')
-                if completion_elem is not None:
-                    compend_elem = completion_elem.find('compend')
-                    if compend_elem is not None:
-                        self.report_data.end_time = compend_elem.get('endtime', '')
-                
-                # 如果还没有，从verdict元素获取
-                if not self.report_data.end_time:
-                    verdict_elem = root.find('verdict')
-                    if verdict_elem is not None:
-                        self.report_data.end_time = verdict_elem.get('endtime', '') or verdict_elem.get('time', '')
-            
-            # 如果还是没有结束时间，使用最后一个测试用例的结束时间
-            if not self.report_data.end_time:
-                # 这个逻辑会在解析完所有测试用例后执行
-                pass
-            
-            # 解析title
-            title_elem = root.find('title')
-            if title_elem is not None:
-                self.report_data.title = title_elem.text or ''
-            
+            print(f"解析后端: {_BACKEND_NAMES[self.backend]}")
+            self._start_progress()
+            if self.quick or self.lazy_steps:
+                root = self._parse_quick()
+            elif self.jobs > 1:
+                # 按测试项字节范围切分后交给多个进程解析
+                root = self._parse_parallel()
+            elif self.backend == 'expat':
+                # 直接由expat回调构建数据对象，测试用例不生成Element
+                root = self._parse_expat()
+            elif self.backend == 'fast':
+                # 按testcase字节范围切分，规整的测试步骤直接从字节中提取
+                root = self._parse_fast()
+            elif self.streaming:
+                print("使用流式解析模式")
+                # 测试用例在读取过程中已解析完毕，返回的根元素只保留元信息
+                root = self._parse_streaming()
+            elif self.backend == 'lxml':
+                parser = lxml_etree.XMLParser(huge_tree=True, remove_comments=True, remove_pis=True)
+                with open_report_file(self.xml_file_path, self.progress) as source:
+                    root = lxml_etree.parse(source, parser).getroot()
+            else:
+                with open_report_file(self.xml_file_path, self.progress) as source:
+                    tree = ET.parse(source)
+                root = tree.getroot()
+
             # 解析测试组和测试用例
-            self._parse_test_groups(root)
+            if not self.streaming:
+                self._parse_test_groups(root)
             
-            # 解析工程师信息
-            self._parse_engineer_info(root)
+            # 解析报告元信息（流式解析时已处理过的章节已从根元素中移除）
+            self._collect_report_info(root)
             
-            # 解析测试设置信息
-            self._parse_testsetup_info(root)
-            
-            # 解析硬件信息
-            self._parse_hardware_info(root)
-            
-            # 如果还是没有结束时间，使用最后一个测试用例的结束时间
-            if not self.report_data.end_time and self.report_data.test_items:
-                # 从后向前查找第一个有结束时间的测试用例
-                for test_item in reversed(self.report_data.test_items):
-                    if hasattr(test_item, 'end_time') and test_item.end_time:
-                        self.report_data.end_time = test_item.end_time
-                        break
-                    elif hasattr(test_item, 'start_time') and test_item.start_time:
-                        self.report_data.end_time = test_item.start_time
-                        break
+            if self.write_index:
+                self._write_index()
             
+            self._finish_progress()
             print("XML解析完成，开始生成HTML报告...")
             return self.report_data
             
-        except ET.ParseError as e:
+        except XML_PARSE_ERRORS as e:
             print(f"XML解析错误: {e}")
             return None
         except Exception as e:
             print(f"解析过程中发生错误: {e}")
             return None
     
+    def _start_progress(self):
+        """开始解析阶段的进度统计，总字节数为文件大小（压缩文件为压缩后的大小）"""
+        if self.progress is not None:
+            self.progress.start_phase('parse', bytes_total=os.path.getsize(self.xml_file_path))
+            self.progress.update(force=True)
+    
+    def _finish_progress(self):
+        if self.progress is not None:
+            self.progress.finish()
+    
+    def _reset_report_info(self):
+        """初始化元信息解析状态（只处理第一个同名元素的章节需要记录是否已出现）"""
+        self._seen_root_children = set()
+        self._compend_end_time = ''
+        self._verdict_end_time = ''
+    
+    def _handle_root_child(self, elem):
+        """按标签分派根元素的直接子元素（title、engineer、testsetup、hardware、completion、verdict）
+        
+        每个章节只遍历一次自身子树；流式解析时可在章节闭合后立即调用，然后释放该元素。
+        其他标签（testgroup、testcase等）直接忽略。
+        """
+        handler_info = self._ROOT_CHILD_HANDLERS.get(elem.tag)
+        if handler_info is None:
+            return
+        handler, first_only = handler_info
+        if first_only:
+            if elem.tag in self._seen_root_children:
+                return
+            self._seen_root_children.add(elem.tag)
+        handler(self, elem)
+    
+    def _collect_report_info(self, root):
+        """处理根元素中剩余的元信息章节，并汇总报告属性"""
+        for child in root:
+            self._handle_root_child(child)
+        self._finish_report_info(root)
+    
+    def _finish_report_info(self, root):
+        """解析根元素属性并确定结束时间
+        
+        需在测试项解析完成后调用: 结束时间依次取根元素endtime、completion/compend、
+        verdict，都没有时使用最后一个测试用例的时间。
+        """
+        self.report_data.start_time = root.get('starttime', '')
+        self.report_data.timestamp = root.get('timestamp', '')
+        self.report_data.verdicts = root.get('verdicts', '')
+        self.report_data.end_time = root.get('endtime', '') or self._compend_end_time or self._verdict_end_time
+        
+        # 如果还是没有结束时间，使用最后一个测试用例的结束时间
+        if not self.report_data.end_time and self.report_data.test_items:
+            # 从后向前查找第一个有结束时间的测试用例
+            for test_item in reversed(self.report_data.test_items):
+                if hasattr(test_item, 'end_time') and test_item.end_time:
+                    self.report_data.end_time = test_item.end_time
+                    break
+                elif hasattr(test_item, 'start_time') and test_item.start_time:
+                    self.report_data.end_time = test_item.start_time
+                    break
+    
     def _parse_test_groups(self, root):
         """解析测试组 - 按照XML中的实际顺序递归解析"""
         # 直接从根元素开始递归解析，保持XML中的顺序
         self._parse_elements_recursive(root)
     
-    def _parse_elements_recursive(self, parent_elem):
-        """递归解析XML元素，保持XML中的顺序"""
+    def _parse_elements_recursive(self, parent_elem, group_titles=()):
+        """递归解析XML元素，保持XML中的顺序
+        
+        group_titles为所在各级testgroup的标题（从外到内），用于测试项的测试组路径和按路径筛选。
+        """
+        parse_filter = self.parse_filter
+        keeps_items = self._keeps_item_in(group_titles)
+        group_path = '/'.join(group_titles)
         for child in parent_elem:
             if child.tag == 'skipped':
-                skipped = SkippedTest()
-                skipped.start_time = child.get('starttime', '')
-                skipped.timestamp = child.get('timestamp', '')
-                
-                title_elem = child.find('title')
-                if title_elem is not None:
-                    skipped.title = title_elem.text or ''
-                
-                self.report_data.test_items.append(skipped)
+                if keeps_items:
+                    self._add_test_item(self._parse_skipped(child), group_path)
             
             elif child.tag == 'testcase':
-                test_case = TestCase()
-                test_case.start_time = child.get('starttime', '')
-                test_case.timestamp = child.get('timestamp', '')
-                
-                # 查找verdict
-                verdict_elem = child.find('verdict')
-                if verdict_elem is not None:
-                    test_case.verdict = verdict_elem.get('result', '')
-                    test_case.end_time = verdict_elem.get('endtime', '')
-                    test_case.end_timestamp = verdict_elem.get('endtimestamp', '')
+                if keeps_items:
+                    self._add_test_item(self._parse_testcase(child), group_path)
+            
+            elif child.tag == 'testgroup':
+                # 递归处理嵌套的testgroup，保持顺序
+                child_titles = group_titles + (_get_group_title(child),)
+                if parse_filter is None or parse_filter.may_contain(child_titles):
+                    self._parse_elements_recursive(child, child_titles)
+            
+            # 忽略其他元素类型（如title, preparation等）
+    
+    def _parse_streaming(self):
+        """基于iterparse的流式解析
+        
+        访问范围与_parse_elements_recursive一致（根元素及嵌套testgroup下的testcase/skipped），
+        每个测试项闭合后立即转换为数据对象，并将其子树从元素树中移除。
+        返回的根元素只保留元信息（title、engineer、hardware等）。
+        """
+        if self.backend == 'lxml':
+            return self._parse_streaming_lxml()
+        
+        # 元素栈: (元素, 是否为需要递归的容器)
+        stack = []
+        root = None
+        
+        with open_report_file(self.xml_file_path, self.progress) as source:
+            for event, elem in ET.iterparse(source, events=('start', 'end')):
+                if event == 'start':
+                    if root is None:
+                        root = elem
+                        stack.append((elem, True))
+                    else:
+                        parent_is_container = stack[-1][1]
+                        stack.append((elem, parent_is_container and elem.tag == 'testgroup'))
+                    continue
                 
-                # 查找title和description
-                title_elem = child.find('title')
-                if title_elem is not None:
-                    test_case.title = title_elem.text or ''
+                stack.pop()
+                if not stack:
+                    break
                 
-                desc_elem = child.find('description')
-                if desc_elem is not None:
-                    test_case.description = desc_elem.text or ''
+                parent, parent_is_container = stack[-1]
+                if parent_is_container and elem.tag in ('testcase', 'skipped'):
+                    group_titles = _get_group_titles(group_elem for group_elem, _ in stack[1:])
+                    if self._keeps_item_in(group_titles):
+                        self._consume_streamed_item(parent, elem, group_titles)
+                    else:
+                        elem.clear()
+                        parent.remove(elem)
+                elif len(stack) == 1 and elem.tag in self._ROOT_CHILD_HANDLERS:
+                    # 元信息章节闭合后立即解析并释放
+                    self._handle_root_child(elem)
+                    elem.clear()
+                    parent.remove(elem)
+        
+        return root
+    
+    def _parse_streaming_lxml(self):
+        """lxml版本的流式解析，只对testcase/skipped产生事件，其余元素在C层完成构建"""
+        with open_report_file(self.xml_file_path, self.progress) as source:
+            context = lxml_etree.iterparse(
+                source, events=('end',), tag=('testcase', 'skipped'),
+                huge_tree=True, remove_comments=True, remove_pis=True
+            )
+            for _, elem in context:
+                parent = elem.getparent()
                 
-                # 递归解析testcase中的所有子元素，包括testpattern和teststep
-                self._parse_testcase_elements(child, test_case)
+                # 只处理根元素或嵌套testgroup下的测试项，与_parse_elements_recursive保持一致
+                ancestor = parent
+                group_elems = []
+                while ancestor is not None and ancestor.getparent() is not None and ancestor.tag == 'testgroup':
+                    group_elems.append(ancestor)
+                    ancestor = ancestor.getparent()
+                if ancestor is None or ancestor.getparent() is not None:
+                    continue
                 
-                self.report_data.test_items.append(test_case)
+                group_titles = _get_group_titles(reversed(group_elems))
+                if self._keeps_item_in(group_titles):
+                    self._consume_streamed_item(parent, elem, group_titles)
+                else:
+                    elem.clear()
+                    parent.remove(elem)
+        
+        return context.root
+    
+    def _parse_expat(self):
+        """基于expat回调的解析，按块读取文件并直接构建测试用例数据对象"""
+        builder = _ExpatReportBuilder(self)
+        with open_report_file(self.xml_file_path, self.progress) as f:
+            while True:
+                data = f.read(_ExpatReportBuilder.CHUNK_SIZE)
+                if not data:
+                    break
+                builder.feed(data)
+        return builder.close()
+    
+    def _parse_fast(self):
+        """基于CANoe报告固定格式的快速解析
+        
+        先定位所有测试项的字节范围，剩余部分（元信息）用ElementTree解析；
+        每个testcase优先使用_FastTestCaseScanner，遇到非常规结构时回退到ElementTree。
+        """
+        scanner = _FastTestCaseScanner(self._intern)
+        fallback_count = 0
+        
+        with open(self.xml_file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            encoding = _detect_xml_encoding(data)
+            group_paths = []
+            root, spans = _locate_test_items(data, self.parse_filter, group_paths)
+            self._item_spans = spans
             
-            elif child.tag == 'testgroup':
-                # 递归处理嵌套的testgroup，保持顺序
-                self._parse_elements_recursive(child)
+            progress = self.progress
+            for (tag, start, end), group_path in zip(spans, group_paths):
+                test_item, fallback = self._parse_filtered_span(scanner, tag, data, start, end, encoding)
+                fallback_count += fallback
+                if progress is not None:
+                    progress.bytes_done = end
+                self._add_test_item(test_item, group_path)
+        
+        print(f"快速扫描完成: {len(spans)} 个测试项, {fallback_count} 个测试用例回退到ElementTree解析")
+        return root
+    
+    def _parse_quick(self):
+        """快速摘要解析
+        
+        定位测试项字节范围后，每个testcase只取第一个teststep/testpattern之前的头部
+        和最后的verdict拼成一个很小的文档来解析，中间的步骤完全不解码；
+        结构不符合预期时回退到完整解析（并丢弃步骤）。压缩文件无法随机访问，
+        改用expat解析并跳过步骤相关的元素。
+        延迟加载模式下同样只解析摘要，并为每个测试用例记录字节范围（LazyStepList）。
+        """
+        if is_compressed_report(self.xml_file_path):
+            print("使用快速摘要模式（expat，跳过测试步骤）")
+            builder = _ExpatReportBuilder(self, skip_steps=True)
+            with open_report_file(self.xml_file_path, self.progress) as f:
+                while True:
+                    data = f.read(_ExpatReportBuilder.CHUNK_SIZE)
+                    if not data:
+                        break
+                    builder.feed(data)
+            return builder.close()
+        
+        if self.lazy_steps:
+            print("使用延迟加载步骤模式（访问测试步骤时才解析）")
+        else:
+            print("使用快速摘要模式（跳过测试步骤）")
+        fallback_count = 0
+        with open(self.xml_file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            encoding = _detect_xml_encoding(data)
+            group_paths = []
+            root, spans = _locate_test_items(data, self.parse_filter, group_paths)
+            self._item_spans = spans
+            source = None
+            if self.lazy_steps:
+                source = _LazyStepSource(self.xml_file_path, encoding, self.columnar_steps, self._drop_tabular)
+            progress = self.progress
             
-            # 忽略其他元素类型（如title, preparation等）
+            for (tag, start, end), group_path in zip(spans, group_paths):
+                summary_elem = None
+                if tag == 'testcase':
+                    summary_elem = self._parse_summary_element(data, start, end, encoding)
+                if summary_elem is not None:
+                    test_item = self._parse_testcase(summary_elem)
+                else:
+                    if tag == 'testcase':
+                        fallback_count += 1
+                    test_item = self._parse_item_bytes(tag, data[start:end], encoding)
+                    if tag == 'testcase' and test_item is not None:
+                        test_item.test_steps = []
+                if source is not None and tag == 'testcase' and test_item is not None:
+                    test_item.test_steps = LazyStepList(source, start, end)
+                if progress is not None:
+                    progress.bytes_done = end
+                self._add_test_item(test_item, group_path)
+        
+        print(f"快速摘要完成: {len(spans)} 个测试项, {fallback_count} 个测试用例回退到完整解析")
+        return root
+    
+    def _parse_summary_element(self, data, start, end, encoding):
+        """只用头部（到第一个步骤为止）和结尾的verdict构建测试用例摘要元素，无法识别时返回None"""
+        match = _QUICK_STEP_START.search(data, start, end)
+        if match is None:
+            chunk = data[start:end]
+        else:
+            verdict_start = data.rfind(b'<verdict', match.start(), end)
+            if verdict_start < 0:
+                return None
+            chunk = data[start:match.start()] + data[verdict_start:end]
+        
+        declaration = f'<?xml version="1.0" encoding="{encoding}"?>'.encode('ascii')
+        try:
+            testcase_elem = ET.fromstring(declaration + chunk)
+        except ET.ParseError:
+            return None
+        if testcase_elem.find('title') is None or testcase_elem.find('verdict') is None:
+            return None
+        return testcase_elem
+    
+    def _parse_filtered_span(self, scanner, tag, data, start, end, encoding):
+        """解析单个测试项的字节范围，返回 (测试项, 是否回退到ElementTree)
+        
+        有按标题或结果的筛选条件时先解析摘要判断: 被丢弃（返回None）或不需要步骤的测试用例
+        不再完整解析。
+        """
+        parse_filter = self.parse_filter
+        if tag == 'testcase' and parse_filter is not None and parse_filter.checks_summary:
+            summary_elem = self._parse_summary_element(data, start, end, encoding)
+            if summary_elem is not None:
+                test_item = self._parse_testcase(summary_elem)
+                if test_item is None or not parse_filter.keeps_steps(test_item.verdict):
+                    return test_item, False
+        return self._parse_item_span(scanner, tag, data[start:end], encoding)
+    
+    def _parse_parallel(self):
+        """多进程并行解析
+        
+        主进程通过mmap扫描测试项的字节范围并解析元信息骨架，再把字节范围按大小均分成若干批，
+        由进程池中的_parse_span_batch分别解析（fast后端使用快速扫描器，其余后端使用ElementTree），
+        最后按文档顺序合并。工作进程自行打开文件，进程间只传递字节范围和解析结果。
+        """
+        with open(self.xml_file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            group_paths = []
+            root, spans = _locate_test_items(data, self.parse_filter, group_paths)
+        self._item_spans = spans
+        
+        # 每个进程分到多批，避免个别超大测试用例拖慢整体
+        batches = _split_spans(spans, self.jobs * PARALLEL_BATCHES_PER_JOB)
+        group_path_batches = []
+        position = 0
+        for batch in batches:
+            group_path_batches.append(group_paths[position:position + len(batch)])
+            position += len(batch)
+        print(f"使用并行解析模式: {self.jobs} 个进程, {len(spans)} 个测试项分为 {len(batches)} 批")
+        
+        fallback_count = 0
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            results = executor.map(_parse_span_batch, repeat(self.xml_file_path), batches,
+                                   repeat(self.backend == 'fast'), repeat(self.parse_filter), group_path_batches)
+            # executor.map按提交顺序返回，回调仍按文档顺序触发
+            for batch, (test_items, batch_fallback_count) in zip(batches, results):
+                fallback_count += batch_fallback_count
+                if self.progress is not None and batch:
+                    self.progress.bytes_done = batch[-1][2]
+                for test_item in test_items:
+                    self._add_test_item(test_item)
+        
+        if self.backend == 'fast':
+            print(f"并行解析完成: {fallback_count} 个测试用例回退到ElementTree解析")
+        return root
+    
+    def _write_index(self):
+        """生成测试项索引文件，其他后端没有字节范围时单独扫描一遍文件"""
+        if is_compressed_report(self.xml_file_path):
+            print("压缩报告不支持生成索引（字节偏移需要对应未压缩的文件）")
+            return
+        if self.quick:
+            print("快速摘要模式没有步骤数量，不生成索引")
+            return
+        if self.parse_filter is not None:
+            print("使用筛选条件时测试项不完整，不生成索引")
+            return
+        
+        spans = self._item_spans
+        if spans is None:
+            with open(self.xml_file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                _, spans = _locate_test_items(data)
+        
+        if len(spans) != len(self.report_data.test_items):
+            print(f"❌ 无法生成索引: 扫描到 {len(spans)} 个测试项，解析结果为 {len(self.report_data.test_items)} 个")
+            return
+        write_report_index(self.xml_file_path, self.report_data.test_items, spans)
+    
+    def _parse_item_span(self, scanner, tag, chunk, encoding):
+        """解析单个测试项的原始字节，返回 (测试项, 是否回退到ElementTree)
+        
+        scanner为None时直接使用ElementTree。
+        """
+        if scanner is not None and tag == 'testcase':
+            test_item = scanner.parse(chunk.decode(encoding))
+            if test_item is not None:
+                return test_item, False
+            return self._parse_item_bytes(tag, chunk, encoding), True
+        return self._parse_item_bytes(tag, chunk, encoding), False
+    
+    def _parse_item_bytes(self, tag, chunk, encoding):
+        """用ElementTree解析单个测试项的原始字节"""
+        declaration = f'<?xml version="1.0" encoding="{encoding}"?>'.encode('ascii')
+        elem = ET.fromstring(declaration + chunk)
+        if tag == 'skipped':
+            return self._parse_skipped(elem)
+        return self._parse_testcase(elem)
+    
+    def _keeps_item_in(self, group_titles):
+        """按测试组路径筛选: group_titles为测试项所在的各级testgroup标题（从外到内）"""
+        parse_filter = self.parse_filter
+        return parse_filter is None or parse_filter.keeps_group(group_titles)
+    
+    def _consume_streamed_item(self, parent, elem, group_titles):
+        """解析流式读取到的测试项，并释放其子树"""
+        if elem.tag == 'skipped':
+            self._add_test_item(self._parse_skipped(elem), '/'.join(group_titles))
+        else:
+            self._add_test_item(self._parse_testcase(elem), '/'.join(group_titles))
+        
+        elem.clear()
+        parent.remove(elem)
+    
+    def _intern(self, value):
+        """复用内容相同的字符串对象，数百万步骤共享少量result/level/type/ident取值"""
+        pooled = self._string_pool.get(value)
+        if pooled is not None:
+            return pooled
+        if len(self._string_pool) < STRING_POOL_LIMIT:
+            self._string_pool[value] = value
+        return value
+    
+    def _share_tabular(self, tabular):
+        """返回内容相同的已有TabularInfo，没有时记录并返回tabular本身
+        
+        CANoe的信号检查步骤常常重复相同的表头甚至整张表格，共用对象后内存中只保留一份。
+        """
+        headings_key = tuple(tabular.headings)
+        headings = self._headings_pool.get(headings_key)
+        if headings is not None:
+            tabular.headings = headings
+        elif len(self._headings_pool) < TABLE_POOL_LIMIT:
+            self._headings_pool[headings_key] = tabular.headings
+        
+        key = hash((tabular.expand, tabular.description, headings_key, tuple(map(tuple, tabular.rows))))
+        candidates = self._table_pool.get(key)
+        if candidates is None:
+            if len(self._table_pool) < TABLE_POOL_LIMIT:
+                self._table_pool[key] = [tabular]
+            return tabular
+        for pooled in candidates:
+            if (pooled.rows == tabular.rows and pooled.headings == tabular.headings
+                    and pooled.description == tabular.description and pooled.expand == tabular.expand):
+                return pooled
+        candidates.append(tabular)
+        return tabular
+    
+    def use_cached_data(self, report_data):
+        """代替parse()使用缓存的解析结果: 按文档顺序重新记录测试项并触发回调"""
+        self._start_progress()
+        test_items = report_data.test_items
+        report_data.test_items = []
+        self.report_data = report_data
+        for test_item in test_items:
+            self._add_test_item(test_item)
+        
+        if self.write_index:
+            self._write_index()
+        self._finish_progress()
+        return report_data
+    
+    def _add_test_item(self, test_item, group_path=None):
+        """按文档顺序记录测试项，并通知回调（test_item为None或不满足筛选条件时丢弃）
+        
+        group_path为测试项所在的测试组路径，None表示保留测试项已有的路径（如缓存的解析结果）。
+        """
+        if test_item is None:
+            return
+        if group_path is not None:
+            test_item.group_path = group_path
+        if self.parse_filter is not None and not self.parse_filter.apply(test_item):
+            return
+        if (self.columnar_steps and test_item.item_type == "testcase"
+                and not isinstance(test_item.test_steps, (ColumnarStepStore, LazyStepList))):
+            test_item.test_steps = ColumnarStepStore(test_item.test_steps)
+        self.report_data.test_items.append(test_item)
+        if self.progress is not None:
+            self.progress.add_item(test_item)
+        if self.on_test_item:
+            self.on_test_item(len(self.report_data.test_items) - 1, test_item)
+    
+    def _parse_skipped(self, skipped_elem):
+        """解析跳过的测试"""
+        skipped = SkippedTest()
+        skipped.start_time = skipped_elem.get('starttime', '')
+        skipped.timestamp = skipped_elem.get('timestamp', '')
+        
+        title_elem = skipped_elem.find('title')
+        if title_elem is not None:
+            skipped.title = title_elem.text or ''
+        
+        return skipped
+    
+    def _parse_testcase(self, testcase_elem):
+        """解析测试用例"""
+        test_case = TestCase()
+        test_case.start_time = testcase_elem.get('starttime', '')
+        test_case.timestamp = testcase_elem.get('timestamp', '')
+        
+        # 查找verdict
+        verdict_elem = testcase_elem.find('verdict')
+        if verdict_elem is not None:
+            test_case.verdict = self._intern(verdict_elem.get('result', ''))
+            test_case.end_time = verdict_elem.get('endtime', '')
+            test_case.end_timestamp = verdict_elem.get('endtimestamp', '')
+        
+        # 查找title和description
+        title_elem = testcase_elem.find('title')
+        if title_elem is not None:
+            test_case.title = title_elem.text or ''
+        
+        desc_elem = testcase_elem.find('description')
+        if desc_elem is not None:
+            test_case.description = desc_elem.text or ''
+        
+        # 筛选条件: 标题不匹配时丢弃，结果不需要步骤时跳过步骤
+        parse_filter = self.parse_filter
+        if parse_filter is not None:
+            if not parse_filter.keeps_title(test_case.title):
+                return None
+            if not parse_filter.keeps_steps(test_case.verdict):
+                return test_case
+        
+        # 递归解析testcase中的所有子元素，包括testpattern和teststep
+        self._parse_testcase_elements(testcase_elem, test_case)
+        
+        return test_case
     
     def _parse_testcase_elements(self, testcase_elem, test_case):
         """递归解析testcase中的所有元素，包括testpattern和teststep"""
@@ -245,18 +1232,20 @@ class TestReportParser:
     
     def _parse_test_step(self, step_elem):
         """解析测试步骤"""
+        intern = self._intern
         step = TestStep()
         step.timestamp = step_elem.get('timestamp', '')
-        step.level = step_elem.get('level', '')
-        step.type = step_elem.get('type', '')
-        step.ident = step_elem.get('ident', '')
-        step.result = step_elem.get('result', '')
+        step.level = intern(step_elem.get('level', ''))
+        step.type = intern(step_elem.get('type', ''))
+        step.ident = intern(step_elem.get('ident', ''))
+        step.result = intern(step_elem.get('result', ''))
         step.content = step_elem.text or ''
         
         # 解析tabularinfo
-        tabular_elem = step_elem.find('tabularinfo')
-        if tabular_elem is not None:
-            step.tabular_info = self._parse_tabular_info(tabular_elem)
+        if not self._drop_tabular:
+            tabular_elem = step_elem.find('tabularinfo')
+            if tabular_elem is not None:
+                step.tabular_info = self._parse_tabular_info(tabular_elem)
         
         return step
     
@@ -282,145 +1271,1414 @@ class TestReportParser:
                 row_data.append(cell_elem.text or '')
             tabular.rows.append(row_data)
         
-        return tabular
+        return self._share_tabular(tabular)
+    
+    def _handle_title(self, title_elem):
+        """报告标题"""
+        self.report_data.title = title_elem.text or ''
     
-    def _parse_engineer_info(self, root):
+    def _handle_engineer(self, engineer_elem):
         """解析工程师信息"""
-        engineer_elem = root.find('engineer')
-        if engineer_elem is not None:
-            for xinfo_elem in engineer_elem.findall('.//xinfo'):
-                name_elem = xinfo_elem.find('name')
-                desc_elem = xinfo_elem.find('description')
-                
-                name = name_elem.text if name_elem is not None else ''
-                desc = desc_elem.text if desc_elem is not None else ''
-                
-                self.report_data.engineer_info[name] = desc
+        for xinfo_elem in engineer_elem.iter('xinfo'):
+            name, desc = self._read_xinfo(xinfo_elem)
+            self.report_data.engineer_info[name] = desc
     
-    def _parse_testsetup_info(self, root):
+    def _handle_testsetup(self, testsetup_elem):
         """解析测试设置信息"""
-        testsetup_elem = root.find('testsetup')
-        if testsetup_elem is not None:
-            for xinfo_elem in testsetup_elem.findall('.//xinfo'):
-                name_elem = xinfo_elem.find('name')
-                desc_elem = xinfo_elem.find('description')
-                
-                name = name_elem.text if name_elem is not None else ''
-                desc = desc_elem.text if desc_elem is not None else ''
-                
-                self.report_data.testsetup_info[name] = desc
-    
-    def _parse_hardware_info(self, root):
-        """解析硬件信息"""
-        hardware_elems = root.findall('hardware')
-        for hardware_elem in hardware_elems:
-            hardware_name = hardware_elem.get('name', 'Unknown Hardware')
-            hardware_category = hardware_elem.get('category', '')
-            
-            # 创建硬件类别的主键
-            hardware_key = f"{hardware_name}_{hardware_category}" if hardware_category else hardware_name
-            
-            # 初始化硬件信息
-            self.report_data.hardware_info[hardware_key] = {
-                'name': hardware_name,
-                'category': hardware_category,
-                'devices': []
+        for xinfo_elem in testsetup_elem.iter('xinfo'):
+            name, desc = self._read_xinfo(xinfo_elem)
+            self.report_data.testsetup_info[name] = desc
+    
+    def _handle_completion(self, completion_elem):
+        """completion/compend中的结束时间"""
+        for child in completion_elem:
+            if child.tag == 'compend':
+                self._compend_end_time = child.get('endtime', '')
+                break
+    
+    def _handle_verdict(self, verdict_elem):
+        """报告verdict中的结束时间"""
+        self._verdict_end_time = verdict_elem.get('endtime', '') or verdict_elem.get('time', '')
+    
+    def _handle_hardware(self, hardware_elem):
+        """解析硬件信息
+        
+        一次遍历hardware子树: xinfoset下的每个xinfoobject作为一个设备；
+        没有任何设备时，把子树中的全部xinfo作为一个通用设备。
+        """
+        hardware_name = hardware_elem.get('name', 'Unknown Hardware')
+        hardware_category = hardware_elem.get('category', '')
+        
+        # 创建硬件类别的主键
+        hardware_key = f"{hardware_name}_{hardware_category}" if hardware_category else hardware_name
+        
+        devices = []
+        all_xinfo_elems = []  # 没有设备时使用的全部xinfo
+        for elem in hardware_elem.iter():
+            if elem.tag == 'xinfo':
+                all_xinfo_elems.append(elem)
+            elif elem.tag == 'xinfoset':
+                for xinfoobject_elem in elem:
+                    if xinfoobject_elem.tag != 'xinfoobject':
+                        continue
+                    devices.append({
+                        'type': xinfoobject_elem.get('type', ''),
+                        'properties': self._read_xinfo_properties(
+                            child for child in xinfoobject_elem if child.tag == 'xinfo')
+                    })
+        
+        # 如果没有找到设备信息，但有直接的 xinfo 元素，则按旧方式处理
+        if not devices and all_xinfo_elems:
+            devices.append({
+                'type': 'general',
+                'properties': self._read_xinfo_properties(all_xinfo_elems)
+            })
+        
+        self.report_data.hardware_info[hardware_key] = {
+            'name': hardware_name,
+            'category': hardware_category,
+            'devices': devices
+        }
+    
+    @staticmethod
+    def _read_xinfo(xinfo_elem):
+        """返回xinfo的 (name, description) 文本，子元素不存在时为空字符串"""
+        name = desc = None
+        for child in xinfo_elem:
+            if child.tag == 'name':
+                if name is None:
+                    name = child
+            elif child.tag == 'description':
+                if desc is None:
+                    desc = child
+        return (name.text if name is not None else '',
+                desc.text if desc is not None else '')
+    
+    def _read_xinfo_properties(self, xinfo_elems):
+        """设备属性: {key: {'name': ..., 'description': ...}}"""
+        properties = {}
+        for xinfo_elem in xinfo_elems:
+            name, desc = self._read_xinfo(xinfo_elem)
+            properties[xinfo_elem.get('key', '')] = {
+                'name': name,
+                'description': desc
             }
+        return properties
+    
+    # 根元素子元素的处理方法: 标签 -> (处理方法, 是否只处理第一个同名元素)
+    _ROOT_CHILD_HANDLERS = {
+        'title': (_handle_title, True),
+        'engineer': (_handle_engineer, True),
+        'testsetup': (_handle_testsetup, True),
+        'hardware': (_handle_hardware, False),
+        'completion': (_handle_completion, True),
+        'verdict': (_handle_verdict, True),
+    }
+
+class _ExpatReportBuilder:
+    """expat回调状态机
+    
+    测试用例内部（teststep、testpattern、tabularinfo等）通过一个小型状态机直接构建
+    TestCase/TestStep/TabularInfo，访问规则与_parse_testcase、_parse_testpattern、
+    _parse_tabular_info一致；测试用例以外的元信息与skipped仍交给TreeBuilder构建，
+    以便复用基于元素的元信息解析逻辑。
+    筛选条件中测试组路径、标题（标题之后的内容整体跳过）和drop_tabular在构建时生效；
+    按测试用例结果保留步骤（steps_verdicts）要等verdict出现，由_add_test_item中的ParseFilter.apply丢弃。
+    """
+    CHUNK_SIZE = 4 * 1024 * 1024  # 每次送入expat的字节数
+    
+    # 测试用例内部: (父元素角色, 子元素标签) -> (子元素角色, 是否只处理第一个同名子元素)
+    _CHILD_ROLES = {
+        ('testcase', 'title'): ('testcase_title', True),
+        ('testcase', 'description'): ('testcase_description', True),
+        ('testcase', 'verdict'): ('verdict', True),
+        ('testcase', 'teststep'): ('teststep', False),
+        ('testcase', 'testpattern'): ('testpattern', False),
+        ('testpattern', 'title'): ('testpattern_title', True),
+        ('testpattern', 'teststep'): ('teststep', False),
+        ('testpattern', 'testpattern'): ('testpattern', False),
+        ('teststep', 'tabularinfo'): ('tabularinfo', True),
+        ('tabularinfo', 'description'): ('tabular_description', True),
+        ('tabularinfo', 'heading'): ('heading', True),
+        ('tabularinfo', 'row'): ('row', False),
+        ('heading', 'cell'): ('heading_cell', False),
+        ('row', 'cell'): ('row_cell', False),
+    }
+    
+    # 需要收集文本（对应Element.text，即第一个子元素之前的文本）的角色
+    _TEXT_ROLES = frozenset((
+        'testcase_title', 'testcase_description', 'testpattern_title',
+        'teststep', 'tabular_description', 'heading_cell', 'row_cell',
+    ))
+    
+    def __init__(self, report_parser, skip_steps=False):
+        self.report_parser = report_parser
+        self.intern = report_parser._intern
+        self.skip_steps = skip_steps  # 快速摘要模式: teststep和testpattern整体跳过，不创建任何对象
+        self.parse_filter = report_parser.parse_filter
+        self.drop_tabular = report_parser._drop_tabular
+        self.tree_builder = ET.TreeBuilder()
+        self.tree_stack = []  # 测试用例以外的元素栈: (元素, 是否为需要递归的容器)
+        self.root = None
+        
+        self.test_case = None
+        self.frames = []  # 测试用例内部的状态栈: [角色, 数据对象, 已处理的"唯一"子元素, 文本片段]
+        self.text_parts = None  # 当前正在收集文本的片段列表
+        
+        self.expat = xml.parsers.expat.ParserCreate()
+        self.expat.buffer_text = True
+        self.expat.buffer_size = 256 * 1024
+        self.expat.StartElementHandler = self._start
+        self.expat.EndElementHandler = self._end
+        self.expat.CharacterDataHandler = self._data
+    
+    def feed(self, data):
+        """送入一段XML字节数据"""
+        self.expat.Parse(data, False)
+    
+    def close(self):
+        """结束解析，返回只包含元信息的根元素"""
+        self.expat.Parse(b'', True)
+        return self.root
+    
+    def _data(self, data):
+        if self.frames:
+            if self.text_parts is not None:
+                self.text_parts.append(data)
+        else:
+            self.tree_builder.data(data)
+    
+    def _start(self, tag, attrs):
+        if self.frames:
+            self._start_in_testcase(tag, attrs)
+            return
+        
+        parent_is_container = self.tree_stack[-1][1] if self.tree_stack else True
+        if tag == 'testcase' and self.tree_stack and parent_is_container:
+            group_titles = _get_group_titles(elem for elem, _ in self.tree_stack[1:])
+            if not self.report_parser._keeps_item_in(group_titles):
+                # 不在筛选的测试组路径下，整个测试用例跳过
+                self.frames.append(['skip', None, None, None])
+                return
+            test_case = TestCase()
+            test_case.group_path = '/'.join(group_titles)
+            test_case.start_time = attrs.get('starttime', '')
+            test_case.timestamp = attrs.get('timestamp', '')
+            self.test_case = test_case
+            self.frames.append(['testcase', test_case, set(), None])
+            return
+        
+        elem = self.tree_builder.start(tag, attrs)
+        if self.root is None:
+            self.root = elem
+            self.tree_stack.append((elem, True))
+        else:
+            self.tree_stack.append((elem, parent_is_container and tag == 'testgroup'))
+    
+    def _end(self, tag):
+        if self.frames:
+            self._end_in_testcase()
+            return
+        
+        elem = self.tree_builder.end(tag)
+        self.tree_stack.pop()
+        if tag == 'skipped' and self.tree_stack and self.tree_stack[-1][1]:
+            group_titles = _get_group_titles(group_elem for group_elem, _ in self.tree_stack[1:])
+            if self.report_parser._keeps_item_in(group_titles):
+                self.report_parser._add_test_item(self.report_parser._parse_skipped(elem), '/'.join(group_titles))
+            self.tree_stack[-1][0].remove(elem)
+        elif len(self.tree_stack) == 1 and tag in TestReportParser._ROOT_CHILD_HANDLERS:
+            # 元信息章节闭合后立即解析并释放
+            self.report_parser._handle_root_child(elem)
+            self.tree_stack[0][0].remove(elem)
+    
+    def _start_in_testcase(self, tag, attrs):
+        parent = self.frames[-1]
+        # 子元素开始后，父元素的text部分结束
+        self.text_parts = None
+        
+        role = 'skip'
+        if parent[0] != 'skip':
+            role_info = self._CHILD_ROLES.get((parent[0], tag))
+            if (role_info is not None and not (self.skip_steps and role_info[0] in ('teststep', 'testpattern'))
+                    and not (self.drop_tabular and role_info[0] == 'tabularinfo')):
+                role, first_only = role_info
+                if first_only:
+                    if tag in parent[2]:
+                        role = 'skip'
+                    else:
+                        parent[2].add(tag)
+        
+        if role == 'skip':
+            self.frames.append(['skip', None, None, None])
+            return
+        
+        obj = parent[1]
+        if role == 'teststep':
+            intern = self.intern
+            step = TestStep()
+            step.timestamp = attrs.get('timestamp', '')
+            step.level = intern(attrs.get('level', ''))
+            step.type = intern(attrs.get('type', ''))
+            step.ident = intern(attrs.get('ident', ''))
+            step.result = intern(attrs.get('result', ''))
+            self.test_case.test_steps.append(step)
+            obj = step
+        elif role == 'testpattern':
+            obj = self._start_testpattern(attrs)
+        elif role == 'tabularinfo':
+            tabular = TabularInfo()
+            tabular.expand = attrs.get('expand', '')
+            obj.tabular_info = tabular
+            obj = tabular
+        elif role == 'row':
+            row_data = []
+            obj.rows.append(row_data)
+            obj = row_data
+        elif role == 'verdict':
+            self.test_case.verdict = self.intern(attrs.get('result', ''))
+            self.test_case.end_time = attrs.get('endtime', '')
+            self.test_case.end_timestamp = attrs.get('endtimestamp', '')
+        
+        if role in self._TEXT_ROLES:
+            self.text_parts = []
+            self.frames.append([role, obj, set(), self.text_parts])
+        else:
+            self.frames.append([role, obj, set(), None])
+    
+    def _start_testpattern(self, attrs):
+        """testpattern开始时先占位标记步骤，保证其位于内部步骤之前"""
+        pattern_step = TestStep()
+        pattern_step.timestamp = attrs.get('timestamp', '')
+        pattern_step.level = "0"
+        pattern_step.type = "testpattern"
+        pattern_step.ident = "pattern"
+        pattern_step.result = "na"
+        
+        test_steps = self.test_case.test_steps
+        test_steps.append(pattern_step)
+        # [标记步骤, 在步骤列表中的位置, 是否有title, title文本, name属性]
+        return [pattern_step, len(test_steps) - 1, False, None, attrs.get('name', '')]
+    
+    def _end_in_testcase(self):
+        role, obj, _, text_parts = self.frames.pop()
+        self.text_parts = None
+        
+        if text_parts is not None:
+            text = ''.join(text_parts) if text_parts else None
+            if role == 'teststep':
+                obj.content = text or ''
+            elif role == 'row_cell':
+                obj.append(text or '')
+            elif role == 'heading_cell':
+                obj.headings.append(text or '')
+            elif role == 'tabular_description':
+                obj.description = text or ''
+            elif role == 'testcase_title':
+                obj.title = text or ''
+                if self.parse_filter is not None and not self.parse_filter.keeps_title(obj.title):
+                    # 标题不匹配筛选条件，测试用例剩余部分整体跳过
+                    self.frames[-1][0] = 'skip'
+                    self.test_case = None
+            elif role == 'testcase_description':
+                obj.description = text or ''
+            elif role == 'testpattern_title':
+                obj[2] = True
+                obj[3] = text
+        elif role == 'tabularinfo':
+            # 表格闭合后换成内容相同的已有表格
+            self.frames[-1][1].tabular_info = self.report_parser._share_tabular(obj)
+        elif role == 'testpattern':
+            pattern_step, position, has_title, title, name = obj
+            pattern_title = title if has_title else name
+            if pattern_title:
+                pattern_step.content = f"=== {pattern_title} ==="
+            else:
+                del self.test_case.test_steps[position]
+        elif role == 'testcase':
+            test_case = self.test_case
+            self.test_case = None
+            self.report_parser._add_test_item(test_case)
+
+class ReportTailer:
+    """跟踪仍在写入中的报告
+    
+    基于_ExpatReportBuilder增量解析: 记录已读取的字节位置，每次poll只读取并解析新追加的字节，
+    测试项闭合后立即通过on_test_item回调交给调用方；未写完的测试用例由expat保留状态等待后续数据。
+    """
+    
+    def __init__(self, xml_file_path, on_test_item=None):
+        self.xml_file_path = xml_file_path
+        self.parser = TestReportParser(xml_file_path, on_test_item=on_test_item, backend='expat')
+        self.builder = _ExpatReportBuilder(self.parser)
+        self.position = 0       # 已送入解析器的字节数
+        self.finished = False   # 根元素是否已闭合（报告写入完成）
+    
+    @property
+    def report_data(self):
+        return self.parser.report_data
+    
+    @property
+    def started(self):
+        """是否已读取到根元素"""
+        return self.builder.root is not None
+    
+    def poll(self):
+        """解析上次poll之后追加的内容，返回新增的测试项数量
+        
+        Raises:
+            ValueError: 文件比已读取的部分更短（报告被截断或重新开始写入）
+        """
+        if self.finished:
+            return 0
+        
+        size = os.path.getsize(self.xml_file_path)
+        if size < self.position:
+            raise ValueError(f"报告文件变短（{size} < {self.position} 字节），可能已重新开始写入")
+        
+        item_count = len(self.report_data.test_items)
+        with open(self.xml_file_path, 'rb') as f:
+            f.seek(self.position)
+            while True:
+                data = f.read(_ExpatReportBuilder.CHUNK_SIZE)
+                if not data:
+                    break
+                self.builder.feed(data)
+                self.position += len(data)
+        
+        root = self.builder.root
+        if root is not None:
+            if not self.builder.tree_stack:
+                self.builder.close()
+                self.finished = True
+            # 元信息章节在闭合时已由_ExpatReportBuilder解析，这里只更新报告属性
+            self.parser._finish_report_info(root)
+        
+        return len(self.report_data.test_items) - item_count
+
+# 测试项定位: 跳过注释和CDATA，只识别testgroup/testcase/skipped标签（属性值中允许出现">"）
+_ITEM_TAG_PATTERN = re.compile(
+    rb'<!--.*?-->|<!\[CDATA\[.*?\]\]>'
+    rb'|<(/?)(testgroup|testcase|skipped)(?=[\s/>])(?:[^>"\']|"[^"]*"|\'[^\']*\')*?(/?)>',
+    re.DOTALL
+)
+
+_XML_DECLARATION_PATTERN = re.compile(rb'<\?xml[^>]*?encoding\s*=\s*["\']([A-Za-z0-9._-]+)["\']')
+
+def _detect_xml_encoding(data):
+    """从XML声明中读取编码，默认UTF-8"""
+    match = _XML_DECLARATION_PATTERN.match(data[:200])
+    return match.group(1).decode('ascii') if match else 'utf-8'
+
+def _scan_test_item_spans(data):
+    """扫描所有最外层的testcase/skipped，返回 [(标签, 起始字节, 结束字节)]
+    
+    只识别testcase/skipped标签本身，是否处于根元素或testgroup中由_locate_test_items判断。
+    """
+    spans = []
+    item_tag = None      # 当前所在测试项的标签
+    item_start = 0
+    item_depth = 0       # 测试项内部同名标签的嵌套深度
+    
+    for match in _ITEM_TAG_PATTERN.finditer(data):
+        tag = match.group(2)
+        if tag is None:
+            continue  # 注释或CDATA
+        is_end = bool(match.group(1))
+        is_empty = bool(match.group(3))
+        
+        if item_tag is not None:
+            if tag != item_tag or is_empty:
+                continue
+            if not is_end:
+                item_depth += 1
+            elif item_depth:
+                item_depth -= 1
+            else:
+                spans.append((item_tag.decode('ascii'), item_start, match.end()))
+                item_tag = None
+            continue
+        
+        if tag == b'testgroup' or is_end:
+            continue  # testgroup的嵌套关系由骨架文档确定
+        if is_empty:
+            spans.append((tag.decode('ascii'), match.start(), match.end()))
+        else:
+            item_tag = tag
+            item_start = match.start()
+    
+    return spans
+
+def _split_spans(spans, batch_count):
+    """按字节数把测试项范围切分为至多batch_count个连续批次"""
+    if not spans:
+        return []
+    total_size = sum(end - start for _, start, end in spans)
+    batch_size = max(1, total_size // batch_count)
+    
+    batches = [[]]
+    size = 0
+    for span in spans:
+        if size >= batch_size:
+            batches.append([])
+            size = 0
+        batches[-1].append(span)
+        size += span[2] - span[1]
+    return batches
+
+# 快速摘要模式: 测试用例中第一个步骤的位置（之前为title、description等头部信息）
+_QUICK_STEP_START = re.compile(rb'<(?:teststep|testpattern)[\s/>]')
+
+# 骨架文档中代替测试项的占位元素
+_SPAN_PLACEHOLDER = '_item_span'
+
+def _build_skeleton(data, spans):
+    """把所有测试项替换为占位元素后的文档骨架（只包含元信息，体积很小）"""
+    parts = []
+    position = 0
+    for index, (_, start, end) in enumerate(spans):
+        parts.append(data[position:start])
+        parts.append(f'<{_SPAN_PLACEHOLDER} index="{index}"/>'.encode('ascii'))
+        position = end
+    parts.append(data[position:])
+    return b''.join(parts)
+
+def _locate_test_items(data, parse_filter=None, group_paths=None):
+    """定位需要解析的测试项（指定parse_filter时只保留测试组路径匹配的测试项）
+    
+    group_paths为列表时，按字节范围的顺序追加每个测试项所在的测试组路径（各级标题用/连接）。
+    
+    Returns:
+        (根元素, 测试项字节范围列表): 根元素只保留元信息；字节范围按文档顺序排列，
+        只包含_parse_elements_recursive会访问到的测试项（根元素及嵌套testgroup下）
+    """
+    spans = _scan_test_item_spans(data)
+    root = ET.fromstring(_build_skeleton(data, spans))
+    
+    selected = []
+    
+    def collect(parent_elem, group_titles):
+        keeps_items = parse_filter is None or parse_filter.keeps_group(group_titles)
+        for child in parent_elem:
+            if child.tag == _SPAN_PLACEHOLDER:
+                if keeps_items:
+                    selected.append(spans[int(child.get('index'))])
+                    if group_paths is not None:
+                        group_paths.append('/'.join(group_titles))
+            elif child.tag == 'testgroup':
+                if parse_filter is None and group_paths is None:
+                    collect(child, group_titles)
+                else:
+                    child_titles = group_titles + (_get_group_title(child),)
+                    if parse_filter is None or parse_filter.may_contain(child_titles):
+                        collect(child, child_titles)
+    
+    collect(root, ())
+    
+    # 移除全部占位元素，骨架只保留原有的元信息
+    for parent_elem in list(root.iter()):
+        placeholders = [child for child in parent_elem if child.tag == _SPAN_PLACEHOLDER]
+        for child in placeholders:
+            parent_elem.remove(child)
+    
+    return root, selected
+
+_XML_ENTITY_PATTERN = re.compile(r'&(?:(lt|gt|amp|quot|apos)|#x([0-9a-fA-F]+)|#([0-9]+));')
+_UNKNOWN_ENTITY_PATTERN = re.compile(r'&(?!(?:lt|gt|amp|quot|apos);)')
+_XML_PREDEFINED_ENTITIES = {'lt': '<', 'gt': '>', 'amp': '&', 'quot': '"', 'apos': "'"}
+
+def _replace_xml_entity(match):
+    name, hex_code, dec_code = match.groups()
+    if name:
+        return _XML_PREDEFINED_ENTITIES[name]
+    return chr(int(hex_code, 16) if hex_code else int(dec_code))
+
+def _unescape_xml_text(text):
+    """按XML规则还原文本（换行规范化 + 实体替换），出现未知实体时返回None"""
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    if '&' not in text:
+        return text
+    if '&#' in text:
+        # 含数字字符引用时走正则
+        if text.count('&') != len(_XML_ENTITY_PATTERN.findall(text)):
+            return None
+        return _XML_ENTITY_PATTERN.sub(_replace_xml_entity, text)
+    # 只有预定义实体的常见情况，用str.replace处理更快（&amp;必须最后替换）
+    if _UNKNOWN_ENTITY_PATTERN.search(text):
+        return None
+    return (text.replace('&lt;', '<').replace('&gt;', '>').replace('&quot;', '"')
+            .replace('&apos;', "'").replace('&amp;', '&'))
+
+_ATTRIBUTE_SPECIAL_CHARS = re.compile(r'[&\t\n\r]')
+
+def _unescape_xml_attribute(value):
+    """按XML规则还原属性值（空白规范化 + 实体替换），出现未知实体时返回None"""
+    if '\r' in value or '\n' in value or '\t' in value:
+        value = value.replace('\r\n', ' ').replace('\r', ' ').replace('\n', ' ').replace('\t', ' ')
+    return _unescape_xml_text(value)
+
+class _FastTestCaseScanner:
+    """CANoe测试用例快速扫描器
+    
+    CANoe生成的teststep格式非常固定:
+    <teststep timestamp=".." level=".." type=".." ident=".." result="..">text</teststep>
+    这里用正则直接从文本中逐个提取，只接受title、description、verdict、teststep、
+    testpattern以及testpattern内的result等常规结构；遇到CDATA、注释、tabularinfo或
+    其他未知标签时返回None，由调用方回退到ElementTree解析。
+    """
+    _TESTCASE_START = re.compile(r'<testcase((?:\s+[\w.:-]+\s*=\s*"[^"<]*")*)\s*(/?)>')
+    # 每个标记前允许有空白; 分组: 1-6 teststep, 7-8 title/description, 9-11 其他起始标签, 12 结束标签
+    _TOKEN = re.compile(
+        r'\s*(?:'
+        r'<teststep\s+timestamp="([^"<]*)"\s+level="([^"<]*)"\s+type="([^"<]*)"'
+        r'\s+ident="([^"<]*)"\s+result="([^"<]*)"\s*(?:/>|>([^<]*)</teststep>)'
+        r'|<(title|description)>([^<]*)</\7>'
+        r'|<(testpattern|verdict|result)((?:\s+[\w.:-]+\s*=\s*"[^"<]*")*)\s*(/?)>'
+        r'|</(testpattern|testcase)>'
+        r')'
+    )
+    _ATTRIBUTE = re.compile(r'([\w.:-]+)\s*=\s*"([^"<]*)"')
+    
+    def __init__(self, intern):
+        self.intern = intern  # TestReportParser._intern
+    
+    def _attributes(self, text):
+        attributes = {}
+        for name, value in self._ATTRIBUTE.findall(text):
+            value = _unescape_xml_attribute(value)
+            if value is None:
+                return None
+            attributes[name] = value
+        return attributes
+    
+    def parse(self, text):
+        """解析单个testcase的文本，无法识别时返回None"""
+        match = self._TESTCASE_START.match(text)
+        if match is None:
+            return None
+        attributes = self._attributes(match.group(1))
+        if attributes is None:
+            return None
+        
+        test_case = TestCase()
+        test_case.start_time = attributes.get('starttime', '')
+        test_case.timestamp = attributes.get('timestamp', '')
+        if match.group(2):
+            return test_case if match.end() == len(text) else None
+        
+        test_steps = test_case.test_steps
+        patterns = []  # 未闭合的testpattern: [标记步骤, 位置, 是否有title, title文本, name属性]
+        seen = set()   # testcase直接子元素中已处理过的title/description/verdict
+        token = self._TOKEN.match
+        intern = self.intern
+        position = match.end()
+        
+        while True:
+            match = token(text, position)
+            if match is None:
+                return None
+            position = match.end()
+            kind = match.lastindex
             
-            # 查找 xinfoset
-            xinfoset_elems = hardware_elem.findall('.//xinfoset')
-            for xinfoset_elem in xinfoset_elems:
-                xinfoset_type = xinfoset_elem.get('type', '')
-                
-                # 查找所有 xinfoobject
-                xinfoobject_elems = xinfoset_elem.findall('xinfoobject')
-                for xinfoobject_elem in xinfoobject_elems:
-                    xinfoobject_type = xinfoobject_elem.get('type', '')
-                    
-                    # 解析设备信息
-                    device_info = {
-                        'type': xinfoobject_type,
-                        'properties': {}
-                    }
-                    
-                    # 提取所有 xinfo 属性
-                    xinfo_elems = xinfoobject_elem.findall('xinfo')
-                    for xinfo_elem in xinfo_elems:
-                        key = xinfo_elem.get('key', '')
-                        name_elem = xinfo_elem.find('name')
-                        desc_elem = xinfo_elem.find('description')
-                        
-                        name = name_elem.text if name_elem is not None else ''
-                        desc = desc_elem.text if desc_elem is not None else ''
-                        
-                        device_info['properties'][key] = {
-                            'name': name,
-                            'description': desc
-                        }
-                    
-                    # 添加设备到硬件信息中
-                    self.report_data.hardware_info[hardware_key]['devices'].append(device_info)
-            
-            # 如果没有找到设备信息，但有直接的 xinfo 元素，则按旧方式处理
-            if not self.report_data.hardware_info[hardware_key]['devices']:
-                direct_xinfo_elems = hardware_elem.findall('.//xinfo')
-                if direct_xinfo_elems:
-                    device_info = {
-                        'type': 'general',
-                        'properties': {}
-                    }
-                    
-                    for xinfo_elem in direct_xinfo_elems:
-                        key = xinfo_elem.get('key', '')
-                        name_elem = xinfo_elem.find('name')
-                        desc_elem = xinfo_elem.find('description')
-                        
-                        name = name_elem.text if name_elem is not None else ''
-                        desc = desc_elem.text if desc_elem is not None else ''
-                        
-                        device_info['properties'][key] = {
-                            'name': name,
-                            'description': desc
-                        }
-                    
-                    self.report_data.hardware_info[hardware_key]['devices'].append(device_info)
+            if kind <= 6:
+                values = match.group(1, 2, 3, 4, 5)
+                if _ATTRIBUTE_SPECIAL_CHARS.search(''.join(values)):
+                    values = [_unescape_xml_attribute(value) for value in values]
+                    if None in values:
+                        return None
+                step = TestStep()
+                step.timestamp = values[0]
+                step.level = intern(values[1])
+                step.type = intern(values[2])
+                step.ident = intern(values[3])
+                step.result = intern(values[4])
+                if kind == 6:
+                    content = _unescape_xml_text(match.group(6))
+                    if content is None:
+                        return None
+                    step.content = content
+                test_steps.append(step)
+            
+            elif kind == 8:
+                tag = match.group(7)
+                value = _unescape_xml_text(match.group(8))
+                if value is None:
+                    return None
+                if patterns:
+                    if tag == 'title' and not patterns[-1][2]:
+                        patterns[-1][2] = True
+                        patterns[-1][3] = value or None
+                elif tag not in seen:
+                    seen.add(tag)
+                    if tag == 'title':
+                        test_case.title = value
+                    else:
+                        test_case.description = value
+            
+            elif kind == 11:
+                tag = match.group(9)
+                attributes = self._attributes(match.group(10))
+                if attributes is None:
+                    return None
+                is_empty = bool(match.group(11))
+                if tag == 'testpattern':
+                    pattern_step = TestStep()
+                    pattern_step.timestamp = attributes.get('timestamp', '')
+                    pattern_step.level = "0"
+                    pattern_step.type = "testpattern"
+                    pattern_step.ident = "pattern"
+                    pattern_step.result = "na"
+                    test_steps.append(pattern_step)
+                    patterns.append([pattern_step, len(test_steps) - 1, False, None, attributes.get('name', '')])
+                    if is_empty:
+                        self._close_pattern(patterns.pop(), test_steps)
+                elif not is_empty:
+                    return None  # verdict/result只接受空元素形式
+                elif tag == 'verdict' and not patterns and 'verdict' not in seen:
+                    seen.add('verdict')
+                    test_case.verdict = intern(attributes.get('result', ''))
+                    test_case.end_time = attributes.get('endtime', '')
+                    test_case.end_timestamp = attributes.get('endtimestamp', '')
+            
+            elif match.group(12) == 'testpattern':
+                if not patterns:
+                    return None
+                self._close_pattern(patterns.pop(), test_steps)
+            
+            else:
+                # </testcase>必须是最后一个标记
+                if patterns or position != len(text):
+                    return None
+                return test_case
+    
+    @staticmethod
+    def _close_pattern(pattern, test_steps):
+        pattern_step, index, has_title, title, name = pattern
+        pattern_title = title if has_title else name
+        if pattern_title:
+            pattern_step.content = f"=== {pattern_title} ==="
+        else:
+            del test_steps[index]
+
+def _parse_span_batch(xml_file_path, spans, use_scanner, parse_filter=None, group_paths=None):
+    """并行解析的工作进程入口（需为模块级函数才能被子进程导入）
+    
+    group_paths为与spans一一对应的测试组路径。
+    
+    Returns:
+        (测试项列表, 回退到ElementTree的测试用例数量)，被筛选条件丢弃的测试项不返回
+    """
+    parser = TestReportParser(xml_file_path, backend='etree', parse_filter=parse_filter)
+    scanner = _FastTestCaseScanner(parser._intern) if use_scanner else None
+    test_items = []
+    fallback_count = 0
+    
+    with open(xml_file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        encoding = _detect_xml_encoding(data)
+        for index, (tag, start, end) in enumerate(spans):
+            test_item, fallback = parser._parse_filtered_span(scanner, tag, data, start, end, encoding)
+            fallback_count += fallback
+            if test_item is not None:
+                if group_paths is not None:
+                    test_item.group_path = group_paths[index]
+                test_items.append(test_item)
+    
+    return test_items, fallback_count
+
+def get_default_cache_dir():
+    """默认的解析缓存目录（Windows下位于%LOCALAPPDATA%，其他系统位于~/.cache）"""
+    base_dir = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(base_dir) / 'CANoeTestReportGenerator' / 'parse_cache'
+
+class ReportCache:
+    """解析结果的磁盘缓存
+    
+    缓存键由文件大小、修改时间和抽样内容哈希组成；缓存文件为固定头部（魔数、格式版本、原始解析耗时）
+    加gzip压缩的pickle数据，总大小超过上限时删除最久未使用的缓存。
+    测试步骤以ColumnarStepStore形式写入（反序列化比逐个还原TestStep对象快一个数量级），
+    因此缓存命中时返回的测试步骤为ColumnarStepStore。
+    """
+    MAGIC = b'CTRCACHE'
+    HEADER = struct.Struct('<8sHd')
+    SUFFIX = '.cache'
+    
+    def __init__(self, cache_dir=None, max_size=CACHE_MAX_SIZE):
+        self.cache_dir = Path(cache_dir) if cache_dir else get_default_cache_dir()
+        self.max_size = max_size
+        self.last_hit = False          # 最近一次load是否命中
+        self.last_saved_seconds = 0.0  # 最近一次命中节省的时间
+    
+    def get_key(self, xml_file_path):
+        """计算缓存键: 小文件哈希全部内容，大文件均匀抽取CACHE_SAMPLE_COUNT段"""
+        stat = os.stat(xml_file_path)
+        size = stat.st_size
+        digest = hashlib.blake2b(digest_size=16)
+        with open(xml_file_path, 'rb') as f:
+            if size <= CACHE_SAMPLE_SIZE * CACHE_SAMPLE_COUNT:
+                digest.update(f.read())
+            else:
+                for i in range(CACHE_SAMPLE_COUNT):
+                    f.seek((size - CACHE_SAMPLE_SIZE) * i // (CACHE_SAMPLE_COUNT - 1))
+                    digest.update(f.read(CACHE_SAMPLE_SIZE))
+        return f"{size:x}-{stat.st_mtime_ns:x}-{digest.hexdigest()}"
+    
+    def _cache_path(self, xml_file_path):
+        return self.cache_dir / f"{self.get_key(xml_file_path)}{self.SUFFIX}"
+    
+    def load(self, xml_file_path):
+        """读取缓存的解析结果，未命中或缓存无效时返回None"""
+        start = time.perf_counter()
+        self.last_hit = False
+        self.last_saved_seconds = 0.0
+        cache_path = self._cache_path(xml_file_path)
+        if not cache_path.exists():
+            print("解析缓存未命中")
+            return None
+        
+        try:
+            with open(cache_path, 'rb') as f:
+                magic, version, parse_seconds = self.HEADER.unpack(f.read(self.HEADER.size))
+                if magic != self.MAGIC or version != CACHE_FORMAT_VERSION:
+                    raise ValueError(f"缓存格式版本不符: {version}")
+                with gzip.GzipFile(fileobj=f, mode='rb') as payload:
+                    report_data = pickle.load(payload)
+        except Exception as e:
+            print(f"解析缓存无效，已删除: {e}")
+            self._remove(cache_path)
+            return None
+        
+        # 更新修改时间作为最近使用时间，淘汰时优先保留常用的缓存
+        os.utime(cache_path)
+        
+        load_seconds = time.perf_counter() - start
+        self.last_hit = True
+        self.last_saved_seconds = max(0.0, parse_seconds - load_seconds)
+        print(f"✅ 解析缓存命中: 读取耗时 {load_seconds:.2f} 秒，节省约 {self.last_saved_seconds:.2f} 秒")
+        return report_data
+    
+    def store(self, xml_file_path, report_data, parse_seconds):
+        """写入解析结果（包含完整步骤数据），parse_seconds用于命中时估算节省的时间"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_path = self._cache_path(xml_file_path)
+            # 先写临时文件再替换，多人同时使用同一缓存目录时不会读到写了一半的文件
+            temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            
+            # 写入期间临时替换为列式存储，写完后恢复调用方的数据
+            original_steps = []
+            for test_item in report_data.test_items:
+                if test_item.item_type == "testcase" and not isinstance(test_item.test_steps, ColumnarStepStore):
+                    original_steps.append((test_item, test_item.test_steps))
+                    test_item.test_steps = ColumnarStepStore(test_item.test_steps)
+            try:
+                with open(temp_path, 'wb') as f:
+                    f.write(self.HEADER.pack(self.MAGIC, CACHE_FORMAT_VERSION, parse_seconds))
+                    with gzip.GzipFile(fileobj=f, mode='wb', compresslevel=1) as payload:
+                        pickle.dump(report_data, payload, protocol=pickle.HIGHEST_PROTOCOL)
+            finally:
+                for test_item, test_steps in original_steps:
+                    test_item.test_steps = test_steps
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            print(f"写入解析缓存失败: {e}")
+            return
+        
+        print(f"解析结果已缓存: {cache_path} ({cache_path.stat().st_size / 1024 / 1024:.1f} MB)")
+        self._evict(cache_path)
+    
+    def _evict(self, keep_path):
+        """缓存总大小超过上限时，从最久未使用的开始删除"""
+        entries = []
+        for cache_path in self.cache_dir.glob(f"*{self.SUFFIX}"):
+            try:
+                stat = cache_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, cache_path))
+        
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, cache_path in sorted(entries, key=lambda entry: entry[0]):
+            if total_size <= self.max_size:
+                break
+            if cache_path == keep_path:
+                continue
+            if self._remove(cache_path):
+                total_size -= size
+                print(f"已淘汰解析缓存: {cache_path.name}")
+    
+    @staticmethod
+    def _remove(cache_path):
+        try:
+            os.remove(cache_path)
+            return True
+        except OSError:
+            return False
+
+def _parse_with_cache(parser, cache):
+    """优先使用缓存的解析结果，未命中时解析并写入缓存"""
+    report_data = cache.load(parser.xml_file_path)
+    if report_data is not None:
+        return parser.use_cached_data(report_data)
+    
+    start = time.perf_counter()
+    report_data = parser.parse()
+    if report_data:
+        cache.store(parser.xml_file_path, report_data, time.perf_counter() - start)
+    return report_data
+
+def get_default_history_path():
+    """默认的历史记录数据库路径（与解析缓存目录位于同一目录下）"""
+    return get_default_cache_dir().parent / 'history.sqlite'
+
+def collect_failed_step_idents(test_steps):
+    """返回结果为fail/warn的步骤ident（去重，保持出现顺序）"""
+    return list(dict.fromkeys(step.ident for step in test_steps if step.result in FAILED_VERDICTS and step.ident))
+
+class HistoryStore:
+    """转换历史记录（本地SQLite数据库）
+    
+    每次转换记录一行运行摘要（runs）和每个测试项一行结果（testcases），同时按(测试组路径, 标题)增量更新
+    测试用例统计（testcase_stats: 结果变化次数、耗时对运行序号的最小二乘累加量），
+    查询通过率趋势、不稳定和耗时增长的测试用例时只读取汇总行，不必扫描全部历史结果。
+    统计按记录顺序进行，补录历史报告时应按时间顺序记录。
+    只保存数据库路径、每次操作单独连接，可以直接传给批量转换的工作进程（多进程写入由SQLite加锁）。
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY,
+            report_path TEXT NOT NULL,
+            title TEXT,
+            start_time TEXT,
+            end_time TEXT,
+            recorded_at TEXT,
+            total INTEGER,
+            passed INTEGER,
+            failed INTEGER,
+            warned INTEGER,
+            skipped INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS testcases (
+            run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+            item_index INTEGER NOT NULL,
+            group_path TEXT NOT NULL,
+            title TEXT NOT NULL,
+            verdict TEXT,
+            start_time TEXT,
+            end_time TEXT,
+            duration REAL,
+            steps_count INTEGER,
+            failed_idents TEXT,
+            PRIMARY KEY (run_id, item_index)
+        ) WITHOUT ROWID;
+        -- group_key/title_key为合并空白并忽略大小写后的测试组路径和标题，group_path/title为最近一次记录的原文
+        CREATE TABLE IF NOT EXISTS testcase_stats (
+            group_key TEXT NOT NULL,
+            title_key TEXT NOT NULL,
+            group_path TEXT,
+            title TEXT,
+            runs INTEGER NOT NULL DEFAULT 0,
+            flips INTEGER NOT NULL DEFAULT 0,
+            last_verdict TEXT,
+            last_run_id INTEGER,
+            n INTEGER NOT NULL DEFAULT 0,
+            sx REAL NOT NULL DEFAULT 0,
+            sy REAL NOT NULL DEFAULT 0,
+            sxy REAL NOT NULL DEFAULT 0,
+            sxx REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (group_key, title_key)
+        );
+        CREATE INDEX IF NOT EXISTS idx_runs_start_time ON runs(start_time);
+        CREATE INDEX IF NOT EXISTS idx_testcases_title ON testcases(title, run_id);
+        CREATE INDEX IF NOT EXISTS idx_testcase_stats_flips ON testcase_stats(flips);
+    """
+    
+    def __init__(self, db_path=None):
+        self.db_path = Path(db_path) if db_path else get_default_history_path()
+    
+    def _connect(self):
+        """打开数据库，首次使用时建表"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == 0:
+            conn.executescript(self.SCHEMA)
+            conn.execute(f"PRAGMA user_version = {HISTORY_SCHEMA_VERSION}")
+        elif version != HISTORY_SCHEMA_VERSION:
+            conn.close()
+            raise sqlite3.DatabaseError(f"历史记录数据库版本不符: {version}")
+        return conn
+    
+    def record_run(self, xml_file_path, report_data, failed_step_idents=None):
+        """记录一次转换
+        
+        Args:
+            failed_step_idents: {测试项序号: 失败步骤ident列表}，步骤在写出后即释放时由调用方提前收集；
+                                未提供的测试用例从其test_steps中统计
+        
+        Returns:
+            int: 运行记录的id，写入失败时返回None
+        """
+        failed_step_idents = failed_step_idents or {}
+        counts = {'pass': 0, 'fail': 0, 'warn': 0}
+        total = skipped = 0
+        rows = []
+        for index, test_item in enumerate(report_data.test_items):
+            if test_item.item_type == "skipped":
+                skipped += 1
+                rows.append((index, test_item.group_path, test_item.title, 'skipped', test_item.start_time, '', None,
+                             0, ''))
+                continue
+            total += 1
+            if test_item.verdict in counts:
+                counts[test_item.verdict] += 1
+            idents = failed_step_idents.get(index)
+            if idents is None:
+                idents = collect_failed_step_idents(test_item.test_steps)
+            rows.append((index, test_item.group_path, test_item.title, test_item.verdict, test_item.start_time,
+                         test_item.end_time, _get_item_duration(test_item), test_item.steps_count,
+                         json.dumps(idents, ensure_ascii=False)))
+        
+        try:
+            with contextlib.closing(self._connect()) as conn, conn:
+                cursor = conn.execute(
+                    "INSERT INTO runs (report_path, title, start_time, end_time, recorded_at, "
+                    "total, passed, failed, warned, skipped) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (os.path.abspath(xml_file_path), report_data.title, report_data.start_time, report_data.end_time,
+                     datetime.now().isoformat(timespec='seconds'), total, counts['pass'], counts['fail'],
+                     counts['warn'], skipped))
+                run_id = cursor.lastrowid
+                conn.executemany("INSERT INTO testcases (run_id, item_index, group_path, title, verdict, start_time, "
+                                 "end_time, duration, steps_count, failed_idents) "
+                                 "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                 ((run_id,) + row for row in rows))
+                self._update_stats(conn, run_id, [row for row in rows if row[3] != 'skipped'])
+        except sqlite3.Error as e:
+            print(f"❌ 写入历史记录失败: {e}")
+            return None
+        
+        print(f"✅ 已记录到历史数据库: {self.db_path} (运行 #{run_id})")
+        return run_id
+    
+    @staticmethod
+    def _update_stats(conn, run_id, rows):
+        """按(测试组路径, 标题)累加测试用例统计（跳过的测试不参与），耗时以运行id作为最小二乘拟合的横坐标
+        
+        同一次运行中同组同名的测试用例只计一次: 结果取其中最严重的（fail、warn优先），耗时取平均。
+        """
+        merged = {}  # (group_key, title_key) -> [测试组路径, 标题, 结果列表, 耗时列表]
+        for _, group_path, title, verdict, _, _, duration, _, _ in rows:
+            key = (_normalize_title(group_path), _normalize_title(title))
+            entry = merged.get(key)
+            if entry is None:
+                entry = merged[key] = [group_path, title, [], []]
+            entry[2].append(verdict)
+            if duration is not None:
+                entry[3].append(duration)
+        
+        conn.executemany("INSERT OR IGNORE INTO testcase_stats (group_key, title_key) VALUES (?, ?)", merged)
+        updates = []
+        for (group_key, title_key), (group_path, title, verdicts, durations) in merged.items():
+            verdict = next((failed for failed in FAILED_VERDICTS if failed in verdicts), verdicts[0])
+            if not durations:
+                updates.append((verdict, run_id, 0, 0.0, 0.0, 0.0, 0.0, group_path, title, group_key, title_key))
+                continue
+            duration = sum(durations) / len(durations)
+            updates.append((verdict, run_id, 1, run_id, duration, run_id * duration, run_id * run_id,
+                            group_path, title, group_key, title_key))
+        conn.executemany("""
+            UPDATE testcase_stats SET
+                runs = runs + 1,
+                flips = flips + (last_verdict IS NOT NULL AND last_verdict != ?1),
+                last_verdict = ?1,
+                last_run_id = ?2,
+                n = n + ?3, sx = sx + ?4, sy = sy + ?5, sxy = sxy + ?6, sxx = sxx + ?7,
+                group_path = ?8, title = ?9
+            WHERE group_key = ?10 AND title_key = ?11
+        """, updates)
+    
+    def pass_rate_trend(self, runs=None):
+        """各次运行的通过率（按开始时间从早到晚），runs限定最近的运行次数
+        
+        Returns:
+            [(运行id, 开始时间, 标题, 测试用例数, 通过数, 失败数, 通过率%)]
+        """
+        with contextlib.closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT id, start_time, title, total, passed, failed FROM runs "
+                "ORDER BY start_time DESC, id DESC LIMIT ?", (runs if runs else -1,)).fetchall()
+        return [row + ((row[4] / row[3] * 100) if row[3] else 0.0,) for row in reversed(rows)]
+    
+    def flaky_testcases(self, min_flips=2, limit=50):
+        """结果反复变化的测试用例（相邻两次记录的结果不同记为一次变化，不计跳过）
+        
+        Returns:
+            [(测试组路径, 标题, 变化次数, 运行次数, 最近一次结果)]
+        """
+        with contextlib.closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT group_path, title, flips, runs, last_verdict FROM testcase_stats WHERE flips >= ? "
+                "ORDER BY flips DESC, group_key, title_key LIMIT ?", (min_flips, limit)).fetchall()
+    
+    def slowest_growing(self, min_runs=3, limit=20):
+        """耗时增长最快的测试用例（耗时对运行序号做最小二乘拟合的斜率）
+        
+        Returns:
+            [(测试组路径, 标题, 每次运行增加的秒数, 统计的运行次数, 平均耗时秒数)]
+        """
+        with contextlib.closing(self._connect()) as conn:
+            return conn.execute("""
+                SELECT group_path, title, (n * sxy - sx * sy) / (n * sxx - sx * sx) AS slope, n, sy / n
+                FROM testcase_stats
+                WHERE n >= ? AND n * sxx - sx * sx > 0 AND n * sxy - sx * sy > 0
+                ORDER BY slope DESC
+                LIMIT ?
+            """, (min_runs, limit)).fetchall()
+    
+    def write_trend_html(self, output_file_path, runs=HISTORY_TREND_RUNS):
+        """生成趋势页面: 通过率折线、不稳定的测试用例和耗时增长最快的测试用例"""
+        trend = self.pass_rate_trend(runs)
+        flaky = self.flaky_testcases()
+        growing = self.slowest_growing()
+        
+        width, height = 900, 220
+        points = " ".join(
+            f"{(i * width / (len(trend) - 1)) if len(trend) > 1 else width / 2:.1f},{height - rate / 100 * height:.1f}"
+            for i, (*_, rate) in enumerate(trend))
+        run_rows = "".join(f"""
+            <tr><td>#{run_id}</td><td>{html.escape(start_time or '')}</td><td>{html.escape(title or '')}</td>
+                <td>{total}</td><td>{passed}</td><td>{failed}</td><td>{rate:.1f}%</td></tr>"""
+            for run_id, start_time, title, total, passed, failed, rate in reversed(trend))
+        flaky_rows = "".join(f"""
+            <tr><td class="group-path">{html.escape(group_path)}</td><td>{html.escape(title)}</td><td>{flips}</td><td>{count}</td><td>{html.escape((verdict or 'N/A').upper())}</td></tr>"""
+            for group_path, title, flips, count, verdict in flaky) or '<tr><td colspan="5" class="empty">无</td></tr>'
+        growing_rows = "".join(f"""
+            <tr><td class="group-path">{html.escape(group_path)}</td><td>{html.escape(title)}</td><td>+{slope:.3f} s</td><td>{count}</td><td>{mean:.3f} s</td></tr>"""
+            for group_path, title, slope, count, mean in growing) or '<tr><td colspan="5" class="empty">无</td></tr>'
+        
+        html_content = f"""<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>测试趋势</title>
+    <style>
+        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', 'Microsoft YaHei', sans-serif;
+               margin: 0; padding: 1.5rem; background: #f5f7fa; color: #333; }}
+        .trend-header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white;
+                         padding: 1.2rem 1.5rem; border-radius: 8px; margin-bottom: 1rem; }}
+        .trend-header h1 {{ margin: 0 0 0.4rem; font-size: 1.4rem; }}
+        .trend-header p {{ margin: 0; opacity: 0.9; font-size: 0.9rem; }}
+        .detail-section {{ background: white; border-radius: 8px; padding: 1rem 1.2rem; margin-bottom: 1rem;
+                           box-shadow: 0 1px 3px rgba(0,0,0,0.1); }}
+        .detail-section h2 {{ margin: 0 0 0.8rem; font-size: 1.1rem; color: #495057; }}
+        svg {{ width: 100%; height: auto; background: #f8f9fa; border-radius: 4px; }}
+        table {{ width: 100%; border-collapse: collapse; font-size: 0.85rem; }}
+        th, td {{ padding: 0.45rem 0.6rem; border-bottom: 1px solid #e9ecef; text-align: left; }}
+        th {{ background: #f8f9fa; color: #495057; }}
+        .empty, .group-path {{ color: #6c757d; }}
+    </style>
+</head>
+<body>
+    <div class="trend-header">
+        <h1>📈 测试趋势</h1>
+        <p>通过率: 最近 {len(trend)} 次运行 | 数据库: {html.escape(str(self.db_path))}</p>
+    </div>
+    <div class="detail-section">
+        <h2>通过率</h2>
+        <svg viewBox="-10 -10 {width + 20} {height + 20}" preserveAspectRatio="none">
+            <line x1="0" y1="0" x2="{width}" y2="0" stroke="#dee2e6" stroke-dasharray="4"/>
+            <line x1="0" y1="{height}" x2="{width}" y2="{height}" stroke="#dee2e6"/>
+            <polyline points="{points}" fill="none" stroke="#667eea" stroke-width="2"/>
+        </svg>
+    </div>
+    <div class="detail-section">
+        <h2>不稳定的测试用例</h2>
+        <table>
+            <tr><th>测试组</th><th>测试用例</th><th>结果变化次数</th><th>运行次数</th><th>最近结果</th></tr>
+            {flaky_rows}
+        </table>
+    </div>
+    <div class="detail-section">
+        <h2>耗时增长最快的测试用例</h2>
+        <table>
+            <tr><th>测试组</th><th>测试用例</th><th>每次运行增加</th><th>运行次数</th><th>平均耗时</th></tr>
+            {growing_rows}
+        </table>
+    </div>
+    <div class="detail-section">
+        <h2>运行记录</h2>
+        <table>
+            <tr><th>运行</th><th>开始时间</th><th>报告</th><th>测试用例</th><th>通过</th><th>失败</th><th>通过率</th></tr>
+            {run_rows}
+        </table>
+    </div>
+</body>
+</html>
+"""
+        with open(output_file_path, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+        print(f"趋势页面已生成: {output_file_path}")
+
+class StepDatabase:
+    """把全部测试步骤保存在一个SQLite文件中（替代每个测试用例一个steps_N.js）
+    
+    steps表按测试项序号和步骤序号保存时间戳、ident、结果和内容，内容相同的表格只在tables表中保存一次
+    （data为页面使用的JSON，text为描述、表头和单元格连接成的文本）；
+    steps_fts/tables_fts为步骤内容和表格（描述、表头、单元格）的FTS5全文索引。
+    优先使用trigram分词（与页面中的子串搜索一致，中文同样适用），SQLite不支持时依次退化为
+    unicode61分词和LIKE查询。
+    """
+    SCHEMA = """
+        CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE steps (
+            id INTEGER PRIMARY KEY,
+            item_index INTEGER NOT NULL,
+            ordinal INTEGER NOT NULL,
+            timestamp TEXT,
+            ident TEXT,
+            result TEXT,
+            content TEXT,
+            table_id INTEGER
+        );
+        CREATE TABLE tables (id INTEGER PRIMARY KEY, data TEXT NOT NULL, text TEXT NOT NULL);
+    """
+    INDEXES = """
+        CREATE UNIQUE INDEX idx_steps_item ON steps(item_index, ordinal);
+        CREATE INDEX idx_steps_item_result ON steps(item_index, result);
+        CREATE INDEX idx_steps_table ON steps(table_id);
+    """
+    FTS_TOKENIZERS = ('trigram', 'unicode61')
+    
+    def __init__(self, conn, fts):
+        self.conn = conn
+        self.fts = fts  # 全文索引使用的分词器，空字符串表示没有全文索引
+        self._table_ids = {}         # 表格JSON的MD5 -> 编号
+        self._table_object_ids = {}  # id(TabularInfo) -> (TabularInfo, 编号)
+        self._pending_steps = []
+    
+    @classmethod
+    def create(cls, db_path):
+        """新建步骤数据库（已有的文件会被覆盖）"""
+        db_path = Path(db_path)
+        if db_path.exists():
+            db_path.unlink()
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(cls.SCHEMA)
+        
+        fts = ''
+        for tokenizer in cls.FTS_TOKENIZERS:
+            try:
+                conn.execute(f"CREATE VIRTUAL TABLE steps_fts USING fts5(content, content='', tokenize='{tokenizer}')")
+                conn.execute(f"CREATE VIRTUAL TABLE tables_fts USING fts5(text, content='', tokenize='{tokenizer}')")
+            except sqlite3.OperationalError:
+                conn.execute("DROP TABLE IF EXISTS steps_fts")
+                continue
+            fts = tokenizer
+            break
+        if not fts:
+            print("当前SQLite不支持FTS5，步骤搜索将使用LIKE查询")
+        conn.execute("INSERT INTO meta VALUES ('fts', ?)", (fts,))
+        return cls(conn, fts)
+    
+    @classmethod
+    def open(cls, db_path):
+        """以只读方式打开已生成的步骤数据库"""
+        db_path = Path(db_path)
+        if not db_path.exists():
+            raise FileNotFoundError(f"步骤数据库不存在: {db_path}")
+        conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+        fts = conn.execute("SELECT value FROM meta WHERE key = 'fts'").fetchone()[0]
+        return cls(conn, fts)
+    
+    def add_steps(self, item_index, test_steps):
+        """写入一个测试用例的全部步骤"""
+        rows = []
+        for ordinal, step in enumerate(test_steps):
+            table_id = None
+            if step.tabular_info and (step.tabular_info.headings or step.tabular_info.rows):
+                table_id = self._get_table_id(step.tabular_info)
+            rows.append((item_index, ordinal, step.timestamp, step.ident, step.result, step.content, table_id))
+        
+        self.conn.executemany(
+            "INSERT INTO steps (item_index, ordinal, timestamp, ident, result, content, table_id) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        if self.fts:
+            # 步骤按顺序插入，id连续，全文索引的rowid与steps.id对应
+            last_id = self.conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            first_id = last_id - len(rows) + 1
+            self.conn.executemany("INSERT INTO steps_fts (rowid, content) VALUES (?, ?)",
+                                  ((first_id + i, row[5]) for i, row in enumerate(rows)))
+    
+    def _get_table_id(self, tabular_info):
+        """返回表格编号，内容相同的表格只写入一次"""
+        cached = self._table_object_ids.get(id(tabular_info))
+        if cached is not None and cached[0] is tabular_info:
+            return cached[1]
+        
+        text = json.dumps(HTMLReportGenerator._build_table_dict(tabular_info), ensure_ascii=False,
+                          separators=(',', ':'))
+        digest = hashlib.md5(text.encode('utf-8')).digest()
+        table_id = self._table_ids.get(digest)
+        if table_id is None:
+            table_id = len(self._table_ids)
+            self._table_ids[digest] = table_id
+            cells = [tabular_info.description or ''] + list(tabular_info.headings or [])
+            cells.extend(cell or '' for row in tabular_info.rows for cell in row)
+            cell_text = ' '.join(cells)
+            self.conn.execute("INSERT INTO tables (id, data, text) VALUES (?, ?, ?)", (table_id, text, cell_text))
+            if self.fts:
+                self.conn.execute("INSERT INTO tables_fts (rowid, text) VALUES (?, ?)", (table_id, cell_text))
+        
+        if len(self._table_object_ids) < TABLE_POOL_LIMIT:
+            self._table_object_ids[id(tabular_info)] = (tabular_info, table_id)
+        return table_id
+    
+    def finish(self):
+        """写入完成后建立索引并关闭"""
+        self.conn.executescript(self.INDEXES)
+        self.conn.commit()
+        self.conn.close()
+    
+    def close(self):
+        self.conn.close()
+    
+    def query_steps(self, item_index=None, results=None, search=None, offset=0, limit=HTML_STEPS_PER_PAGE):
+        """分页查询步骤
+        
+        Args:
+            item_index: 测试项序号，None表示全部测试用例
+            results: 只返回这些结果的步骤（如('fail', 'ng')），None表示不限
+            search: 搜索文本（步骤内容、ident、表格），不区分大小写
+        
+        Returns:
+            (匹配的步骤总数, 当前页的步骤字典列表): 步骤字典包含index、ordinal、timestamp、ident、
+            result、content和tabular_info（description/headings/rows，没有表格时为None）
+        """
+        conditions = []
+        params = []
+        if item_index is not None:
+            conditions.append("s.item_index = ?")
+            params.append(item_index)
+        if results:
+            conditions.append(f"lower(s.result) IN ({', '.join('?' * len(results))})")
+            params.extend(result.lower() for result in results)
+        if search:
+            condition, search_params = self._search_condition(search)
+            conditions.append(condition)
+            params.extend(search_params)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        total = self.conn.execute(f"SELECT COUNT(*) FROM steps s {where}", params).fetchone()[0]
+        rows = self.conn.execute(
+            f"SELECT s.item_index, s.ordinal, s.timestamp, s.ident, s.result, s.content, t.data "
+            f"FROM steps s LEFT JOIN tables t ON t.id = s.table_id {where} "
+            f"ORDER BY s.item_index, s.ordinal LIMIT ? OFFSET ?", params + [limit, offset]).fetchall()
+        
+        steps = []
+        for index, ordinal, timestamp, ident, result, content, table_data in rows:
+            tabular_info = None
+            if table_data:
+                table = json.loads(table_data)
+                tabular_info = {'description': table['d'], 'headings': table['h'], 'rows': table['r']}
+            steps.append({'index': index, 'ordinal': ordinal, 'timestamp': timestamp, 'ident': ident,
+                          'result': result, 'content': content, 'tabular_info': tabular_info})
+        return total, steps
+    
+    def search(self, text, offset=0, limit=HTML_STEPS_PER_PAGE):
+        """在全部测试用例的步骤中全文搜索，返回 (匹配总数, 步骤字典列表)"""
+        return self.query_steps(search=text, offset=offset, limit=limit)
+    
+    def _search_condition(self, text):
+        """搜索条件: ident按子串匹配；内容和表格优先使用全文索引
+        
+        trigram分词至少需要3个字符，更短的搜索词与没有全文索引时一样使用LIKE。
+        """
+        pattern = '%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        if self.fts and (self.fts != 'trigram' or len(text) >= 3):
+            phrase = '"' + text.replace('"', '""') + '"'
+            return ("(s.ident LIKE ? ESCAPE '\\' "
+                    "OR s.id IN (SELECT rowid FROM steps_fts WHERE steps_fts MATCH ?) "
+                    "OR s.table_id IN (SELECT rowid FROM tables_fts WHERE tables_fts MATCH ?))",
+                    [pattern, phrase, phrase])
+        return ("(s.ident LIKE ? ESCAPE '\\' OR s.content LIKE ? ESCAPE '\\' "
+                "OR s.table_id IN (SELECT id FROM tables WHERE text LIKE ? ESCAPE '\\'))",
+                [pattern, pattern, pattern])
+
+def open_step_database(output_file_path):
+    """打开HTML报告（steps_format='sqlite'生成）对应的步骤数据库"""
+    output_path = Path(output_file_path)
+    return StepDatabase.open(output_path.parent / f"{output_path.stem}_js" / STEPS_DB_NAME)
 
 class HTMLReportGenerator:
     """HTML报告生成器"""
-    STEPS_PER_PAGE = 200  # 定义每页的步骤数
+    STEPS_PER_PAGE = HTML_STEPS_PER_PAGE  # 定义每页的步骤数
 
-    def __init__(self, report_data):
+    def __init__(self, report_data, live=False, on_progress=None, steps_format='js'):
         self.report_data = report_data
+        self.live = live  # 跟踪模式: 页面定时加载live_N.js追加新的测试项
+        # 步骤输出格式: 'sqlite'时全部步骤写入JS文件夹中的steps.sqlite（跟踪模式的页面需要增量加载，只支持'js'）
+        self.steps_format = 'js' if live else steps_format
+        self._step_db = None
+        # 进度回调 on_progress(tracker)，统计已处理的测试项和已写出的文件
+        self.progress = _make_progress_tracker(on_progress)
+        # 共享表格: 步骤文件中的表格写为编号，内容写入tables_N.js；跟踪模式的页面增量加载，仍内联写出表格
+        self.share_tables = not live
+        self._table_ids = {}         # 表格JSON的MD5 -> 编号
+        self._table_object_ids = {}  # id(TabularInfo) -> (TabularInfo, 编号)，解析器共用的表格对象不必重复序列化
+        self._pending_tables = []    # 当前分片中尚未写出的表格JSON
+    
+    def prepare_js_folder(self, output_file_path):
+        """创建并返回存放JS数据文件的文件夹"""
+        output_path = Path(output_file_path)
+        js_folder = output_path.parent / f"{output_path.stem}_js"
+        js_folder.mkdir(exist_ok=True)
+        return js_folder
     
     def generate(self, output_file_path):
         """生成HTML报告"""
         output_path = Path(output_file_path)
         
         # 创建JS文件夹
-        js_folder_name = f"{output_path.stem}_js"
-        js_folder = output_path.parent / js_folder_name
-        js_folder.mkdir(exist_ok=True)
+        js_folder = self.prepare_js_folder(output_path)
+        js_folder_name = js_folder.name
         
         # 主数据文件放在JS文件夹内
         data_file_path = js_folder / f"{output_path.stem}_data.js"
+        
+        if self.progress is not None:
+            self.progress.start_phase('write', items_total=len(self.report_data.test_items))
+            self.progress.update(force=True)
+
+        # 先生成独立的步骤数据文件到JS文件夹（延迟加载的步骤写出后即释放，主数据文件只需要步骤数量）
+        self._write_steps_files(js_folder, output_path.stem)
+        self._flush_tables(js_folder)
+        self._finish_step_db()
 
         # 直接将JS数据写入文件，传入JS文件夹名称
         with open(data_file_path, 'w', encoding='utf-8') as f:
             self._write_js_data(f, js_folder_name)
 
-        # 生成独立的步骤数据文件到JS文件夹
-        self._write_steps_files(js_folder, output_path.stem)
-
         # 生成HTML内容，引用JS文件夹中的文件
-        html_content = self._generate_html(f"{js_folder_name}/{output_path.stem}_data.js")
+        html_content = self._generate_html(f"{js_folder_name}/{output_path.stem}_data.js", output_path.name)
         
         with open(output_file_path, 'w', encoding='utf-8') as f:
             f.write(html_content)
         
+        if self.progress is not None:
+            self.progress.files_written += 2  # 主数据文件和HTML
+            self.progress.finish()
+        
         print(f"HTML报告已生成: {output_file_path}")
         print(f"JS文件夹已创建: {js_folder}")
         print(f"主数据文件: {data_file_path}")
-        print(f"步骤文件已按需生成在JS文件夹中")
+        if self.steps_format == 'sqlite':
+            print(f"⚠️ 测试步骤保存在 {js_folder / STEPS_DB_NAME}，直接打开HTML无法查看步骤，"
+                  f"请通过报告服务打开: python test_report_generator.py serve {output_file_path}")
+        else:
+            print(f"步骤文件已按需生成在JS文件夹中")
 
     def _write_js_data(self, f, js_folder_name):
         """将JS数据直接写入文件流，以节省内存 - 按需加载优化版本"""
@@ -433,29 +2691,7 @@ class HTMLReportGenerator:
             if not is_first_item:
                 f.write(",\n")
             
-            item_dict = {}
-            if test_item.item_type == "skipped":
-                item_dict = {
-                    'index': i,
-                    'item_type': 'skipped',
-                    'title': test_item.title,
-                    'start_time': test_item.start_time
-                }
-            elif test_item.item_type == "testcase":
-                item_dict = {
-                    'index': i,
-                    'item_type': 'testcase',
-                    'title': test_item.title,
-                    'start_time': test_item.start_time,
-                    'end_time': test_item.end_time,
-                    'verdict': test_item.verdict,
-                    'description': test_item.description,
-                    'steps_count': len(test_item.test_steps),
-                    'has_steps': len(test_item.test_steps) > 0,
-                    'steps_file': f'{js_folder_name}/steps_{i}.js' if len(test_item.test_steps) > 0 else None
-                }
-
-            json.dump(item_dict, f, ensure_ascii=False, indent=2)
+            json.dump(self._build_item_dict(i, test_item, js_folder_name), f, ensure_ascii=False, indent=2)
             is_first_item = False
         
         f.write("\n];\n\n")
@@ -463,7 +2699,11 @@ class HTMLReportGenerator:
         # 2. 步骤缓存和加载管理
         f.write("window.stepsCache = new Map();\n")
         f.write("window.maxCacheSize = 3;\n")
-        f.write("window.loadingSteps = new Set();\n\n")  # 跟踪正在加载的测试用例
+        f.write("window.loadingSteps = new Set();\n")  # 跟踪正在加载的测试用例
+        f.write(f"window.tablesPerFile = {TABLES_PER_FILE};\n")  # 共享表格分片大小
+        if self.steps_format == 'sqlite':
+            f.write(f"window.stepsDatabase = {json.dumps(f'{js_folder_name}/{STEPS_DB_NAME}')};\n")
+        f.write("\n")
 
         # 3. 写入 systemInfo
         f.write("window.systemInfo = ")
@@ -474,48 +2714,171 @@ class HTMLReportGenerator:
         }
         json.dump(system_info, f, ensure_ascii=False, indent=2)
         f.write(";")
+        
+        # 4. 跟踪模式: 页面从第0个数据块开始轮询追加的测试项
+        if self.live:
+            f.write("\n\nwindow.liveData = ")
+            json.dump({'folder': js_folder_name, 'next': 0, 'finished': False}, f)
+            f.write(";")
+
+    def _build_item_dict(self, index, test_item, js_folder_name):
+        """window.testData中单个测试项的数据（不包含详细步骤）"""
+        if test_item.item_type == "skipped":
+            return {
+                'index': index,
+                'item_type': 'skipped',
+                'title': test_item.title,
+                'start_time': test_item.start_time
+            }
+        return {
+            'index': index,
+            'item_type': 'testcase',
+            'title': test_item.title,
+            'start_time': test_item.start_time,
+            'end_time': test_item.end_time,
+            'verdict': test_item.verdict,
+            'description': test_item.description,
+            'steps_count': test_item.steps_count,
+            'has_steps': test_item.steps_count > 0,
+            'steps_file': (f'{js_folder_name}/steps_{index}.js'
+                           if test_item.steps_count > 0 and self.steps_format == 'js' else None)
+        }
+
+    def write_live_chunk(self, js_folder, chunk_index, start_index, finished):
+        """跟踪模式下写出live_N.js数据块: 包含start_index之后新增的测试项和最新的系统信息"""
+        test_items = self.report_data.test_items
+        chunk_file_path = js_folder / f"live_{chunk_index}.js"
+        
+        with open(chunk_file_path, 'w', encoding='utf-8') as f:
+            f.write("window.appendLiveItems([\n")
+            for i in range(start_index, len(test_items)):
+                if i > start_index:
+                    f.write(",\n")
+                json.dump(self._build_item_dict(i, test_items[i], js_folder.name), f, ensure_ascii=False)
+            f.write("\n], ")
+            json.dump({
+                'engineer': self.report_data.engineer_info,
+                'testsetup': self.report_data.testsetup_info,
+                'hardware': self.report_data.hardware_info
+            }, f, ensure_ascii=False)
+            f.write(f", {'true' if finished else 'false'});\n")
+        
+        return chunk_file_path
 
     def _write_steps_files(self, js_folder, output_stem):
         """为每个有步骤的测试用例生成独立的步骤数据文件"""
+        progress = self.progress
         for i, test_item in enumerate(self.report_data.test_items):
             if test_item.item_type == "testcase" and len(test_item.test_steps) > 0:
-                steps_file_path = js_folder / f"steps_{i}.js"
+                self.write_steps_file(js_folder, i, test_item)
+                if isinstance(test_item.test_steps, LazyStepList):
+                    test_item.test_steps.release()
+            if progress is not None:
+                progress.items += 1
+                progress.update()
+
+    def write_steps_file(self, js_folder, index, test_case):
+        """生成单个测试用例的步骤数据文件（流水线模式下在解析过程中直接调用）
+        
+        steps_format为'sqlite'时改为写入JS文件夹中的步骤数据库。
+        """
+        if self.steps_format == 'sqlite':
+            if self._step_db is None:
+                self._step_db = StepDatabase.create(js_folder / STEPS_DB_NAME)
+            self._step_db.add_steps(index, test_case.test_steps)
+            return
+        
+        steps_file_path = js_folder / f"steps_{index}.js"
+        
+        with open(steps_file_path, 'w', encoding='utf-8') as f:
+            f.write(f"window.stepsData_{index} = [\n")
+            
+            is_first_step = True
+            for step in test_case.test_steps:
+                if not is_first_step:
+                    f.write(",\n")
                 
-                with open(steps_file_path, 'w', encoding='utf-8') as f:
-                    f.write(f"window.stepsData_{i} = [\n")
-                    
-                    is_first_step = True
-                    for step in test_item.test_steps:
-                        if not is_first_step:
-                            f.write(",\n")
-                        
-                        # 压缩步骤数据结构
-                        step_dict = {
-                            't': step.timestamp,  # timestamp简写
-                            'i': step.ident,      # ident简写
-                            'r': step.result,     # result简写
-                            'c': step.content     # content简写
-                        }
-                        
-                        # 只在有表格信息时才添加
-                        if step.tabular_info and (step.tabular_info.headings or step.tabular_info.rows):
-                            step_dict['tab'] = {
-                                'd': step.tabular_info.description or '',
-                                'h': step.tabular_info.headings,
-                                'r': step.tabular_info.rows
-                            }
-                        
-                        json.dump(step_dict, f, ensure_ascii=False, separators=(',', ':'))
-                        is_first_step = False
-                    
-                    f.write("\n];\n")
-                    f.write(f"\nif (window.onStepsLoaded_{i}) {{")
-                    f.write(f"\n    window.onStepsLoaded_{i}(window.stepsData_{i});")
-                    f.write(f"\n}}")
+                # 压缩步骤数据结构
+                step_dict = {
+                    't': step.timestamp,  # timestamp简写
+                    'i': step.ident,      # ident简写
+                    'r': step.result,     # result简写
+                    'c': step.content     # content简写
+                }
                 
-                print(f"步骤文件已生成: {steps_file_path}")
-
-    def _generate_html(self, data_file_name):
+                # 只在有表格信息时才添加（共享表格写为tables_N.js中的编号）
+                if step.tabular_info and (step.tabular_info.headings or step.tabular_info.rows):
+                    if self.share_tables:
+                        step_dict['tab'] = self._get_table_id(js_folder, step.tabular_info)
+                    else:
+                        step_dict['tab'] = self._build_table_dict(step.tabular_info)
+                
+                json.dump(step_dict, f, ensure_ascii=False, separators=(',', ':'))
+                is_first_step = False
+            
+            f.write("\n];\n")
+            f.write(f"\nif (window.onStepsLoaded_{index}) {{")
+            f.write(f"\n    window.onStepsLoaded_{index}(window.stepsData_{index});")
+            f.write(f"\n}}")
+        
+        if self.progress is not None:
+            self.progress.files_written += 1
+        print(f"步骤文件已生成: {steps_file_path}")
+
+    def _finish_step_db(self):
+        """步骤全部写入后为步骤数据库建立索引"""
+        if self._step_db is None:
+            return
+        db_path = self._step_db.conn.execute("PRAGMA database_list").fetchone()[2]
+        self._step_db.finish()
+        self._step_db = None
+        if self.progress is not None:
+            self.progress.files_written += 1
+        print(f"步骤数据库已生成: {db_path}")
+    
+    @staticmethod
+    def _build_table_dict(tabular_info):
+        return {
+            'd': tabular_info.description or '',
+            'h': tabular_info.headings,
+            'r': tabular_info.rows
+        }
+    
+    def _get_table_id(self, js_folder, tabular_info):
+        """返回表格在共享表格中的编号，新的表格加入当前分片，分片写满后写出"""
+        cached = self._table_object_ids.get(id(tabular_info))
+        if cached is not None and cached[0] is tabular_info:
+            return cached[1]
+        
+        text = json.dumps(self._build_table_dict(tabular_info), ensure_ascii=False, separators=(',', ':'))
+        digest = hashlib.md5(text.encode('utf-8')).digest()
+        table_id = self._table_ids.get(digest)
+        if table_id is None:
+            table_id = len(self._table_ids)
+            self._table_ids[digest] = table_id
+            self._pending_tables.append(text)
+            if len(self._pending_tables) == TABLES_PER_FILE:
+                self._flush_tables(js_folder)
+        
+        if len(self._table_object_ids) < TABLE_POOL_LIMIT:
+            self._table_object_ids[id(tabular_info)] = (tabular_info, table_id)
+        return table_id
+    
+    def _flush_tables(self, js_folder):
+        """写出当前分片的共享表格文件tables_N.js"""
+        if not self._pending_tables:
+            return
+        shard = (len(self._table_ids) - 1) // TABLES_PER_FILE
+        tables_file_path = js_folder / f"tables_{shard}.js"
+        with open(tables_file_path, 'w', encoding='utf-8') as f:
+            f.write(f"window.tablesData_{shard} = [\n")
+            f.write(",\n".join(self._pending_tables))
+            f.write("\n];\n")
+        self._pending_tables = []
+        if self.progress is not None:
+            self.progress.files_written += 1
+    
+    def _generate_html(self, data_file_name, report_name=''):
         """生成HTML内容"""
         return f"""
 <!DOCTYPE html>
@@ -530,6 +2893,7 @@ class HTMLReportGenerator:
 </head>
 <body>
     <div class="container">
+        {self._generate_steps_db_notice(report_name)}
         <div class="main-content">
             <div class="left-panel" id="leftPanel">
                 {self._generate_test_list()}
@@ -543,7 +2907,7 @@ class HTMLReportGenerator:
     
     <script src="{data_file_name}"></script>
     <script>
-        {self._get_javascript()}
+        {self._get_javascript()}{self._get_live_javascript() if self.live else ''}
     </script>
 </body>
 </html>
@@ -753,6 +3117,45 @@ class HTMLReportGenerator:
             border-radius: 6px;
         }
         
+        .steps-db-notice {
+            padding: 0.6rem 1rem;
+            background: #fff3cd;
+            border-bottom: 1px solid #ffe69c;
+            color: #664d03;
+            font-size: 0.9rem;
+        }
+        
+        .steps-db-notice code {
+            background: rgba(0,0,0,0.06);
+            padding: 0.1rem 0.3rem;
+            border-radius: 3px;
+        }
+        
+        .test-source-header {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            margin: 1rem 0 0.5rem;
+            padding: 0.5rem 0.8rem;
+            border-left: 4px solid #667eea;
+            border-radius: 4px;
+            background: #f8f9fa;
+            color: #495057;
+            font-size: 0.9rem;
+            font-weight: 600;
+        }
+        
+        .test-source-header:first-child {
+            margin-top: 0;
+        }
+        
+        .test-source-meta {
+            color: #6c757d;
+            font-size: 0.8rem;
+            font-weight: 500;
+            white-space: nowrap;
+        }
+        
         .test-item {
             margin-bottom: 0.75rem;
             cursor: pointer;
@@ -2241,7 +4644,15 @@ class HTMLReportGenerator:
         
         test_items_html = ""
         
+        # 合并报告: 在每个来源报告的第一个测试项前插入分组标题
+        sources_by_index = {}
+        for source in self.report_data.sources:
+            sources_by_index.setdefault(source.first_index, []).append(source)
+        
         for i, test_item in enumerate(self.report_data.test_items):
+            for source in sources_by_index.pop(i, ()):
+                test_items_html += self._generate_source_header(source)
+            
             if test_item.item_type == "skipped":
                 test_items_html += f"""
                 <div class="test-item" data-type="skipped" data-result="skipped" onclick="showTestCaseDetails(this, {i})">
@@ -2269,6 +4680,11 @@ class HTMLReportGenerator:
                 </div>
                 """
         
+        # 没有测试项的来源报告（位于列表末尾）
+        for sources in sources_by_index.values():
+            for source in sources:
+                test_items_html += self._generate_source_header(source)
+        
         return f"""
         {filter_html}
         <div class="test-items-container">
@@ -2276,6 +4692,25 @@ class HTMLReportGenerator:
         </div>
         """
     
+    def _generate_steps_db_notice(self, report_name):
+        """步骤保存在SQLite数据库中时的提示（通过报告服务打开时由页面脚本移除）"""
+        if self.steps_format != 'sqlite':
+            return ''
+        return f"""
+        <div class="steps-db-notice" id="stepsDbNotice">
+            ⚠️ 测试步骤保存在 {STEPS_DB_NAME} 中，直接打开本文件无法查看步骤。请通过报告服务打开:
+            <code>python test_report_generator.py serve {html.escape(report_name)}</code>，或使用GUI中的"通过服务打开"。
+        </div>"""
+    
+    def _generate_source_header(self, source):
+        """生成合并报告中来源报告的分组标题"""
+        return f"""
+                <div class="test-source-header" title="{source.title}">
+                    <span class="test-source-name">📄 {source.name}</span>
+                    <span class="test-source-meta">{source.item_count} 项 · {source.failed_count} NG</span>
+                </div>
+                """
+    
     def _generate_system_info(self):
         """生成系统信息（默认右侧面板内容）"""
         # 计算测试统计信息
@@ -2349,6 +4784,23 @@ class HTMLReportGenerator:
                 </div>
             """
         
+        sources_html = ""
+        if self.report_data.sources:
+            for source in self.report_data.sources:
+                sources_html += f"""
+                <div class="info-item">
+                    <div class="info-label">{source.name}</div>
+                    <div class="info-value" title="{source.title}">{source.title or '测试报告'} | {source.start_time} - {source.end_time} | {source.item_count} 项, {source.failed_count} NG</div>
+                </div>
+            """
+            sources_html = f"""
+        <div class="detail-section">
+            <h3>来源报告</h3>
+            <div class="info-grid">
+                {sources_html}
+            </div>
+        </div>"""
+        
         return f"""
         <div class="detail-section">
             <h2>测试报告概览</h2>
@@ -2383,7 +4835,7 @@ class HTMLReportGenerator:
                 </div>
             </div>
         </div>
-        
+        {sources_html}
         <div class="detail-section">
             <h3>工程师信息</h3>
             <div class="info-grid">
@@ -2415,6 +4867,11 @@ class HTMLReportGenerator:
         const MAX_PANEL_WIDTH_PERCENT = 70; // 最大宽度占比 70%
         
         document.addEventListener('DOMContentLoaded', function() {
+            // 通过报告服务打开时可以读取步骤数据库，不需要提示
+            const stepsDbNotice = document.getElementById('stepsDbNotice');
+            if (stepsDbNotice && window.stepsApi) {
+                stepsDbNotice.remove();
+            }
             initializePanelResizer();
             filterTests('all');
         });
@@ -2648,8 +5105,9 @@ class HTMLReportGenerator:
                 stepsSection.appendChild(loadingDiv);
                 rightPanel.appendChild(stepsSection);
 
-                // 延迟加载步骤数据
-                loadTestStepsAsync(item.index).then(steps => {
+                // 延迟加载步骤数据（通过报告服务打开时由服务端分页、筛选和搜索，不加载整个测试用例）
+                const stepsPromise = window.stepsApi ? Promise.resolve(null) : loadTestStepsAsync(item.index);
+                stepsPromise.then(steps => {
                     // 移除加载指示器
                     loadingDiv.remove();
                     
@@ -2690,16 +5148,50 @@ class HTMLReportGenerator:
                     stepsSection.appendChild(stepsTable);
 
                     // 初始化筛选和分页逻辑
-                    initializeStepsControls(steps, tbody, paginationContainer);
+                    if (window.stepsApi) {
+                        initializeServerStepsControls(item.index, tbody, paginationContainer);
+                    } else {
+                        initializeStepsControls(steps, tbody, paginationContainer);
+                    }
                     resolve();
                 }).catch(error => {
-                    loadingDiv.innerHTML = '<p style="color: red;">加载测试步骤失败</p>';
+                    loadingDiv.innerHTML = `<p style="color: red;">加载测试步骤失败: ${escapeHTML(error.message)}</p>`;
                     console.error('Failed to load test steps:', error);
                     reject(error);
                 });
             });
         }
 
+        // 加载步骤中引用的共享表格分片（tables_N.js），已加载的分片不再重复加载
+        function loadTableShards(stepsFile, steps) {
+            const folder = stepsFile.substring(0, stepsFile.lastIndexOf('/') + 1);
+            const shards = new Set();
+            steps.forEach(step => {
+                if (typeof step.tab === 'number') {
+                    shards.add(Math.floor(step.tab / window.tablesPerFile));
+                }
+            });
+            
+            const pending = [...shards].filter(shard => !window[`tablesData_${shard}`]).map(shard =>
+                new Promise((resolve, reject) => {
+                    const script = document.createElement('script');
+                    script.src = `${folder}tables_${shard}.js`;
+                    script.onload = () => resolve();
+                    script.onerror = () => reject(new Error('Failed to load tables file: ' + script.src));
+                    document.head.appendChild(script);
+                })
+            );
+            return Promise.all(pending);
+        }
+        
+        // 步骤中的表格: 共享表格为编号，内联表格为对象
+        function resolveStepTable(tab) {
+            if (typeof tab === 'number') {
+                return window[`tablesData_${Math.floor(tab / window.tablesPerFile)}`][tab % window.tablesPerFile];
+            }
+            return tab;
+        }
+
         // 异步加载测试步骤数据
         function loadTestStepsAsync(testIndex) {
             return new Promise((resolve, reject) => {
@@ -2731,6 +5223,12 @@ class HTMLReportGenerator:
                 updateProgress(10, '开始下载步骤数据...');
 
                 const testItem = window.testData[testIndex];
+                if (window.stepsDatabase && testItem && testItem.has_steps) {
+                    window.loadingSteps.delete(testIndex);
+                    updateProgress(0, '步骤保存在SQLite数据库中');
+                    reject(new Error(`步骤保存在 ${window.stepsDatabase} 中，无法直接读取，请通过报告服务（serve命令）打开报告`));
+                    return;
+                }
                 if (!testItem || !testItem.steps_file) {
                     window.loadingSteps.delete(testIndex);
                     updateProgress(100, '没有步骤数据');
@@ -2759,20 +5257,23 @@ class HTMLReportGenerator:
                     clearTimeout(timeoutId);
                     updateProgress(80, '处理步骤数据...');
                     
-                    setTimeout(() => {
+                    loadTableShards(testItem.steps_file, steps).then(() => setTimeout(() => {
                         try {
                             // 转换压缩格式回正常格式
-                            const normalizedSteps = steps.map(step => ({
-                                timestamp: step.t,
-                                ident: step.i,
-                                result: step.r,
-                                content: step.c,
-                                tabular_info: step.tab ? {
-                                    description: step.tab.d,
-                                    headings: step.tab.h,
-                                    rows: step.tab.r
-                                } : null
-                            }));
+                            const normalizedSteps = steps.map(step => {
+                                const tab = step.tab !== undefined ? resolveStepTable(step.tab) : null;
+                                return {
+                                    timestamp: step.t,
+                                    ident: step.i,
+                                    result: step.r,
+                                    content: step.c,
+                                    tabular_info: tab ? {
+                                        description: tab.d,
+                                        headings: tab.h,
+                                        rows: tab.r
+                                    } : null
+                                };
+                            });
 
                             // 管理缓存大小
                             if (window.stepsCache.size >= window.maxCacheSize) {
@@ -2795,7 +5296,12 @@ class HTMLReportGenerator:
                             window.loadingSteps.delete(testIndex);
                             reject(error);
                         }
-                    }, 200); // 给用户一点时间看到进度条到100%
+                    }, 200)).catch(error => { // 给用户一点时间看到进度条到100%
+                        window.loadingSteps.delete(testIndex);
+                        delete window[`onStepsLoaded_${testIndex}`];
+                        updateProgress(0, '表格文件加载失败');
+                        reject(error);
+                    });
                 };
                 
                 script.onload = function() {
@@ -2976,7 +5482,111 @@ class HTMLReportGenerator:
 
                 jumpContainer.appendChild(jumpLabel);
                 jumpContainer.appendChild(jumpInput);
-                jumpContainer.appendChild(jumpPageLabel);
+                jumpContainer.appendChild(jumpPageLabel);
+                jumpContainer.appendChild(jumpButton);
+
+                paginationContainer.appendChild(prevButton);
+                paginationContainer.appendChild(pageInfo);
+                paginationContainer.appendChild(nextButton);
+                paginationContainer.appendChild(jumpContainer);
+            }
+
+            // 添加事件监听器
+            document.getElementById('stepSearchInput').addEventListener('keyup', updateAndRender);
+            document.querySelectorAll('.step-filter-btn').forEach(btn => {
+                btn.addEventListener('click', (e) => {
+                    document.querySelector('.step-filter-btn.active').classList.remove('active');
+                    e.target.classList.add('active');
+                    updateAndRender();
+                });
+            });
+
+            // 初始加载
+            updateAndRender();
+        }
+
+        // 通过报告服务打开时的步骤控制: 每次只向服务端请求当前页
+        function initializeServerStepsControls(testIndex, tbody, paginationContainer) {
+            let currentPage = 0;
+            let totalPages = 0;
+            let requestId = 0;
+            let searchTimer = null;
+
+            function loadPage(page) {
+                const searchTerm = document.getElementById('stepSearchInput').value;
+                const activeFilter = document.querySelector('.step-filter-btn.active').dataset.filter;
+                const params = new URLSearchParams({index: testIndex, filter: activeFilter, search: searchTerm, page: page});
+                const currentRequest = ++requestId;
+
+                fetch(`${window.stepsApi}?${params}`).then(response => {
+                    if (!response.ok) {
+                        throw new Error(`HTTP ${response.status}`);
+                    }
+                    return response.json();
+                }).then(data => {
+                    if (currentRequest !== requestId) {
+                        return; // 已有更新的请求
+                    }
+                    currentPage = data.page;
+                    totalPages = data.pages;
+                    renderSteps(data.steps, tbody);
+                    updatePaginationControls(data.total);
+                }).catch(error => {
+                    console.error('Failed to load steps page:', error);
+                    tbody.innerHTML = '<tr><td colspan="4" style="color: red;">加载测试步骤失败</td></tr>';
+                });
+            }
+
+            function updatePaginationControls(total) {
+                if (totalPages <= 1) {
+                    paginationContainer.style.display = 'none';
+                    return;
+                }
+                paginationContainer.style.display = 'flex';
+                paginationContainer.innerHTML = '';
+
+                const prevButton = document.createElement('button');
+                prevButton.textContent = '上一页';
+                prevButton.disabled = currentPage === 0;
+                prevButton.onclick = () => loadPage(currentPage - 1);
+
+                const nextButton = document.createElement('button');
+                nextButton.textContent = '下一页';
+                nextButton.disabled = currentPage >= totalPages - 1;
+                nextButton.onclick = () => loadPage(currentPage + 1);
+
+                const pageInfo = document.createElement('span');
+                pageInfo.textContent = `第 ${currentPage + 1} / ${totalPages} 页 (共 ${total} 条)`;
+                pageInfo.style.margin = '0 1rem';
+
+                const jumpContainer = document.createElement('div');
+                jumpContainer.className = 'page-jump-container';
+                jumpContainer.style.marginLeft = '1rem';
+                const jumpInput = document.createElement('input');
+                jumpInput.type = 'number';
+                jumpInput.min = '1';
+                jumpInput.max = totalPages.toString();
+                jumpInput.value = (currentPage + 1).toString();
+                jumpInput.className = 'page-jump-input';
+                const jumpButton = document.createElement('button');
+                jumpButton.textContent = '跳转';
+                jumpButton.className = 'page-jump-btn';
+                const jumpToPage = () => {
+                    const page = parseInt(jumpInput.value, 10);
+                    if (page >= 1 && page <= totalPages) {
+                        loadPage(page - 1);
+                    } else {
+                        alert(`请输入有效的页码 (1-${totalPages})`);
+                        jumpInput.value = (currentPage + 1).toString();
+                    }
+                };
+                jumpButton.onclick = jumpToPage;
+                jumpInput.addEventListener('keypress', (e) => {
+                    if (e.key === 'Enter') {
+                        jumpToPage();
+                    }
+                });
+                jumpContainer.appendChild(jumpInput);
                 jumpContainer.appendChild(jumpButton);
 
                 paginationContainer.appendChild(prevButton);
@@ -2985,18 +5595,20 @@ class HTMLReportGenerator:
                 paginationContainer.appendChild(jumpContainer);
             }
 
-            // 添加事件监听器
-            document.getElementById('stepSearchInput').addEventListener('keyup', updateAndRender);
+            // 搜索输入停止300毫秒后再请求，筛选按钮立即请求
+            document.getElementById('stepSearchInput').addEventListener('keyup', () => {
+                clearTimeout(searchTimer);
+                searchTimer = setTimeout(() => loadPage(0), 300);
+            });
             document.querySelectorAll('.step-filter-btn').forEach(btn => {
                 btn.addEventListener('click', (e) => {
                     document.querySelector('.step-filter-btn.active').classList.remove('active');
                     e.target.classList.add('active');
-                    updateAndRender();
+                    loadPage(0);
                 });
             });
 
-            // 初始加载
-            updateAndRender();
+            loadPage(0);
         }
 
         function renderSteps(steps, tbody) {
@@ -3582,35 +6194,1195 @@ class HTMLReportGenerator:
             originalInitializeStepsControls(allSteps, tbody, paginationContainer);
         };
         """
+    
+    def _get_live_javascript(self):
+        """跟踪模式的JavaScript: 依次加载live_N.js，把新完成的测试项追加到列表并更新统计"""
+        return """
+        const LIVE_POLL_INTERVAL = 3000; // 没有新数据块时的重试间隔（毫秒）
+        
+        document.addEventListener('DOMContentLoaded', function() {
+            if (window.liveData && !window.liveData.finished) {
+                document.title = '[进行中] ' + document.title;
+                loadNextLiveChunk();
+            }
+        });
+        
+        function loadNextLiveChunk() {
+            // 本地文件无法使用fetch，通过script标签加载数据块，加载失败说明还没有新数据
+            const script = document.createElement('script');
+            script.src = `${window.liveData.folder}/live_${window.liveData.next}.js?t=${Date.now()}`;
+            script.onload = function() {
+                script.remove();
+                window.liveData.next++;
+                if (!window.liveData.finished) {
+                    loadNextLiveChunk();
+                }
+            };
+            script.onerror = function() {
+                script.remove();
+                setTimeout(loadNextLiveChunk, LIVE_POLL_INTERVAL);
+            };
+            document.body.appendChild(script);
+        }
+        
+        window.appendLiveItems = function(items, systemInfo, finished) {
+            const container = document.querySelector('.test-items-container');
+            items.forEach(item => {
+                window.testData[item.index] = item;
+                container.appendChild(createTestItemElement(item));
+            });
+            window.systemInfo = systemInfo;
+            window.liveData.finished = finished;
+            if (finished) {
+                document.title = document.title.replace('[进行中] ', '');
+            }
+            
+            updateLiveStats();
+            const activeFilter = document.querySelector('.filter-btn.active');
+            filterTests(activeFilter ? activeFilter.getAttribute('data-filter') : 'all');
+        };
+        
+        function createTestItemElement(item) {
+            // 与Python端生成的测试项列表结构一致
+            const element = document.createElement('div');
+            element.className = 'test-item';
+            let badgeClass = 'result-nt';
+            let badgeText = 'NT';
+            let title = item.title;
+            if (item.item_type === 'skipped') {
+                element.setAttribute('data-type', 'skipped');
+                element.setAttribute('data-result', 'skipped');
+            } else {
+                element.setAttribute('data-type', 'testcase');
+                element.setAttribute('data-result', item.verdict || '');
+                badgeClass = item.verdict ? `result-${item.verdict}` : 'result-na';
+                badgeText = (item.verdict || 'N/A').toUpperCase();
+                title = item.title || `测试用例 ${item.index + 1}`;
+            }
+            element.innerHTML = `
+                <div class="test-case-header">
+                    <div class="test-case-title">
+                        <span class="result-badge ${badgeClass}">${badgeText}</span>
+                        ${escapeHTML(title)}
+                    </div>
+                </div>
+            `;
+            element.onclick = function() {
+                showTestCaseDetails(this, item.index);
+            };
+            return element;
+        }
+        
+        function updateLiveStats() {
+            // 概览面板中的统计卡片（显示其他内容时不存在，无需更新）
+            const statCards = document.querySelectorAll('.stat-grid .stat-card .stat-value');
+            if (statCards.length < 5) {
+                return;
+            }
+            const testCases = window.testData.filter(item => item.item_type === 'testcase');
+            const passed = testCases.filter(item => item.verdict === 'pass').length;
+            const failed = testCases.filter(item => item.verdict === 'fail').length;
+            const skipped = window.testData.length - testCases.length;
+            const passRate = testCases.length > 0 ? passed / testCases.length * 100 : 0;
+            statCards[0].textContent = testCases.length;
+            statCards[1].textContent = passed;
+            statCards[2].textContent = failed;
+            statCards[3].textContent = skipped;
+            statCards[4].textContent = `${passRate.toFixed(1)}%`;
+        }
+        """
 
-def parse_test_report(xml_file_path):
-    """解析测试报告"""
-    parser = TestReportParser(xml_file_path)
+def parse_test_report(xml_file_path, streaming=False, backend='auto', columnar_steps=False, jobs=1, write_index=False,
+                      cache=None, quick=False, lazy_steps=False, on_progress=None, parse_filter=None):
+    """解析测试报告
+    
+    Args:
+        xml_file_path: XML报告路径
+        streaming: 是否使用流式解析（适用于GB级别的大报告）
+        backend: 解析后端，'auto'（默认，优先lxml）、'lxml'、'etree'、'expat'（不构建元素树）
+                 或 'fast'（CANoe格式快速扫描，可先用verify_fast_scanner校验）
+        columnar_steps: 是否以ColumnarStepStore按列存储测试步骤（内存占用更低）
+        jobs: 并行解析的进程数（None表示全部CPU核心），大于1时按测试项切分文件并行解析
+        write_index: 是否同时生成测试项索引文件（Report.xml.idx，供parse_test_item使用）
+        cache: ReportCache实例，命中时直接返回缓存的解析结果（测试步骤为ColumnarStepStore），不再解析XML
+        quick: 快速摘要模式，只解析元信息和测试用例的标题、结果、时间（不包含测试步骤，不使用缓存）
+        lazy_steps: 测试步骤在首次访问时才从报告中解析（LazyStepList，期间报告文件不能被修改；不使用缓存）
+        on_progress: 进度回调 on_progress(tracker)，tracker为ProgressTracker（已读取字节数、测试项数、步骤数等）
+        parse_filter: 筛选条件（ParseFilter），如只保留失败测试用例的步骤、按标题或测试组路径筛选（不使用缓存）
+    """
+    parser = TestReportParser(xml_file_path, streaming=streaming, backend=backend, columnar_steps=columnar_steps,
+                              jobs=jobs, write_index=write_index, quick=quick, lazy_steps=lazy_steps,
+                              on_progress=on_progress, parse_filter=parse_filter)
+    if quick or parser.lazy_steps or parse_filter is not None:
+        return parser.parse()
+    if cache is not None:
+        return _parse_with_cache(parser, cache)
     return parser.parse()
 
-def generate_html_report(report_data, output_file_path):
-    """生成HTML报告"""
-    generator = HTMLReportGenerator(report_data)
+def generate_html_report(report_data, output_file_path, on_progress=None, steps_format='js'):
+    """生成HTML报告（steps_format为'sqlite'时步骤写入一个SQLite文件，见StepDatabase）"""
+    generator = HTMLReportGenerator(report_data, on_progress=on_progress, steps_format=steps_format)
+    generator.generate(output_file_path)
+
+def convert_test_report(xml_file_path, output_file_path, backend='auto', jobs=1, write_index=False, cache=None,
+                        quick=False, on_progress=None, parse_filter=None, history=None, steps_format='js'):
+    """单次遍历完成解析和生成
+    
+    流式解析过程中每个testcase闭合后立即写出对应的steps_N.js并释放步骤数据，
+    内存中只保留生成主数据文件所需的测试项摘要。
+    使用缓存（cache为ReportCache实例）时，步骤数据需要完整写入缓存，解析完成后才统一释放；
+    缓存命中时直接由缓存数据写出步骤文件。
+    快速摘要模式（quick）只生成概览和测试列表，不生成步骤文件，也不使用缓存。
+    on_progress在解析阶段（phase为'parse'）和生成阶段（'write'）共用同一个ProgressTracker。
+    parse_filter为筛选条件（ParseFilter），报告中只包含保留的测试项，同样不使用缓存。
+    history为HistoryStore实例时把本次运行记录到历史数据库（失败步骤的ident在步骤释放前收集；
+    使用筛选条件时结果不完整，不记录）。
+    steps_format为'sqlite'时全部步骤写入JS文件夹中的steps.sqlite（带全文索引），不生成steps_N.js。
+    
+    Returns:
+        TestReportData: 解析结果（测试用例的步骤已释放，只保留steps_count），失败时返回None
+    """
+    progress = _make_progress_tracker(on_progress)
+    generator = HTMLReportGenerator(None, on_progress=progress, steps_format=steps_format)
+    js_folder = generator.prepare_js_folder(output_file_path)
+    if parse_filter is not None:
+        history = None
+    failed_step_idents = {}
+    
+    def write_item_steps(index, test_item):
+        if test_item.item_type == "testcase" and test_item.test_steps:
+            if history is not None:
+                failed_step_idents[index] = collect_failed_step_idents(test_item.test_steps)
+            generator.write_steps_file(js_folder, index, test_item)
+            if cache is None:
+                test_item.release_steps()
+    
+    if quick or parse_filter is not None:
+        cache = None
+    parser = TestReportParser(xml_file_path, streaming=True, on_test_item=write_item_steps, backend=backend, jobs=jobs,
+                              write_index=write_index, quick=quick, on_progress=progress, parse_filter=parse_filter)
+    if cache is not None:
+        report_data = _parse_with_cache(parser, cache)
+    else:
+        report_data = parser.parse()
+    if not report_data:
+        return None
+    
+    if history is not None:
+        history.record_run(xml_file_path, report_data, failed_step_idents)
+    
+    if cache is not None:
+        for test_item in report_data.test_items:
+            if test_item.item_type == "testcase":
+                test_item.release_steps()
+    
+    # 步骤文件已全部写出，这里只生成主数据文件和HTML
+    generator.report_data = report_data
+    generator.generate(output_file_path)
+    return report_data
+
+def merge_test_reports(xml_file_paths, output_file_path, backend='auto', quick=False, on_progress=None,
+                       parse_filter=None):
+    """把多个报告合并为一个HTML报告
+    
+    依次流式解析每个报告，testcase闭合后立即按合并后的序号写出steps_N.js并释放步骤数据，
+    内存占用取决于最大的测试用例，而不是所有报告的总大小。
+    测试列表按来源报告分组，统计数据按全部测试项计算，
+    engineer/testsetup/hardware信息去重合并（同名但内容不同的硬件信息分别保留）。
+    
+    Returns:
+        TestReportData: 合并结果（sources为各来源报告），任何一个报告解析失败时返回None
+    """
+    progress = _make_progress_tracker(on_progress)
+    generator = HTMLReportGenerator(None, on_progress=progress)
+    js_folder = generator.prepare_js_folder(output_file_path)
+    merged_data = TestReportData()
+    
+    for xml_file_path in xml_file_paths:
+        offset = len(merged_data.test_items)
+        
+        def write_item_steps(index, test_item):
+            if test_item.item_type == "testcase" and test_item.test_steps:
+                generator.write_steps_file(js_folder, offset + index, test_item)
+                test_item.release_steps()
+        
+        parser = TestReportParser(xml_file_path, streaming=True, on_test_item=write_item_steps, backend=backend,
+                                  quick=quick, on_progress=progress, parse_filter=parse_filter)
+        report_data = parser.parse()
+        if not report_data:
+            print(f"❌ 合并失败: 无法解析 {xml_file_path}")
+            return None
+        _merge_report_data(merged_data, report_data, get_report_stem(xml_file_path))
+    
+    sources = merged_data.sources
+    merged_data.title = f"合并报告（{len(sources)} 个）"
+    merged_data.start_time = next((source.start_time for source in sources if source.start_time), "")
+    merged_data.end_time = next((source.end_time for source in reversed(sources) if source.end_time), "")
+    merged_data.timestamp = merged_data.start_time
+    merged_data.verdicts = " / ".join(dict.fromkeys(source.verdicts for source in sources if source.verdicts))
+    
+    # 步骤文件已全部写出，这里只生成主数据文件和HTML
+    generator.report_data = merged_data
+    generator.generate(output_file_path)
+    return merged_data
+
+def _merge_report_data(merged_data, report_data, name):
+    """把一个报告的测试项和元信息追加到合并结果中"""
+    source = ReportSource()
+    source.name = name
+    source.title = report_data.title
+    source.start_time = report_data.start_time
+    source.end_time = report_data.end_time
+    source.verdicts = report_data.verdicts
+    source.first_index = len(merged_data.test_items)
+    source.item_count = len(report_data.test_items)
+    source.failed_count = sum(1 for item in report_data.test_items
+                              if item.item_type == "testcase" and item.verdict == "fail")
+    merged_data.sources.append(source)
+    merged_data.test_items.extend(report_data.test_items)
+    merged_data.test_groups.extend(report_data.test_groups)
+    
+    _merge_info(merged_data.engineer_info, report_data.engineer_info)
+    _merge_info(merged_data.testsetup_info, report_data.testsetup_info)
+    for key, hardware in report_data.hardware_info.items():
+        existing = merged_data.hardware_info.get(key)
+        if existing is None:
+            merged_data.hardware_info[key] = hardware
+        elif existing != hardware:
+            merged_data.hardware_info[f"{key} ({name})"] = dict(hardware, name=f"{hardware['name']} ({name})")
+
+def _merge_info(merged_info, info):
+    """合并engineer/testsetup信息: 同名项的不同取值用 / 连接"""
+    for key, value in info.items():
+        existing = merged_info.get(key)
+        if not existing:
+            merged_info[key] = value
+        elif value and value not in existing.split(' / '):
+            merged_info[key] = f"{existing} / {value}"
+
+class TestItemSummary:
+    """报告对比使用的测试项摘要（不包含测试步骤）"""
+    __slots__ = ('group_path', 'title', 'verdict', 'start_time', 'duration', 'index', 'span')
+    
+    def __init__(self):
+        self.group_path = ""  # 各级testgroup标题，用/连接
+        self.title = ""
+        self.verdict = ""     # 跳过的测试为"skipped"
+        self.start_time = ""
+        self.duration = None  # 秒，无法计算时为None
+        self.index = 0        # 测试项在报告中的序号
+        self.span = None      # 测试项在报告中的字节范围 (start, end)，压缩报告为None
+    
+    @classmethod
+    def from_test_item(cls, test_item, index, group_path, span=None):
+        summary = cls()
+        summary.group_path = group_path
+        summary.title = test_item.title
+        summary.start_time = test_item.start_time
+        summary.index = index
+        summary.span = span
+        if test_item.item_type == "skipped":
+            summary.verdict = "skipped"
+        else:
+            summary.verdict = test_item.verdict
+            summary.duration = _get_item_duration(test_item)
+        return summary
+
+class ReportDiff:
+    """两次运行逐个测试用例的对比结果（各列表的元素为字典，可直接序列化为JSON）"""
+    
+    def __init__(self, baseline_path, candidate_path):
+        self.baseline_path = str(baseline_path)
+        self.candidate_path = str(candidate_path)
+        self.baseline_title = ""
+        self.candidate_title = ""
+        self.verdict_changes = []       # 结果变化
+        self.added = []                 # 只在对比报告中出现
+        self.removed = []               # 只在基准报告中出现
+        self.duration_regressions = []  # 结果未变但耗时明显增加
+        self.unchanged_count = 0
+    
+    @property
+    def has_changes(self):
+        return bool(self.verdict_changes or self.added or self.removed or self.duration_regressions)
+    
+    def to_dict(self):
+        return {
+            'baseline': {'path': self.baseline_path, 'title': self.baseline_title},
+            'candidate': {'path': self.candidate_path, 'title': self.candidate_title},
+            'summary': {
+                'verdict_changes': len(self.verdict_changes),
+                'added': len(self.added),
+                'removed': len(self.removed),
+                'duration_regressions': len(self.duration_regressions),
+                'unchanged': self.unchanged_count,
+            },
+            'verdict_changes': self.verdict_changes,
+            'added': self.added,
+            'removed': self.removed,
+            'duration_regressions': self.duration_regressions,
+        }
+    
+    def write_json(self, output_file_path):
+        with open(output_file_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        print(f"对比结果已写入: {output_file_path}")
+    
+    def write_html(self, output_file_path):
+        """生成对比结果页面（单个HTML文件，不依赖JS文件夹）"""
+        sections = (self._generate_section("结果变化", self.verdict_changes, show_steps=True)
+                    + self._generate_section("新增的测试项", self.added)
+                    + self._generate_section("移除的测试项", self.removed)
+                    + self._generate_section("耗时退化", self.duration_regressions))
+        html_content = f"""<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>报告对比 - {html.escape(self.candidate_title)}</title>
+    <style>
+        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', 'Microsoft YaHei', sans-serif;
+               margin: 0; padding: 1.5rem; background: #f5f7fa; color: #333; }}
+        .diff-header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white;
+                        padding: 1.2rem 1.5rem; border-radius: 8px; margin-bottom: 1rem; }}
+        .diff-header h1 {{ margin: 0 0 0.5rem; font-size: 1.4rem; }}
+        .diff-header p {{ margin: 0.2rem 0; opacity: 0.9; font-size: 0.9rem; }}
+        .stat-grid {{ display: grid; grid-template-columns: repeat(5, 1fr); gap: 0.8rem; margin-bottom: 1rem; }}
+        .stat-card {{ background: white; border-radius: 8px; padding: 0.8rem; text-align: center;
+                      box-shadow: 0 1px 3px rgba(0,0,0,0.1); }}
+        .stat-value {{ font-size: 1.6rem; font-weight: 700; color: #667eea; }}
+        .stat-label {{ font-size: 0.85rem; color: #6c757d; }}
+        .detail-section {{ background: white; border-radius: 8px; padding: 1rem 1.2rem; margin-bottom: 1rem;
+                           box-shadow: 0 1px 3px rgba(0,0,0,0.1); }}
+        .detail-section h2 {{ margin: 0 0 0.8rem; font-size: 1.1rem; color: #495057; }}
+        table {{ width: 100%; border-collapse: collapse; font-size: 0.85rem; }}
+        th, td {{ padding: 0.45rem 0.6rem; border-bottom: 1px solid #e9ecef; text-align: left; vertical-align: top; }}
+        th {{ background: #f8f9fa; color: #495057; }}
+        .group-path {{ color: #6c757d; }}
+        .failed-steps {{ margin: 0; padding-left: 1rem; color: #dc3545; }}
+        .result-badge {{ display: inline-block; padding: 0.1rem 0.45rem; border-radius: 4px; font-size: 0.75rem;
+                         font-weight: 600; color: white; background: #6c757d; }}
+        .result-pass {{ background: #28a745; }}
+        .result-fail {{ background: #dc3545; }}
+        .result-warn {{ background: #ffc107; color: #333; }}
+        .result-skipped {{ background: #adb5bd; }}
+        .empty {{ color: #6c757d; }}
+    </style>
+</head>
+<body>
+    <div class="diff-header">
+        <h1>🔍 报告对比</h1>
+        <p>基准: {html.escape(self.baseline_title)} ({html.escape(self.baseline_path)})</p>
+        <p>对比: {html.escape(self.candidate_title)} ({html.escape(self.candidate_path)})</p>
+    </div>
+    <div class="stat-grid">
+        <div class="stat-card"><div class="stat-value">{len(self.verdict_changes)}</div><div class="stat-label">结果变化</div></div>
+        <div class="stat-card"><div class="stat-value">{len(self.added)}</div><div class="stat-label">新增</div></div>
+        <div class="stat-card"><div class="stat-value">{len(self.removed)}</div><div class="stat-label">移除</div></div>
+        <div class="stat-card"><div class="stat-value">{len(self.duration_regressions)}</div><div class="stat-label">耗时退化</div></div>
+        <div class="stat-card"><div class="stat-value">{self.unchanged_count}</div><div class="stat-label">未变化</div></div>
+    </div>
+    {sections}
+</body>
+</html>
+"""
+        with open(output_file_path, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+        print(f"对比报告已生成: {output_file_path}")
+    
+    def _generate_section(self, heading, entries, show_steps=False):
+        """生成一类变化的表格"""
+        if not entries:
+            return f"""
+    <div class="detail-section">
+        <h2>{heading} (0)</h2>
+        <p class="empty">无</p>
+    </div>"""
+        
+        rows = ""
+        for entry in entries:
+            steps_html = ""
+            if show_steps and entry.get('failed_steps'):
+                steps_html = "".join(f"<li>{html.escape(step)}</li>" for step in entry['failed_steps'])
+                steps_html = f'<ul class="failed-steps">{steps_html}</ul>'
+            rows += f"""
+            <tr>
+                <td class="group-path">{html.escape(entry['group'])}</td>
+                <td>{html.escape(entry['title'])}{steps_html}</td>
+                <td>{_verdict_badge(entry['baseline_verdict'])}</td>
+                <td>{_verdict_badge(entry['candidate_verdict'])}</td>
+                <td>{_format_duration(entry['baseline_duration'])}</td>
+                <td>{_format_duration(entry['candidate_duration'])}</td>
+            </tr>"""
+        return f"""
+    <div class="detail-section">
+        <h2>{heading} ({len(entries)})</h2>
+        <table>
+            <tr><th>测试组</th><th>测试项</th><th>基准结果</th><th>对比结果</th><th>基准耗时</th><th>对比耗时</th></tr>
+            {rows}
+        </table>
+    </div>"""
+
+def _verdict_badge(verdict):
+    if verdict is None:
+        return "--"
+    label = 'NT' if verdict == 'skipped' else (verdict or 'N/A').upper()
+    return f'<span class="result-badge result-{html.escape(verdict or "na")}">{html.escape(label)}</span>'
+
+def _format_duration(duration):
+    return "--" if duration is None else f"{duration:.3f} s"
+
+def _normalize_title(title):
+    """匹配测试项时使用的标题: 合并连续空白并忽略大小写"""
+    return ' '.join(title.split()).casefold()
+
+def _get_item_duration(test_item):
+    """测试用例的耗时（秒），时间戳缺失或无法解析时返回None"""
+    try:
+        return float(test_item.end_timestamp) - float(test_item.timestamp)
+    except (AttributeError, ValueError):
+        return None
+
+def scan_test_item_summaries(xml_file_path):
+    """快速扫描报告中全部测试项的摘要（测试组路径、标题、结果、耗时），不解析测试步骤
+    
+    与快速摘要模式相同，每个testcase只解析第一个步骤之前的头部和最后的verdict。
+    压缩报告无法随机访问，改为边解压边用expat解析（跳过测试步骤），摘要没有字节范围。
+    
+    Returns:
+        (TestReportData, TestItemSummary列表): TestReportData只包含元信息，失败时返回None
+    """
+    if is_compressed_report(xml_file_path):
+        return _scan_compressed_summaries(xml_file_path)
+    
+    parser = TestReportParser(xml_file_path, quick=True)
+    summaries = []
+    try:
+        with open(xml_file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            encoding = _detect_xml_encoding(data)
+            group_paths = []
+            root, spans = _locate_test_items(data, group_paths=group_paths)
+            for index, ((tag, start, end), group_path) in enumerate(zip(spans, group_paths)):
+                summary_elem = None
+                if tag == 'testcase':
+                    summary_elem = parser._parse_summary_element(data, start, end, encoding)
+                if summary_elem is not None:
+                    test_item = parser._parse_testcase(summary_elem)
+                else:
+                    test_item = parser._parse_item_bytes(tag, data[start:end], encoding)
+                summaries.append(TestItemSummary.from_test_item(test_item, index, group_path, (start, end)))
+            parser._collect_report_info(root)
+    except (OSError, ValueError) + XML_PARSE_ERRORS as e:
+        print(f"❌ 扫描报告失败: {xml_file_path}: {e}")
+        return None
+    return parser.report_data, summaries
+
+def _scan_compressed_summaries(xml_file_path):
+    """流式扫描压缩报告的测试项摘要（expat快速摘要解析，测试步骤不构建）"""
+    parser = TestReportParser(xml_file_path, backend='expat', quick=True)
+    with contextlib.redirect_stdout(_OutputTail()) as output:
+        report_data = parser.parse()
+    if not report_data:
+        print(f"❌ 扫描报告失败: {xml_file_path}: {output.lines[-1] if output.lines else '解析失败'}")
+        return None
+    summaries = [TestItemSummary.from_test_item(test_item, index, test_item.group_path)
+                 for index, test_item in enumerate(report_data.test_items)]
+    report_data.test_items = []
+    return report_data, summaries
+
+def _index_summaries(summaries):
+    """按(测试组路径, 标题)建立哈希索引，同组同名的测试项按出现顺序依次编号"""
+    index = {}
+    occurrences = {}
+    for summary in summaries:
+        key = (_normalize_title(summary.group_path), _normalize_title(summary.title))
+        occurrence = occurrences.get(key, 0)
+        occurrences[key] = occurrence + 1
+        index[key + (occurrence,)] = summary
+    return index
+
+def _diff_entry(baseline, candidate):
+    summary = candidate or baseline
+    return {
+        'group': summary.group_path,
+        'title': summary.title,
+        'baseline_verdict': baseline.verdict if baseline else None,
+        'candidate_verdict': candidate.verdict if candidate else None,
+        'baseline_duration': baseline.duration if baseline else None,
+        'candidate_duration': candidate.duration if candidate else None,
+    }
+
+def _is_duration_regression(baseline, candidate):
+    if baseline.duration is None or candidate.duration is None:
+        return False
+    increase = candidate.duration - baseline.duration
+    return increase >= DIFF_DURATION_MIN_SECONDS and increase >= baseline.duration * DIFF_DURATION_RATIO
+
+def _collect_failed_steps(test_steps):
+    """测试用例的前几个失败步骤（ident和内容）"""
+    failed_steps = []
+    for step in test_steps:
+        if step.result in FAILED_VERDICTS:
+            failed_steps.append(f"{step.ident} {step.content}".strip())
+            if len(failed_steps) >= DIFF_FAILED_STEPS_LIMIT:
+                break
+    return failed_steps
+
+def _load_failed_steps(xml_file_path, changes):
+    """为结果变为fail/warn的测试用例加载步骤，记录前几个失败步骤
+    
+    changes为(对比条目, TestItemSummary)列表。普通报告按字节范围只解析这些测试用例；
+    压缩报告再流式解析一遍，只检查这些测试用例的步骤，其余测试用例的步骤解析后立即释放。
+    """
+    if is_compressed_report(xml_file_path):
+        entries = {summary.index: entry for entry, summary in changes}
+        
+        def inspect_item(index, test_item):
+            if test_item.item_type != "testcase":
+                return
+            entry = entries.get(index)
+            if entry is not None:
+                entry['failed_steps'] = _collect_failed_steps(test_item.test_steps)
+            test_item.release_steps()
+        
+        parser = TestReportParser(xml_file_path, backend='expat', on_test_item=inspect_item)
+        with contextlib.redirect_stdout(_OutputTail()):
+            parser.parse()
+        return
+    
+    parser = TestReportParser(xml_file_path)
+    with open(xml_file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        encoding = _detect_xml_encoding(data)
+        for entry, summary in changes:
+            start, end = summary.span
+            test_item = parser._parse_item_bytes('testcase', data[start:end], encoding)
+            entry['failed_steps'] = _collect_failed_steps(test_item.test_steps)
+
+def compare_test_reports(baseline_path, candidate_path, output_file_path=None, json_file_path=None):
+    """逐个测试用例对比两次运行（baseline为基准报告，candidate为对比报告）
+    
+    两个报告都只扫描测试项摘要（压缩报告边解压边解析），测试项按归一化的测试组路径和标题
+    通过哈希索引匹配，列出结果变化、新增和移除的测试项以及耗时退化。只有结果变为fail/warn的
+    测试用例才加载步骤（列出失败步骤）: 普通报告按字节范围只解析这些测试用例，
+    压缩报告再流式解析一遍。
+    
+    Returns:
+        ReportDiff: 对比结果（同时按需写出HTML和JSON），任何一个报告扫描失败时返回None
+    """
+    baseline_result = scan_test_item_summaries(baseline_path)
+    candidate_result = scan_test_item_summaries(candidate_path)
+    if baseline_result is None or candidate_result is None:
+        return None
+    baseline_data, baseline_summaries = baseline_result
+    candidate_data, candidate_summaries = candidate_result
+    
+    report_diff = ReportDiff(baseline_path, candidate_path)
+    report_diff.baseline_title = baseline_data.title
+    report_diff.candidate_title = candidate_data.title
+    
+    baseline_index = _index_summaries(baseline_summaries)
+    del baseline_summaries
+    failed_changes = []
+    occurrences = {}
+    for candidate in candidate_summaries:
+        key = (_normalize_title(candidate.group_path), _normalize_title(candidate.title))
+        occurrence = occurrences.get(key, 0)
+        occurrences[key] = occurrence + 1
+        baseline = baseline_index.pop(key + (occurrence,), None)
+        
+        if baseline is None:
+            report_diff.added.append(_diff_entry(None, candidate))
+        elif baseline.verdict != candidate.verdict:
+            entry = _diff_entry(baseline, candidate)
+            report_diff.verdict_changes.append(entry)
+            if candidate.verdict in FAILED_VERDICTS:
+                failed_changes.append((entry, candidate))
+        elif _is_duration_regression(baseline, candidate):
+            report_diff.duration_regressions.append(_diff_entry(baseline, candidate))
+        else:
+            report_diff.unchanged_count += 1
+    
+    # 索引中剩下的是对比报告中没有的测试项（字典保持基准报告中的顺序）
+    report_diff.removed = [_diff_entry(baseline, None) for baseline in baseline_index.values()]
+    
+    if failed_changes:
+        _load_failed_steps(candidate_path, failed_changes)
+    
+    if output_file_path:
+        report_diff.write_html(output_file_path)
+    if json_file_path:
+        report_diff.write_json(json_file_path)
+    return report_diff
+
+def is_compressed_report(xml_file_path):
+    """是否为压缩的报告文件（按后缀判断）"""
+    return str(xml_file_path).lower().endswith(COMPRESSED_SUFFIXES)
+
+def get_report_stem(xml_file_path):
+    """报告文件名去掉压缩后缀和.xml后缀，如Report.xml.gz -> Report"""
+    name = Path(xml_file_path).name
+    if is_compressed_report(name):
+        name = name[:name.rfind('.')]
+    return Path(name).stem
+
+def open_report_file(xml_file_path, progress=None):
+    """以二进制方式打开报告，压缩文件返回边读边解压的文件对象
+    
+    指定progress（ProgressTracker）时每次读取后按底层文件的位置更新已读取字节数。
+    """
+    path = str(xml_file_path)
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix == '.zst' and zstandard is None:
+        raise ValueError("读取.zst压缩报告需要安装zstandard: pip install zstandard")
+    
+    raw = open(path, 'rb')
+    if suffix == '.gz':
+        stream = gzip.GzipFile(fileobj=raw, mode='rb')
+    elif suffix == '.bz2':
+        stream = bz2.BZ2File(raw, 'rb')
+    elif suffix == '.xz':
+        stream = lzma.LZMAFile(raw, 'rb')
+    elif suffix == '.zst':
+        stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=False)
+    elif progress is None:
+        return raw
+    else:
+        stream = raw
+    return _ReportStream(stream, raw, progress)
+
+class _ReportStream:
+    """报告文件读取对象: 关闭时同时关闭解压对象和底层文件，并可更新读取进度"""
+    
+    def __init__(self, stream, raw, progress=None):
+        self._stream = stream
+        self._raw = raw
+        self._progress = progress
+    
+    def read(self, size=-1):
+        data = self._stream.read(size)
+        if self._progress is not None:
+            self._progress.bytes_done = self._raw.tell()
+            self._progress.update()
+        return data
+    
+    def close(self):
+        try:
+            if self._stream is not self._raw:
+                self._stream.close()
+        finally:
+            self._raw.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+def get_index_path(xml_file_path):
+    """测试项索引文件路径（与报告同目录的Report.xml.idx）"""
+    return str(xml_file_path) + INDEX_SUFFIX
+
+def write_report_index(xml_file_path, test_items, spans):
+    """写出测试项索引文件
+    
+    Args:
+        xml_file_path: XML报告路径
+        test_items: 按文档顺序排列的测试项（测试用例的步骤可以已经释放）
+        spans: 与test_items一一对应的 (标签, 起始字节, 结束字节)
+    """
+    rows = []
+    for test_item, (tag, start, end) in zip(test_items, spans):
+        if test_item.item_type == "testcase":
+            rows.append([start, end - start, tag, test_item.title, test_item.verdict,
+                         test_item.start_time, test_item.end_time, test_item.steps_count])
+        else:
+            rows.append([start, end - start, tag, test_item.title, '', test_item.start_time, '', 0])
+    
+    stat = os.stat(xml_file_path)
+    index_data = {
+        'version': INDEX_FORMAT_VERSION,
+        'source_size': stat.st_size,
+        'source_mtime_ns': stat.st_mtime_ns,
+        'fields': INDEX_FIELDS,
+        'items': rows,
+    }
+    index_path = get_index_path(xml_file_path)
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump(index_data, f, ensure_ascii=False, separators=(',', ':'))
+    print(f"✅ 索引文件已生成: {index_path} ({len(rows)} 个测试项)")
+
+def load_report_index(xml_file_path):
+    """读取测试项索引
+    
+    Returns:
+        list: 每个测试项一个字典（键见INDEX_FIELDS）；索引不存在、版本不符或报告已修改时返回None
+    """
+    index_path = get_index_path(xml_file_path)
+    if not os.path.exists(index_path):
+        return None
+    
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index_data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"读取索引文件失败: {e}")
+        return None
+    
+    stat = os.stat(xml_file_path)
+    if (index_data.get('version') != INDEX_FORMAT_VERSION
+            or index_data.get('source_size') != stat.st_size
+            or index_data.get('source_mtime_ns') != stat.st_mtime_ns):
+        print(f"索引文件已过期: {index_path}")
+        return None
+    
+    fields = index_data['fields']
+    return [dict(zip(fields, row)) for row in index_data['items']]
+
+def build_report_index(xml_file_path, backend='fast', jobs=1):
+    """解析整个报告并生成索引文件（步骤数据解析后立即释放），返回load_report_index的结果"""
+    def release_steps(index, test_item):
+        if test_item.item_type == "testcase":
+            test_item.release_steps()
+    
+    parser = TestReportParser(xml_file_path, on_test_item=release_steps, backend=backend, jobs=jobs, write_index=True)
+    if not parser.parse():
+        return None
+    return load_report_index(xml_file_path)
+
+def parse_test_item(xml_file_path, item_index):
+    """借助索引文件只解析报告中的单个测试项
+    
+    索引不存在或已过期时先重新生成。
+    
+    Args:
+        xml_file_path: XML报告路径
+        item_index: 测试项序号（与HTML报告及test_items中的顺序一致，从0开始）
+    
+    Returns:
+        TestCase或SkippedTest，失败时返回None
+    """
+    if is_compressed_report(xml_file_path):
+        print("❌ 压缩报告不支持按索引解析单个测试项，请先解压")
+        return None
+    
+    index = load_report_index(xml_file_path)
+    if index is None:
+        print("正在生成索引文件...")
+        index = build_report_index(xml_file_path)
+        if index is None:
+            return None
+    
+    if not 0 <= item_index < len(index):
+        print(f"❌ 测试项序号超出范围: {item_index}（共 {len(index)} 个测试项）")
+        return None
+    
+    entry = index[item_index]
+    with open(xml_file_path, 'rb') as f:
+        encoding = _detect_xml_encoding(f.read(200))
+        f.seek(entry['offset'])
+        chunk = f.read(entry['length'])
+    
+    parser = TestReportParser(xml_file_path, backend='fast')
+    try:
+        test_item, _ = parser._parse_item_span(_FastTestCaseScanner(parser._intern), entry['type'], chunk, encoding)
+    except XML_PARSE_ERRORS as e:
+        print(f"XML解析错误: {e}")
+        return None
+    return test_item
+
+def follow_test_report(xml_file_path, output_file_path, poll_interval=5.0, idle_timeout=None):
+    """跟踪模式: 在CANoe写入报告的同时持续更新HTML报告
+    
+    第一次读取到根元素后生成完整页面（带跟踪脚本），之后每次轮询只写出新完成测试用例的
+    steps_N.js和包含新测试项的live_N.js，已打开的页面自动追加，无需刷新。
+    报告写入完成（根元素闭合）、超过idle_timeout秒文件没有增长或按Ctrl+C后，
+    重新生成不带跟踪脚本的最终页面。
+    
+    Returns:
+        TestReportData: 解析结果（测试用例的步骤已释放），失败时返回None
+    """
+    generator = HTMLReportGenerator(None, live=True)
+    js_folder = generator.prepare_js_folder(output_file_path)
+    
+    def write_item_steps(index, test_item):
+        if test_item.item_type == "testcase" and test_item.test_steps:
+            generator.write_steps_file(js_folder, index, test_item)
+            test_item.release_steps()
+    
+    tailer = ReportTailer(xml_file_path, on_test_item=write_item_steps)
+    generator.report_data = tailer.report_data
+    written_count = None  # 页面中已有的测试项数量，None表示页面尚未生成
+    chunk_index = 0
+    last_position = 0
+    last_growth = time.monotonic()
+    
+    print(f"开始跟踪报告: {xml_file_path}（每 {poll_interval} 秒检查一次，按Ctrl+C停止）")
+    try:
+        while True:
+            try:
+                tailer.poll()
+            except XML_PARSE_ERRORS as e:
+                print(f"XML解析错误: {e}")
+                return None
+            except (OSError, ValueError) as e:
+                print(f"❌ 跟踪报告失败: {e}")
+                return None
+            
+            if tailer.position != last_position:
+                last_position = tailer.position
+                last_growth = time.monotonic()
+            
+            test_items = tailer.report_data.test_items
+            if written_count is None:
+                if tailer.started:
+                    generator.generate(output_file_path)
+                    written_count = len(test_items)
+            elif len(test_items) > written_count or tailer.finished:
+                generator.write_live_chunk(js_folder, chunk_index, written_count, tailer.finished)
+                print(f"新增 {len(test_items) - written_count} 个测试项（共 {len(test_items)} 个）")
+                chunk_index += 1
+                written_count = len(test_items)
+            
+            if tailer.finished:
+                print("✅ 报告写入完成")
+                break
+            if idle_timeout is not None and time.monotonic() - last_growth > idle_timeout:
+                print(f"报告超过 {idle_timeout} 秒没有新内容，停止跟踪")
+                break
+            time.sleep(poll_interval)
+    except KeyboardInterrupt:
+        print("已停止跟踪")
+    
+    if written_count is None:
+        print("❌ 报告中还没有可解析的内容")
+        return None
+    
+    if not tailer.finished:
+        # 通知已打开的页面停止轮询
+        generator.write_live_chunk(js_folder, chunk_index, written_count, True)
+    
+    # 最终页面与普通转换结果相同，不再包含跟踪脚本
+    generator.live = False
     generator.generate(output_file_path)
+    return tailer.report_data
+
+def _read_js_array(file_path):
+    """读取steps_N.js/tables_N.js中赋值给window变量的JSON数组"""
+    text = Path(file_path).read_text(encoding='utf-8')
+    return json.loads(text[text.index('['):text.rindex('];') + 1])
+
+def _step_matches(step, search_term):
+    """与页面中的步骤搜索一致: 内容、ident、表格描述、表头和单元格按子串匹配（不区分大小写）"""
+    if search_term in (step['content'] or '').lower() or search_term in (step['ident'] or '').lower():
+        return True
+    table = step['tabular_info']
+    if not table:
+        return False
+    cells = [table['description']] + list(table['headings'] or [])
+    cells.extend(cell for row in table['rows'] or [] for cell in row)
+    return any(cell and search_term in cell.lower() for cell in cells)
+
+class ReportServer:
+    """本地报告服务
+    
+    以HTTP提供已生成的HTML报告，并通过/api/steps按页返回测试步骤（服务端完成筛选和搜索），
+    浏览器每次只接收一页步骤。步骤来自steps.sqlite（steps_format='sqlite'）或steps_N.js。
+    响应带ETag（命中If-None-Match时返回304），客户端支持时使用gzip压缩。
+    """
+    
+    def __init__(self, report_path, host='127.0.0.1', port=SERVE_DEFAULT_PORT):
+        self.report_path = Path(report_path).resolve()
+        if not self.report_path.exists():
+            raise FileNotFoundError(f"报告文件不存在: {self.report_path}")
+        self.root = self.report_path.parent
+        self.js_folder = self.root / f"{self.report_path.stem}_js"
+        db_path = self.js_folder / STEPS_DB_NAME
+        self.step_db = StepDatabase.open(db_path) if db_path.exists() else None
+        self._steps_cache = OrderedDict()  # 测试项序号 -> 步骤列表（js格式报告）
+        self._tables_cache = {}            # 共享表格分片号 -> 表格列表
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+    
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/{urllib.parse.quote(self.report_path.name)}"
+    
+    def serve_forever(self):
+        self.httpd.serve_forever()
+    
+    def start(self):
+        """在后台线程中运行服务（GUI使用）"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+    
+    def shutdown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.step_db is not None:
+            self.step_db.close()
+    
+    def query_steps(self, item_index, step_filter='all', search='', page=0, page_size=HTML_STEPS_PER_PAGE):
+        """返回一页步骤: {'total', 'page', 'pages', 'page_size', 'steps'}"""
+        results = STEP_FILTER_RESULTS.get(step_filter)
+        page = max(page, 0)
+        if self.step_db is not None:
+            with self._lock:
+                total, steps = self.step_db.query_steps(item_index, results, search or None,
+                                                        page * page_size, page_size)
+        else:
+            steps = self._load_js_steps(item_index)
+            search_term = search.lower()
+            if results or search_term:
+                steps = [step for step in steps
+                         if (not results or step['result'].lower() in results)
+                         and (not search_term or _step_matches(step, search_term))]
+            total = len(steps)
+            steps = steps[page * page_size:(page + 1) * page_size]
+        pages = (total + page_size - 1) // page_size
+        return {'total': total, 'page': page, 'pages': pages, 'page_size': page_size, 'steps': steps}
+    
+    def _load_js_steps(self, item_index):
+        """读取steps_N.js并展开共享表格，最近使用的测试用例缓存在内存中"""
+        with self._lock:
+            steps = self._steps_cache.get(item_index)
+            if steps is not None:
+                self._steps_cache.move_to_end(item_index)
+                return steps
+        
+        steps_file_path = self.js_folder / f"steps_{item_index}.js"
+        steps = []
+        if steps_file_path.exists():
+            for step in _read_js_array(steps_file_path):
+                table = step.get('tab')
+                if isinstance(table, int):
+                    table = self._load_table(table)
+                steps.append({
+                    'timestamp': step['t'], 'ident': step['i'], 'result': step['r'], 'content': step['c'],
+                    'tabular_info': {'description': table['d'], 'headings': table['h'], 'rows': table['r']}
+                    if table else None,
+                })
+        
+        with self._lock:
+            self._steps_cache[item_index] = steps
+            if len(self._steps_cache) > SERVE_STEPS_CACHE_SIZE:
+                self._steps_cache.popitem(last=False)
+        return steps
+    
+    def _load_table(self, table_id):
+        shard = table_id // TABLES_PER_FILE
+        tables = self._tables_cache.get(shard)
+        if tables is None:
+            tables = _read_js_array(self.js_folder / f"tables_{shard}.js")
+            self._tables_cache[shard] = tables
+        return tables[table_id % TABLES_PER_FILE]
+    
+    def read_static(self, url_path):
+        """读取报告目录中的文件，返回 (内容, Content-Type)，路径越出报告目录或文件不存在时返回None
+        
+        报告HTML中插入window.stepsApi，页面据此改为向服务端请求步骤。
+        """
+        relative_path = urllib.parse.unquote(url_path).lstrip('/')
+        file_path = (self.root / relative_path).resolve()
+        if self.root not in file_path.parents or not file_path.is_file():
+            return None
+        body = file_path.read_bytes()
+        if file_path == self.report_path:
+            body = body.replace(b'</head>', b'<script>window.stepsApi = "api/steps";</script>\n</head>', 1)
+        content_type = mimetypes.guess_type(file_path.name)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type in ('application/javascript', 'application/json'):
+            content_type += '; charset=utf-8'
+        return body, content_type
+    
+    def _make_handler(self):
+        server = self
+        
+        class ReportRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urllib.parse.urlsplit(self.path)
+                if url.path == '/':
+                    self.send_response(302)
+                    self.send_header('Location', f"/{urllib.parse.quote(server.report_path.name)}")
+                    self.end_headers()
+                    return
+                
+                if url.path == '/api/steps':
+                    query = urllib.parse.parse_qs(url.query)
+                    try:
+                        item_index = int(query['index'][0])
+                        page = int(query.get('page', ['0'])[0])
+                    except (KeyError, ValueError):
+                        self.send_error(400, "Bad Request", "index/page参数无效")
+                        return
+                    try:
+                        result = server.query_steps(item_index, query.get('filter', ['all'])[0],
+                                                    query.get('search', [''])[0], page)
+                    except (OSError, ValueError, sqlite3.Error) as e:
+                        self.send_error(500, "Internal Server Error", str(e))
+                        return
+                    body = json.dumps(result, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                    self._send_body(body, 'application/json; charset=utf-8')
+                    return
+                
+                static = server.read_static(url.path)
+                if static is None:
+                    self.send_error(404)
+                    return
+                self._send_body(*static)
+            
+            def _send_body(self, body, content_type):
+                """发送响应: ETag命中时返回304，客户端支持时gzip压缩"""
+                etag = f'W/"{hashlib.md5(body).hexdigest()}"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                
+                gzip_enabled = (len(body) >= SERVE_GZIP_MIN_SIZE
+                                and 'gzip' in self.headers.get('Accept-Encoding', ''))
+                if gzip_enabled:
+                    body = gzip.compress(body, compresslevel=5)
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Vary', 'Accept-Encoding')
+                if gzip_enabled:
+                    self.send_header('Content-Encoding', 'gzip')
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass  # 不逐个输出请求
+        
+        return ReportRequestHandler
+
+def serve_report(report_path, host='127.0.0.1', port=SERVE_DEFAULT_PORT, open_browser=True):
+    """启动本地报告服务并在浏览器中打开报告，按Ctrl+C停止"""
+    server = ReportServer(report_path, host, port)
+    steps_source = "steps.sqlite" if server.step_db is not None else "steps_N.js"
+    print(f"✅ 报告服务已启动: {server.url}  (步骤来源: {steps_source}，按Ctrl+C停止)")
+    if open_browser:
+        webbrowser.open(server.url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("报告服务已停止")
+    finally:
+        server.shutdown()
+
+def compare_report_data(expected, actual, max_differences=20):
+    """逐项比较两份解析结果，返回差异描述列表（为空表示完全一致）"""
+    differences = []
+    
+    def add(message):
+        if len(differences) < max_differences:
+            differences.append(message)
+    
+    for attr in ('start_time', 'end_time', 'timestamp', 'verdicts', 'title',
+                 'engineer_info', 'testsetup_info', 'hardware_info'):
+        if getattr(expected, attr) != getattr(actual, attr):
+            add(f"报告属性 {attr} 不一致")
+    
+    if len(expected.test_items) != len(actual.test_items):
+        add(f"测试项数量不一致: {len(expected.test_items)} != {len(actual.test_items)}")
+    
+    item_attrs = {
+        'skipped': ('start_time', 'timestamp', 'title'),
+        'testcase': ('start_time', 'timestamp', 'title', 'end_time', 'end_timestamp', 'description', 'verdict'),
+    }
+    step_attrs = ('timestamp', 'level', 'type', 'ident', 'result', 'content')
+    
+    for index, (item_a, item_b) in enumerate(zip(expected.test_items, actual.test_items)):
+        if item_a.item_type != item_b.item_type:
+            add(f"测试项 {index}: 类型不一致 ({item_a.item_type} != {item_b.item_type})")
+            continue
+        for attr in item_attrs[item_a.item_type]:
+            if getattr(item_a, attr) != getattr(item_b, attr):
+                add(f"测试项 {index} ({item_a.title}): {attr} 不一致")
+        if item_a.item_type != 'testcase':
+            continue
+        
+        if len(item_a.test_steps) != len(item_b.test_steps):
+            add(f"测试项 {index} ({item_a.title}): 步骤数量不一致 ({len(item_a.test_steps)} != {len(item_b.test_steps)})")
+            continue
+        for step_index, (step_a, step_b) in enumerate(zip(item_a.test_steps, item_b.test_steps)):
+            mismatched = [attr for attr in step_attrs if getattr(step_a, attr) != getattr(step_b, attr)]
+            tab_a, tab_b = step_a.tabular_info, step_b.tabular_info
+            if (tab_a is None) != (tab_b is None) or (tab_a is not None and (
+                    tab_a.expand, tab_a.description, list(tab_a.headings), [list(row) for row in tab_a.rows]) != (
+                    tab_b.expand, tab_b.description, list(tab_b.headings), [list(row) for row in tab_b.rows])):
+                mismatched.append('tabular_info')
+            if mismatched:
+                add(f"测试项 {index} ({item_a.title}) 步骤 {step_index}: {', '.join(mismatched)} 不一致")
+    
+    return differences
 
-def main():
+def verify_fast_scanner(xml_file_path):
+    """校验快速扫描器: 与ElementTree解析同一文件的结果逐项比较
+    
+    Returns:
+        bool: 两者结果完全一致时返回True
+    """
+    print("校验快速扫描器: 使用ElementTree解析作为基准...")
+    expected = TestReportParser(xml_file_path, streaming=True, backend='etree').parse()
+    print("校验快速扫描器: 使用快速扫描器解析...")
+    actual = TestReportParser(xml_file_path, backend='fast').parse()
+    
+    if expected is None or actual is None:
+        print("❌ 校验失败: 文件解析失败")
+        return False
+    
+    differences = compare_report_data(expected, actual)
+    if differences:
+        print(f"❌ 快速扫描器结果与ElementTree不一致（显示前{len(differences)}条差异）:")
+        for message in differences:
+            print(f"   - {message}")
+        return False
+    
+    print(f"✅ 快速扫描器结果与ElementTree完全一致（{len(actual.test_items)} 个测试项）")
+    return True
+
+def print_progress(progress):
+    """命令行进度: 终端中在同一行刷新，输出被重定向时逐行输出"""
+    if progress.done or not sys.stdout.isatty():
+        print(format_progress(progress), flush=True)
+    else:
+        print(format_progress(progress).ljust(79), end='\r', flush=True)
+
+def run_convert(input_file, output_file, backend='auto', jobs=1, write_index=False, cache=None, quick=False,
+                progress=True, parse_filter=None, history=None, steps_format='js'):
+    """解析XML报告并生成HTML报告，输出各阶段信息（progress为True时输出进度、速度和预计剩余时间）
+    
+    使用convert_test_report单次遍历: 每个测试用例闭合后立即写出步骤并释放，不在内存中保留整个报告。
+    
+    Returns:
+        int: 退出码，成功为0，失败为1
+    """
     print("=" * 60)
     print("测试报告生成器启动")
     print("=" * 60)
     
+    exit_code = 1
     try:
-        # 输入和输出文件路径
-        input_file = 'Report.xml'
-        output_file = 'test_report.html'
+        print(f"正在解析XML文件并生成HTML报告: {input_file} -> {output_file}")
         
-        print(f"正在解析XML文件: {input_file}")
+        if history is not None and parse_filter is not None:
+            print("使用筛选条件时测试项不完整，不记录历史")
         
-        # 解析XML
-        report_data = parse_test_report(input_file)
+        # 解析XML的同时写出步骤文件，最后生成主数据文件和HTML
+        report_data = convert_test_report(input_file, output_file, backend=backend, jobs=jobs,
+                                          write_index=write_index, cache=cache, quick=quick,
+                                          on_progress=print_progress if progress else None,
+                                          parse_filter=parse_filter, history=history, steps_format=steps_format)
         
         if not report_data:
             print("❌ 解析失败: 无法读取XML文件")
-            return
+            return 1
         
         print(f"✅ XML解析完成")
         print(f"   - 测试组数量: {len(report_data.test_groups)}")
@@ -3627,15 +7399,18 @@ def main():
         
         print(f"   - 执行的测试用例: {total_test_cases}")
         print(f"   - 跳过的测试: {skipped_count}")
-        
-        print(f"\n正在生成HTML报告: {output_file}")
-        
-        # 生成HTML报告
-        generate_html_report(report_data, output_file)
+        if quick:
+            verdict_counts = {}
+            for item in report_data.test_items:
+                if item.item_type == "testcase":
+                    verdict_counts[item.verdict] = verdict_counts.get(item.verdict, 0) + 1
+            summary = ', '.join(f"{verdict or 'N/A'}: {count}" for verdict, count in verdict_counts.items())
+            print(f"   - 测试结果: {summary}")
         
         print(f"✅ HTML报告生成完成!")
         print(f"   报告文件: {output_file}")
         print(f"   请在浏览器中打开查看")
+        exit_code = 0
         
     except Exception as e:
         print(f"❌ 生成报告时发生错误: {str(e)}")
@@ -3645,6 +7420,614 @@ def main():
     print("=" * 60)
     print("脚本执行完成")
     print("=" * 60)
+    return exit_code
+
+def run_merge(input_files, output_file, backend='auto', quick=False, progress=True, parse_filter=None):
+    """合并多个XML报告为一个HTML报告，输出各来源报告的测试项数量和判决"""
+    print("=" * 60)
+    print(f"合并 {len(input_files)} 个报告: {output_file}")
+    print("=" * 60)
+    
+    try:
+        report_data = merge_test_reports(input_files, output_file, backend=backend, quick=quick,
+                                         on_progress=print_progress if progress else None,
+                                         parse_filter=parse_filter)
+    except Exception as e:
+        print(f"❌ 合并报告时发生错误: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    if not report_data:
+        return 1
+    
+    for source in report_data.sources:
+        print(f"   - {source.name}: {source.item_count} 项, {source.failed_count} 项失败")
+    print(f"✅ 合并完成: 共 {len(report_data.test_items)} 项")
+    return 0
+
+def run_compare(baseline_file, candidate_file, output_file=None, json_file=None):
+    """对比两次运行的报告并输出变化摘要"""
+    report_diff = compare_test_reports(baseline_file, candidate_file, output_file, json_file)
+    if report_diff is None:
+        return 1
+    
+    print("=" * 60)
+    print(f"结果变化: {len(report_diff.verdict_changes)}  新增: {len(report_diff.added)}  "
+          f"移除: {len(report_diff.removed)}  耗时退化: {len(report_diff.duration_regressions)}  "
+          f"未变化: {report_diff.unchanged_count}")
+    for entry in report_diff.verdict_changes:
+        print(f"   {entry['baseline_verdict'] or 'N/A'} -> {entry['candidate_verdict'] or 'N/A'}  "
+              f"{entry['group']}/{entry['title']}")
+    print("=" * 60)
+    return 0
+
+def run_history(history, output_file=None, runs=HISTORY_TREND_RUNS):
+    """输出历史记录中的通过率趋势、不稳定和耗时增长最快的测试用例，并按需生成趋势页面"""
+    try:
+        trend = history.pass_rate_trend(runs)
+        flaky = history.flaky_testcases()
+        growing = history.slowest_growing()
+        if output_file:
+            history.write_trend_html(output_file, runs)
+    except sqlite3.Error as e:
+        print(f"❌ 读取历史记录失败: {e}")
+        return 1
+    
+    print("=" * 60)
+    print(f"历史数据库: {history.db_path}  最近 {len(trend)} 次运行")
+    for run_id, start_time, title, total, passed, failed, rate in trend:
+        print(f"   #{run_id:<5} {start_time:<20} {rate:5.1f}%  ({passed}/{total}, {failed} 失败)  {title}")
+    if flaky:
+        print("不稳定的测试用例:")
+        for group_path, title, flips, count, verdict in flaky:
+            print(f"   {flips:>3} 次变化 / {count} 次运行  最近 {verdict or 'N/A'}  {group_path}/{title}")
+    if growing:
+        print("耗时增长最快的测试用例:")
+        for group_path, title, slope, count, mean in growing:
+            print(f"   +{slope:.3f} 秒/次  平均 {mean:.3f} 秒  {group_path}/{title}")
+    print("=" * 60)
+    return 0
+
+def run_index(input_file, verdict=None, jobs=1):
+    """生成（或读取已有的）测试项索引，并列出测试项，返回退出码"""
+    index = load_report_index(input_file)
+    if index is None:
+        index = build_report_index(input_file, jobs=jobs)
+        if index is None:
+            print("❌ 索引生成失败")
+            return 1
+    
+    print(f"共 {len(index)} 个测试项，索引文件: {get_index_path(input_file)}")
+    for item_index, entry in enumerate(index):
+        if verdict and entry['verdict'] != verdict:
+            continue
+        status = entry['verdict'] or entry['type']
+        print(f"  [{item_index}] {status:<8} {entry['title']}  ({entry['steps_count']} 个步骤)")
+    return 0
+
+def run_item(input_file, item_index):
+    """借助索引重新解析单个测试项并输出其步骤，返回退出码"""
+    test_item = parse_test_item(input_file, item_index)
+    if test_item is None:
+        return 1
+    
+    print(f"[{item_index}] {test_item.title}")
+    if test_item.item_type != "testcase":
+        print(f"   跳过的测试, 开始时间: {test_item.start_time}")
+        return 0
+    
+    print(f"   结果: {test_item.verdict}")
+    print(f"   时间: {test_item.start_time} - {test_item.end_time}")
+    if test_item.description:
+        print(f"   描述: {test_item.description}")
+    print(f"   步骤 ({test_item.steps_count}):")
+    for step in test_item.test_steps:
+        print(f"   {step.timestamp:>12}  {step.result:<6} {step.ident:<8} {step.content}")
+    return 0
+
+def expand_report_paths(patterns):
+    """展开输入的文件路径和通配符（支持**递归匹配），按出现顺序去重
+    
+    不含通配符的路径原样保留（不存在时由转换过程报告失败），没有匹配的通配符给出提示。
+    """
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        if any(char in pattern for char in '*?['):
+            matches = sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+            if not matches:
+                print(f"⚠️ 没有匹配的文件: {pattern}")
+        else:
+            matches = [pattern]
+        for path in matches:
+            key = os.path.abspath(path)
+            if key not in seen:
+                seen.add(key)
+                paths.append(path)
+    return paths
+
+def _assign_output_paths(input_files, output_dir):
+    """每个报告输出为 输出目录/报告名.html，同名报告依次加上_2、_3后缀"""
+    output_files = []
+    used = set()
+    for input_file in input_files:
+        stem = get_report_stem(input_file)
+        name = stem
+        suffix = 2
+        while name.lower() in used:
+            name = f"{stem}_{suffix}"
+            suffix += 1
+        used.add(name.lower())
+        output_files.append(str(Path(output_dir) / f"{name}.html"))
+    return output_files
+
+class _OutputTail:
+    """只保留最后几行输出的文件对象，批量转换时丢弃大量过程输出，只留失败原因"""
+    
+    def __init__(self, line_count=5):
+        self.lines = deque(maxlen=line_count)
+        self._partial = ''
+    
+    def write(self, text):
+        lines = (self._partial + text).split('\n')
+        self._partial = lines.pop()
+        self.lines.extend(line for line in lines if line.strip())
+        return len(text)
+    
+    def flush(self):
+        pass
+
+def _convert_batch_item(input_file, output_file, options):
+    """批量转换的工作进程入口（需为模块级函数才能被子进程导入），异常不会影响其他报告
+    
+    Returns:
+        (是否成功, 测试项数量, 耗时秒数, 失败原因)
+    """
+    start_time = time.perf_counter()
+    output = _OutputTail()
+    try:
+        with contextlib.redirect_stdout(output):
+            report_data = convert_test_report(input_file, output_file, **options)
+    except Exception as e:
+        return False, 0, time.perf_counter() - start_time, f"{type(e).__name__}: {e}"
+    
+    seconds = time.perf_counter() - start_time
+    if not report_data:
+        return False, 0, seconds, output.lines[-1] if output.lines else "解析失败"
+    return True, len(report_data.test_items), seconds, ''
+
+def run_batch(patterns, output_dir, jobs=None, options=None):
+    """用进程池批量转换报告，输出耗时汇总表
+    
+    每个报告在独立的工作进程中转换；工作进程异常退出（如内存不足被终止）时，
+    受影响的报告再逐个在单独的进程中重试，避免一个报告拖累其他报告。
+    
+    Returns:
+        int: 退出码，全部成功为0，有失败为1，没有输入文件为2
+    """
+    input_files = expand_report_paths(patterns)
+    if not input_files:
+        print("❌ 没有需要转换的报告")
+        return 2
+    
+    os.makedirs(output_dir, exist_ok=True)
+    output_files = _assign_output_paths(input_files, output_dir)
+    options = options or {}
+    jobs = (os.cpu_count() or 1) if jobs is None else max(1, jobs)
+    jobs = min(jobs, len(input_files))
+    print(f"批量转换 {len(input_files)} 个报告，{jobs} 个进程，输出目录: {output_dir}")
+    
+    results = [None] * len(input_files)
+    start_time = time.perf_counter()
+    
+    def record(index, result):
+        results[index] = result
+        done = sum(1 for item in results if item is not None)
+        status = "✅" if result[0] else "❌"
+        print(f"[{done}/{len(input_files)}] {status} {input_files[index]}  {result[2]:.2f}s"
+              + (f"  {result[3]}" if not result[0] else ''), flush=True)
+    
+    broken = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(_convert_batch_item, input_file, output_file, options): index
+            for index, (input_file, output_file) in enumerate(zip(input_files, output_files))
+        }
+        for future in as_completed(futures):
+            try:
+                record(futures[future], future.result())
+            except BrokenProcessPool:
+                broken.append(futures[future])
+    
+    # 进程池损坏后无法判断是哪个报告导致的，逐个在单独的进程中重试
+    for index in sorted(broken):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(_convert_batch_item, input_files[index], output_files[index], options)
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                result = (False, 0, 0.0, "工作进程异常退出")
+        record(index, result)
+    
+    total_seconds = time.perf_counter() - start_time
+    failed = [index for index, result in enumerate(results) if not result[0]]
+    
+    print("=" * 100)
+    print(f"{'结果':<4} {'测试项':>8} {'耗时(s)':>9} {'大小(MB)':>9} {'MB/s':>7}  报告")
+    print("-" * 100)
+    for input_file, output_file, (ok, item_count, seconds, error) in zip(input_files, output_files, results):
+        size = os.path.getsize(input_file) / 1048576 if os.path.isfile(input_file) else 0.0
+        speed = size / seconds if seconds > 0 else 0.0
+        print(f"{'成功' if ok else '失败':<4} {item_count:>8} {seconds:>9.2f} {size:>9.1f} {speed:>7.1f}  "
+              f"{input_file} -> {output_file if ok else error}")
+    print("-" * 100)
+    cpu_seconds = sum(result[2] for result in results)
+    print(f"成功 {len(input_files) - len(failed)} 个，失败 {len(failed)} 个，"
+          f"总耗时 {total_seconds:.2f}s（累计转换耗时 {cpu_seconds:.2f}s）")
+    print("=" * 100)
+    return 1 if failed else 0
+
+def is_report_file(file_name):
+    """是否为XML报告文件名（.xml及其压缩格式，如Report.xml.gz）"""
+    name = str(file_name).lower()
+    if name.endswith(COMPRESSED_SUFFIXES):
+        name = name[:name.rfind('.')]
+    return name.endswith('.xml')
+
+def is_report_complete(xml_file_path):
+    """报告是否已写入完成: 文件尾是根元素的结束标签
+    
+    压缩报告无法只读取文件尾判断，总是返回True（由调用方结合文件大小是否稳定判断）。
+    """
+    if is_compressed_report(xml_file_path):
+        return True
+    with open(xml_file_path, 'rb') as f:
+        head = f.read(WATCH_PROBE_SIZE)
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - WATCH_PROBE_SIZE))
+        tail = f.read()
+    match = re.search(rb'<(?![?!])([\w.:-]+)', head)
+    if not match:
+        return False
+    return tail.rstrip().endswith(b'</' + match.group(1) + b'>')
+
+class ReportWatcher:
+    """监视目录，自动转换新增或写入完成的报告
+    
+    每次扫描记录报告的大小和修改时间，与上次扫描相同且根元素已闭合的报告才提交转换，
+    避免转换CANoe仍在写入的报告。HTML比XML新的报告视为已转换并跳过；转换失败的报告
+    在文件再次变化前不重试。转换在最多jobs个进程中进行，同时运行的转换不超过jobs个，
+    其余已就绪的报告留到之后的扫描再提交。
+    """
+    
+    def __init__(self, directories, output_dir=None, jobs=None, options=None, recursive=False):
+        self.directories = [Path(directory) for directory in directories]
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.jobs = (os.cpu_count() or 1) if jobs is None else max(1, jobs)
+        self.options = options or {}
+        self.recursive = recursive
+        self._last_seen = {}   # XML路径 -> 上次扫描时的 (大小, 修改时间)
+        self._failed = {}      # XML路径 -> 转换失败时的 (大小, 修改时间)
+        self._running = {}     # future -> (XML路径, HTML路径, (大小, 修改时间))
+        self._executor = None
+        self.converted_count = 0
+        self.failed_count = 0
+    
+    def get_output_path(self, xml_file_path, directory):
+        """HTML路径: 未指定输出目录时与XML同目录，否则按相对监视目录的子目录放到输出目录下"""
+        name = f"{get_report_stem(xml_file_path)}.html"
+        if self.output_dir is None:
+            return xml_file_path.parent / name
+        return self.output_dir / xml_file_path.parent.relative_to(directory) / name
+    
+    def _scan(self):
+        """列出监视目录中的报告 (XML路径, 所在的监视目录)"""
+        for directory in self.directories:
+            if not directory.is_dir():
+                continue
+            paths = directory.rglob('*') if self.recursive else directory.iterdir()
+            for path in paths:
+                if is_report_file(path.name) and path.is_file():
+                    yield path, directory
+    
+    def poll(self):
+        """扫描一次监视目录，提交就绪的报告
+        
+        Returns:
+            int: 已就绪但因同时运行的转换已满而未提交的报告数量
+        """
+        running_paths = {xml_file_path for xml_file_path, _, _ in self._running.values()}
+        seen = {}
+        deferred = 0
+        for xml_file_path, directory in self._scan():
+            try:
+                stat = xml_file_path.stat()
+            except OSError:
+                continue  # 扫描后被删除或移动
+            state = (stat.st_size, stat.st_mtime)
+            seen[xml_file_path] = state
+            if xml_file_path in running_paths or self._failed.get(xml_file_path) == state:
+                continue
+            
+            output_file_path = self.get_output_path(xml_file_path, directory)
+            try:
+                if output_file_path.stat().st_mtime >= stat.st_mtime:
+                    continue  # HTML已是最新
+            except OSError:
+                pass
+            
+            # 两次扫描之间大小或修改时间有变化，说明仍在写入
+            if self._last_seen.get(xml_file_path) != state:
+                continue
+            try:
+                if not is_report_complete(xml_file_path):
+                    continue
+            except OSError:
+                continue
+            
+            if len(self._running) >= self.jobs:
+                deferred += 1
+                continue
+            self._submit(xml_file_path, output_file_path, state)
+        self._last_seen = seen
+        return deferred
+    
+    def _submit(self, xml_file_path, output_file_path, state):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.jobs)
+        output_file_path.parent.mkdir(parents=True, exist_ok=True)
+        future = self._executor.submit(_convert_batch_item, str(xml_file_path), str(output_file_path), self.options)
+        self._running[future] = (xml_file_path, output_file_path, state)
+        print(f"[{datetime.now():%H:%M:%S}] 开始转换: {xml_file_path}", flush=True)
+    
+    def wait(self, timeout):
+        """等待转换完成（最多timeout秒）并输出结果，没有正在运行的转换时直接等待timeout秒"""
+        if not self._running:
+            time.sleep(timeout)
+            return
+        done, _ = wait(list(self._running), timeout=timeout, return_when=FIRST_COMPLETED)
+        broken = False
+        for future in done:
+            xml_file_path, output_file_path, state = self._running.pop(future)
+            try:
+                ok, item_count, seconds, error = future.result()
+            except BrokenProcessPool:
+                ok, item_count, seconds, error = False, 0, 0.0, "工作进程异常退出"
+                broken = True
+            if ok:
+                self.converted_count += 1
+                print(f"[{datetime.now():%H:%M:%S}] ✅ {xml_file_path} -> {output_file_path}  "
+                      f"{item_count} 个测试项，{seconds:.2f}s", flush=True)
+            else:
+                self.failed_count += 1
+                self._failed[xml_file_path] = state
+                print(f"[{datetime.now():%H:%M:%S}] ❌ {xml_file_path}  {error}", flush=True)
+        
+        # 进程池损坏后其余正在运行的转换也会失败，重建进程池，受影响的报告在下次扫描时重新提交
+        if broken:
+            for xml_file_path, _, _ in self._running.values():
+                print(f"[{datetime.now():%H:%M:%S}] ⚠️ 工作进程异常退出，稍后重试: {xml_file_path}", flush=True)
+            self._running.clear()
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    @property
+    def busy(self):
+        return bool(self._running)
+    
+    def close(self):
+        """关闭进程池（等待正在运行的转换结束）"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+def run_watch(directories, output_dir=None, jobs=None, options=None, interval=WATCH_INTERVAL, recursive=False,
+              once=False):
+    """监视目录并自动转换报告，按Ctrl+C停止
+    
+    once为True时只处理当前已写入完成的报告，全部转换结束后退出（适合定时任务）。
+    
+    Returns:
+        int: 退出码，once模式下有转换失败时为1，否则为0
+    """
+    missing = [directory for directory in directories if not os.path.isdir(directory)]
+    if missing:
+        print(f"❌ 监视目录不存在: {', '.join(missing)}")
+        return 2
+    
+    watcher = ReportWatcher(directories, output_dir, jobs, options, recursive)
+    print(f"开始监视 {len(directories)} 个目录（每 {interval} 秒扫描一次，{watcher.jobs} 个进程"
+          + ("" if once else "，按Ctrl+C停止") + "）: " + ", ".join(directories))
+    poll_count = 0
+    try:
+        while True:
+            deferred = watcher.poll()
+            poll_count += 1
+            # 第一次扫描只记录文件大小，第二次扫描后才可能提交
+            if once and poll_count >= 2 and not deferred and not watcher.busy:
+                break
+            watcher.wait(interval)
+    except KeyboardInterrupt:
+        print("已停止监视")
+    finally:
+        watcher.close()
+    print(f"转换成功 {watcher.converted_count} 个，失败 {watcher.failed_count} 个")
+    return 1 if once and watcher.failed_count else 0
+
+def _add_filter_arguments(subparser):
+    """添加解析筛选相关的命令行参数"""
+    subparser.add_argument('--failed-steps', action='store_true', help="只保留fail/warn测试用例的步骤（fast后端不解析被丢弃的步骤，其余后端解析后丢弃）")
+    subparser.add_argument('--title', help="只保留标题匹配该正则的测试项")
+    subparser.add_argument('--group', help="只保留该测试组路径下的测试项，如\"Group A/Sub B\"")
+    subparser.add_argument('--no-tabular', action='store_true', help="不解析测试步骤中的表格信息")
+
+def _build_parse_filter(args):
+    """由命令行参数创建ParseFilter，没有筛选条件时返回None"""
+    if args.failed_steps or args.title or args.group or args.no_tabular:
+        return ParseFilter(FAILED_VERDICTS if args.failed_steps else None, args.title, args.group, args.no_tabular)
+    return None
+
+def main(argv=None):
+    """命令行入口
+    
+    不带参数时与原来一样把当前目录下的Report.xml转换为test_report.html；
+    子命令:
+        convert Report.xml [test_report.html]   转换报告
+        index Report.xml [--verdict fail]       生成测试项索引并列出测试项
+        item Report.xml N                       借助索引只解析第N个测试项
+        follow Report.xml [test_report.html]    跟踪正在写入的报告，页面自动追加新的测试项
+        batch "reports/*.xml" -o out [--jobs N] 用进程池批量转换多个报告
+        merge a.xml b.xml [-o merged.html]      合并多个报告为一个HTML报告
+        compare base.xml new.xml [-o diff.html] 逐个测试用例对比两次运行
+        history [-o trend.html]                 查询历史记录中的趋势（convert/batch加--history记录）
+        watch reports/ [-o html] [--jobs N]     监视目录，自动转换写入完成的新报告
+        serve test_report.html [--port N]       通过本地服务打开报告（步骤由服务端分页、筛选和搜索）
+    
+    Returns:
+        int: 退出码（批量转换有失败、合并或对比失败时非0）
+    """
+    arg_parser = argparse.ArgumentParser(description="CANoe测试报告生成器")
+    subparsers = arg_parser.add_subparsers(dest='command')
+    
+    convert_parser = subparsers.add_parser('convert', help="解析XML报告并生成HTML报告")
+    convert_parser.add_argument('input', help="XML报告路径")
+    convert_parser.add_argument('output', nargs='?', default='test_report.html', help="HTML报告路径")
+    convert_parser.add_argument('--backend', choices=PARSER_BACKENDS, default='auto', help="解析后端")
+    convert_parser.add_argument('--jobs', type=int, default=1, help="并行解析的进程数（0表示全部CPU核心）")
+    convert_parser.add_argument('--index', action='store_true', help="同时生成测试项索引文件")
+    convert_parser.add_argument('--cache', action='store_true', help="使用解析缓存（同一报告再次转换时跳过解析）")
+    convert_parser.add_argument('--cache-dir', help="解析缓存目录（指定后自动启用缓存）")
+    convert_parser.add_argument('--quick', action='store_true', help="快速摘要模式: 只生成概览和测试列表，不解析测试步骤")
+    convert_parser.add_argument('--no-progress', action='store_true', help="不输出解析进度")
+    convert_parser.add_argument('--history', nargs='?', const='', metavar='DB',
+                                help="把本次运行记录到历史数据库（可指定数据库路径）")
+    convert_parser.add_argument('--steps-format', choices=STEPS_FORMATS, default='js',
+                                help="步骤输出格式: js（每个测试用例一个文件）或sqlite（单个带全文索引的数据库）")
+    _add_filter_arguments(convert_parser)
+    
+    batch_parser = subparsers.add_parser('batch', help="用进程池批量转换多个报告")
+    batch_parser.add_argument('inputs', nargs='+', help="XML报告路径或通配符，如\"reports/**/*.xml\"")
+    batch_parser.add_argument('-o', '--output-dir', required=True, help="HTML报告输出目录")
+    batch_parser.add_argument('--jobs', type=int, default=0, help="同时转换的进程数（0表示全部CPU核心）")
+    batch_parser.add_argument('--backend', choices=PARSER_BACKENDS, default='auto', help="解析后端")
+    batch_parser.add_argument('--cache', action='store_true', help="使用解析缓存")
+    batch_parser.add_argument('--cache-dir', help="解析缓存目录（指定后自动启用缓存）")
+    batch_parser.add_argument('--quick', action='store_true', help="快速摘要模式: 不解析测试步骤")
+    batch_parser.add_argument('--history', nargs='?', const='', metavar='DB',
+                              help="把每个报告记录到历史数据库（可指定数据库路径）")
+    batch_parser.add_argument('--steps-format', choices=STEPS_FORMATS, default='js', help="步骤输出格式")
+    _add_filter_arguments(batch_parser)
+    
+    watch_parser = subparsers.add_parser('watch', help="监视目录，自动转换新增或写入完成的报告")
+    watch_parser.add_argument('directories', nargs='+', help="监视的目录")
+    watch_parser.add_argument('-o', '--output-dir', help="HTML报告输出目录（默认与XML报告同目录）")
+    watch_parser.add_argument('--jobs', type=int, default=0, help="同时转换的进程数（0表示全部CPU核心）")
+    watch_parser.add_argument('--interval', type=float, default=WATCH_INTERVAL, help="扫描目录的间隔（秒）")
+    watch_parser.add_argument('-r', '--recursive', action='store_true', help="同时监视子目录")
+    watch_parser.add_argument('--once', action='store_true', help="只转换当前已写入完成的报告，完成后退出")
+    watch_parser.add_argument('--backend', choices=PARSER_BACKENDS, default='auto', help="解析后端")
+    watch_parser.add_argument('--cache', action='store_true', help="使用解析缓存")
+    watch_parser.add_argument('--cache-dir', help="解析缓存目录（指定后自动启用缓存）")
+    watch_parser.add_argument('--quick', action='store_true', help="快速摘要模式: 不解析测试步骤")
+    watch_parser.add_argument('--history', nargs='?', const='', metavar='DB',
+                              help="把每次转换记录到历史数据库（可指定数据库路径）")
+    watch_parser.add_argument('--steps-format', choices=STEPS_FORMATS, default='js', help="步骤输出格式")
+    _add_filter_arguments(watch_parser)
+    
+    merge_parser = subparsers.add_parser('merge', help="合并多个报告为一个HTML报告（测试列表按来源报告分组）")
+    merge_parser.add_argument('inputs', nargs='+', help="XML报告路径或通配符，按给出的顺序合并")
+    merge_parser.add_argument('-o', '--output', default='merged_report.html', help="HTML报告路径")
+    merge_parser.add_argument('--backend', choices=PARSER_BACKENDS, default='auto', help="解析后端")
+    merge_parser.add_argument('--quick', action='store_true', help="快速摘要模式: 不解析测试步骤")
+    merge_parser.add_argument('--no-progress', action='store_true', help="不输出解析进度")
+    _add_filter_arguments(merge_parser)
+    
+    compare_parser = subparsers.add_parser('compare', help="逐个测试用例对比两次运行的报告")
+    compare_parser.add_argument('baseline', help="基准XML报告路径")
+    compare_parser.add_argument('candidate', help="对比XML报告路径")
+    compare_parser.add_argument('-o', '--output', default='report_diff.html', help="对比结果HTML路径")
+    compare_parser.add_argument('--json', help="同时把对比结果写入JSON文件")
+    
+    history_parser = subparsers.add_parser('history', help="查询历史记录: 通过率趋势、不稳定和耗时增长的测试用例")
+    history_parser.add_argument('--db', help="历史数据库路径（默认位于解析缓存目录旁）")
+    history_parser.add_argument('--runs', type=int, default=HISTORY_TREND_RUNS, help="通过率趋势显示的最近运行次数")
+    history_parser.add_argument('-o', '--output', help="生成趋势页面HTML")
+    
+    serve_parser = subparsers.add_parser('serve', help="通过本地HTTP服务打开已生成的报告")
+    serve_parser.add_argument('report', nargs='?', default='test_report.html', help="HTML报告路径")
+    serve_parser.add_argument('--host', default='127.0.0.1', help="监听地址")
+    serve_parser.add_argument('--port', type=int, default=SERVE_DEFAULT_PORT, help="监听端口（0表示自动选择）")
+    serve_parser.add_argument('--no-browser', action='store_true', help="不自动打开浏览器")
+    
+    index_parser = subparsers.add_parser('index', help="生成测试项索引文件并列出测试项")
+    index_parser.add_argument('input', help="XML报告路径")
+    index_parser.add_argument('--verdict', help="只列出指定结果的测试项，如fail")
+    index_parser.add_argument('--jobs', type=int, default=1, help="并行解析的进程数（0表示全部CPU核心）")
+    
+    follow_parser = subparsers.add_parser('follow', help="跟踪CANoe正在写入的报告，持续更新HTML报告")
+    follow_parser.add_argument('input', help="XML报告路径")
+    follow_parser.add_argument('output', nargs='?', default='test_report.html', help="HTML报告路径")
+    follow_parser.add_argument('--interval', type=float, default=5.0, help="检查文件更新的间隔（秒）")
+    follow_parser.add_argument('--idle-timeout', type=float, help="文件超过指定秒数没有增长时停止跟踪")
+    
+    item_parser = subparsers.add_parser('item', help="借助索引只解析单个测试项")
+    item_parser.add_argument('input', help="XML报告路径")
+    item_parser.add_argument('index', type=int, help="测试项序号（从0开始）")
+    
+    args = arg_parser.parse_args(argv)
+    
+    if args.command is None:
+        return run_convert('Report.xml', 'test_report.html')
+    elif args.command == 'convert':
+        cache = ReportCache(args.cache_dir) if args.cache or args.cache_dir else None
+        history = HistoryStore(args.history or None) if args.history is not None else None
+        return run_convert(args.input, args.output, args.backend, args.jobs or None, args.index, cache, args.quick,
+                    not args.no_progress, _build_parse_filter(args), history, args.steps_format)
+    elif args.command == 'batch':
+        options = {
+            'backend': args.backend,
+            'cache': ReportCache(args.cache_dir) if args.cache or args.cache_dir else None,
+            'quick': args.quick,
+            'parse_filter': _build_parse_filter(args),
+            'history': HistoryStore(args.history or None) if args.history is not None else None,
+            'steps_format': args.steps_format,
+        }
+        return run_batch(args.inputs, args.output_dir, args.jobs or None, options)
+    elif args.command == 'watch':
+        options = {
+            'backend': args.backend,
+            'cache': ReportCache(args.cache_dir) if args.cache or args.cache_dir else None,
+            'quick': args.quick,
+            'parse_filter': _build_parse_filter(args),
+            'history': HistoryStore(args.history or None) if args.history is not None else None,
+            'steps_format': args.steps_format,
+        }
+        return run_watch(args.directories, args.output_dir, args.jobs or None, options, args.interval,
+                         args.recursive, args.once)
+    elif args.command == 'merge':
+        input_files = expand_report_paths(args.inputs)
+        if not input_files:
+            print("❌ 没有找到匹配的XML报告")
+            return 1
+        return run_merge(input_files, args.output, args.backend, args.quick, not args.no_progress,
+                         _build_parse_filter(args))
+    elif args.command == 'compare':
+        return run_compare(args.baseline, args.candidate, args.output, args.json)
+    elif args.command == 'history':
+        return run_history(HistoryStore(args.db), args.output, args.runs)
+    elif args.command == 'serve':
+        try:
+            serve_report(args.report, args.host, args.port, not args.no_browser)
+        except (OSError, sqlite3.Error) as e:
+            print(f"❌ 无法启动报告服务: {e}")
+            return 1
+    elif args.command == 'index':
+        return run_index(args.input, args.verdict, args.jobs or None)
+    elif args.command == 'follow':
+        return 0 if follow_test_report(args.input, args.output, args.interval, args.idle_timeout) else 1
+    elif args.command == 'item':
+        return run_item(args.input, args.index)
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
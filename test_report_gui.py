@@ -12,7 +12,8 @@ import sys
 from pathlib import Path
 import webbrowser
 from datetime import datetime
-from test_report_generator import parse_test_report, generate_html_report
+from test_report_generator import (convert_test_report, get_report_stem, ReportCache, format_progress, ParseFilter,
+                                   FAILED_VERDICTS, ReportServer)
 
 class TestReportGUI:
     def __init__(self, root):
@@ -56,6 +57,7 @@ class TestReportGUI:
         self.setup_ui()
         self.xml_file_path = ""
         self.output_file_path = ""
+        self.report_server = None
         
     def setup_styles(self):
         """配置ttk样式"""
@@ -72,6 +74,7 @@ class TestReportGUI:
         style.configure('TFrame', background=self.colors["bg"])
         style.configure('Card.TFrame', background=self.colors["card_bg"], borderwidth=1, relief='solid')
         style.map('Card.TFrame', bordercolor=[('!focus', self.colors["border"]), ('focus', self.colors["accent"])])
+        style.configure('Options.TFrame', background=self.colors["card_bg"])
 
         # -- Label样式 --
         style.configure('TLabel', background=self.colors["card_bg"], foreground=self.colors["text"], font=self.fonts["body"])
@@ -111,6 +114,10 @@ class TestReportGUI:
         style.map('TEntry',
             bordercolor=[('focus', self.colors["accent"])])
 
+        # -- Checkbutton样式 --
+        style.configure('TCheckbutton', background=self.colors["card_bg"], foreground=self.colors["text"])
+        style.map('TCheckbutton', background=[('active', self.colors["card_bg"])])
+
         # -- Progressbar样式 --
         style.configure('TProgressbar', 
             troughcolor=self.colors["border"], 
@@ -159,6 +166,23 @@ class TestReportGUI:
         output_entry = ttk.Entry(file_card, textvariable=self.output_file_var, width=60)
         output_entry.grid(row=2, column=1, sticky="ew", pady=(10, 0))
         ttk.Button(file_card, text="另存为...", command=self.select_output_file).grid(row=2, column=2, padx=(10, 0), pady=(10, 0))
+        
+        # 转换选项
+        options_frame = ttk.Frame(file_card, style='Options.TFrame')
+        options_frame.grid(row=3, column=1, sticky=tk.W, pady=(10, 0))
+        
+        # 使用缓存时步骤数据要完整写入缓存，解析期间无法逐个释放，超大报告会占用大量内存，默认关闭
+        self.use_cache_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="使用解析缓存（再次转换同一报告时跳过解析，解析期间占用更多内存）",
+                        variable=self.use_cache_var).pack(side=tk.LEFT, padx=(0, 20))
+        
+        self.quick_mode_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="快速摘要（只统计测试结果，不生成测试步骤）",
+                        variable=self.quick_mode_var).pack(side=tk.LEFT, padx=(0, 20))
+        
+        self.failed_steps_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="只保留失败用例的步骤",
+                        variable=self.failed_steps_var).pack(side=tk.LEFT)
 
         # --- 日志和控制区域 ---
         log_control_frame = ttk.Frame(main_frame)
@@ -199,6 +223,10 @@ class TestReportGUI:
         self.open_btn = ttk.Button(button_frame, text="打开报告", command=self.open_report, state="disabled")
         self.open_btn.pack(side=tk.LEFT, padx=(0, 10))
         
+        self.serve_btn = ttk.Button(button_frame, text="通过服务打开", command=self.open_report_via_server,
+                                    state="disabled")
+        self.serve_btn.pack(side=tk.LEFT, padx=(0, 10))
+        
         ttk.Button(button_frame, text="清空日志", command=self.clear_log).pack(side=tk.LEFT)
 
         # 进度条和状态
@@ -232,7 +260,9 @@ class TestReportGUI:
         """选择XML文件"""
         file_path = filedialog.askopenfilename(
             title="选择XML测试报告文件",
-            filetypes=[("XML文件", "*.xml"), ("所有文件", "*.*")]
+            filetypes=[("XML文件", "*.xml"),
+                       ("压缩的XML文件", "*.xml.gz *.xml.bz2 *.xml.xz *.xml.zst"),
+                       ("所有文件", "*.*")]
         )
         if file_path:
             self.xml_file_var.set(file_path)
@@ -240,7 +270,7 @@ class TestReportGUI:
             
             # 自动设置输出文件名
             xml_path = Path(file_path)
-            output_path = xml_path.parent / f"{xml_path.stem}_report.html"
+            output_path = xml_path.parent / f"{get_report_stem(xml_path)}_report.html"
             self.output_file_var.set(str(output_path))
             self.output_file_path = str(output_path)
             
@@ -282,6 +312,7 @@ class TestReportGUI:
         # 在单独线程中生成报告
         self.generate_btn.config(state="disabled")
         self.open_btn.config(state="disabled")
+        self.serve_btn.config(state="disabled")
         
         thread = threading.Thread(target=self._generate_report_thread)
         thread.daemon = True
@@ -294,17 +325,31 @@ class TestReportGUI:
             self.log_message("=" * 60)
             self.log_message("🚀 开始生成测试报告...")
             
-            # 解析XML文件
-            self.update_progress(20, "正在解析XML文件...")
+            # 解析XML文件，同时按测试用例写出步骤文件
+            self.update_progress(0, "正在解析XML并生成步骤文件...")
             self.log_message(f"正在解析: {os.path.basename(self.xml_file_path)}")
+            self.log_message(f"输出报告: {os.path.basename(self.output_file_path)}")
             
-            report_data = parse_test_report(self.xml_file_path)
+            quick = self.quick_mode_var.get()
+            parse_filter = None
+            if self.failed_steps_var.get() and not quick:
+                parse_filter = ParseFilter(steps_verdicts=FAILED_VERDICTS)
+                self.log_message("只保留失败（fail/warn）测试用例的步骤")
+            cache = ReportCache() if self.use_cache_var.get() and not quick and parse_filter is None else None
+            if quick:
+                self.log_message("使用快速摘要模式，报告中不包含测试步骤")
+            report_data = convert_test_report(self.xml_file_path, self.output_file_path, cache=cache, quick=quick,
+                                              on_progress=self._on_convert_progress, parse_filter=parse_filter)
             
             if not report_data:
                 raise Exception("解析XML文件失败，请检查文件格式或内容。")
             
-            self.update_progress(50, "XML解析完成")
             self.log_message("✅ XML解析完成", level="success")
+            if cache is not None:
+                if cache.last_hit:
+                    self.log_message(f"   - 解析缓存命中，节省约 {cache.last_saved_seconds:.1f} 秒")
+                else:
+                    self.log_message("   - 解析缓存未命中，解析结果已写入缓存")
             self.log_message(f"   - 测试组: {len(report_data.test_groups)}个")
             self.log_message(f"   - 总测试项: {len(report_data.test_items)}个")
             
@@ -316,12 +361,6 @@ class TestReportGUI:
             if skipped_count > 0:
                 self.log_message(f"   - 跳过测试: {skipped_count}个")
             
-            # 生成HTML报告
-            self.update_progress(70, "正在生成HTML报告...")
-            self.log_message(f"\n正在生成HTML报告: {os.path.basename(self.output_file_path)}")
-            
-            generate_html_report(report_data, self.output_file_path)
-            
             self.update_progress(100, "报告生成成功！")
             self.log_message("🎉 HTML报告生成完成!", level="success")
             self.log_message(f"   报告已保存至: {self.output_file_path}")
@@ -329,6 +368,7 @@ class TestReportGUI:
             
             # 启用打开按钮
             self.root.after(0, lambda: self.open_btn.config(state="normal"))
+            self.root.after(0, lambda: self.serve_btn.config(state="normal"))
             
             # 显示成功消息
             success_message = f"报告已成功生成！\n\n文件保存在:\n{self.output_file_path}"
@@ -344,6 +384,14 @@ class TestReportGUI:
             # 重新启用生成按钮
             self.root.after(0, lambda: self.generate_btn.config(state="normal"))
     
+    def _on_convert_progress(self, progress):
+        """转换进度回调: 解析阶段按已读取字节数占0~90%，生成阶段占90~100%"""
+        if progress.phase == 'parse':
+            value = progress.fraction * 90
+        else:
+            value = 90 + progress.fraction * 10
+        self.update_progress(value, format_progress(progress))
+    
     def open_report(self):
         """打开生成的报告"""
         if self.output_file_path and os.path.exists(self.output_file_path):
@@ -354,6 +402,22 @@ class TestReportGUI:
                 messagebox.showerror("错误", f"无法打开报告文件: {str(e)}")
         else:
             messagebox.showerror("错误", "报告文件不存在")
+    
+    def open_report_via_server(self):
+        """通过本地报告服务打开报告（步骤由服务端分页、筛选和搜索）"""
+        if not (self.output_file_path and os.path.exists(self.output_file_path)):
+            messagebox.showerror("错误", "报告文件不存在")
+            return
+        try:
+            if self.report_server is not None:
+                self.report_server.shutdown()
+                self.report_server = None
+            self.report_server = ReportServer(self.output_file_path, port=0)
+            self.report_server.start()
+            webbrowser.open(self.report_server.url)
+            self.log_message(f"已通过报告服务打开报告: {self.report_server.url}")
+        except Exception as e:
+            messagebox.showerror("错误", f"无法启动报告服务: {str(e)}")
 
 def main():
     """主函数"""